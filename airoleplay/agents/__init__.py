@@ -2,5 +2,30 @@
 
 from .roleplay_agent import RoleplayAgent
 from .enhanced_roleplay_agent import EnhancedRoleplayAgent
+from .context import ContextPolicy, ConversationContext
+from .call_policy import CallPolicy, LLMCallFailed, LLMDeadlineExceeded, PolicyChatModel
+from .llm_pool import get_chat_model, preconnect
+from .model_router import ModelRouter, RouteDecision, RoutingPolicy
+from .opening_pool import OPENING_LINE, OpeningPool, get_opening_pool
+from .session_store import SessionStore, get_session_store
 
-__all__ = ["RoleplayAgent", "EnhancedRoleplayAgent"]
+__all__ = [
+    "RoleplayAgent",
+    "EnhancedRoleplayAgent",
+    "ContextPolicy",
+    "ConversationContext",
+    "CallPolicy",
+    "PolicyChatModel",
+    "LLMCallFailed",
+    "LLMDeadlineExceeded",
+    "get_chat_model",
+    "preconnect",
+    "ModelRouter",
+    "RouteDecision",
+    "RoutingPolicy",
+    "OPENING_LINE",
+    "OpeningPool",
+    "get_opening_pool",
+    "SessionStore",
+    "get_session_store",
+]
@@ -0,0 +1,356 @@
+"""Deadlines, jittered retries and hedged requests for chat model calls."""
+
+import asyncio
+import contextvars
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from ..utils.cassette import CassetteMiss
+from ..utils.metrics import MetricsRegistry, get_metrics_registry, model_name
+
+# Client errors that a retry cannot fix
+NON_RETRYABLE_STATUS = (400, 401, 403, 404, 413, 422)
+
+
+def _spawn(fn: Callable[[], Any]) -> Future:
+    """Run fn on its own daemon thread so it can be abandoned at the deadline.
+
+    A thread per attempt rather than a shared pool: attempts never wait in
+    a queue, so the deadline only counts time spent on the call itself.
+    """
+    future: Future = Future()
+    context = contextvars.copy_context()  # keep tracing callbacks attached
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(fn))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-call", daemon=True).start()
+    return future
+
+
+class LLMCallFailed(RuntimeError):
+    """The call failed on every attempt allowed by the policy."""
+
+
+class LLMDeadlineExceeded(LLMCallFailed):
+    """No attempt answered before the deadline."""
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """How a chat model call is bounded, retried and hedged.
+
+    Attributes:
+        deadline_s: Time allowed for the whole call, retries included
+        max_retries: Retries after the first attempt fails
+        backoff_base_s: Backoff ceiling for the first retry (doubles per retry)
+        backoff_max_s: Largest backoff ceiling
+        hedge: Send a duplicate request when the first one is slow
+        hedge_after_s: Fixed hedge delay; None uses the observed latency quantile
+        hedge_quantile: Latency quantile that triggers a hedge
+        hedge_min_samples: Observed calls needed before quantile hedging starts
+    """
+    deadline_s: float = 45.0
+    max_retries: int = 2
+    backoff_base_s: float = 0.5
+    backoff_max_s: float = 4.0
+    hedge: bool = False
+    hedge_after_s: Optional[float] = None
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter backoff before retry number ``retry`` (1-based)."""
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (retry - 1)))
+
+
+def policy_from_env() -> CallPolicy:
+    """CallPolicy configured by environment variables.
+
+    AIROLEPLAY_LLM_DEADLINE (seconds) and AIROLEPLAY_LLM_RETRIES override
+    the defaults. AIROLEPLAY_LLM_HEDGE turns hedging on: "p95" (or any
+    other quantile, e.g. "p90") hedges at that observed latency, a number
+    hedges after that many seconds.
+    """
+    options: Dict[str, Any] = {}
+    if os.getenv("AIROLEPLAY_LLM_DEADLINE"):
+        options["deadline_s"] = float(os.environ["AIROLEPLAY_LLM_DEADLINE"])
+    if os.getenv("AIROLEPLAY_LLM_RETRIES"):
+        options["max_retries"] = int(os.environ["AIROLEPLAY_LLM_RETRIES"])
+    hedge = os.getenv("AIROLEPLAY_LLM_HEDGE", "").strip().lower()
+    if hedge:
+        options["hedge"] = True
+        if hedge.startswith("p"):
+            options["hedge_quantile"] = float(hedge[1:]) / 100
+        else:
+            options["hedge_after_s"] = float(hedge)
+    return CallPolicy(**options)
+
+
+def _retryable(error: BaseException) -> bool:
+    # A request missing from a replayed cassette stays missing
+    if isinstance(error, CassetteMiss):
+        return False
+    return getattr(error, "status_code", None) not in NON_RETRYABLE_STATUS
+
+
+class PolicyChatModel(BaseChatModel):
+    """Chat model that applies a CallPolicy to every call of a wrapped model.
+
+    Outcome counts (first_try, retry_success, hedge_fired, hedge_won,
+    retries, deadline_exceeded, failed) are kept per wrapper and reported to
+    the metrics registry as ``llm_call_policy_total``. Streams are bounded
+    by the same deadline, retried only until their first chunk and not
+    hedged.
+    """
+
+    inner: BaseChatModel
+    policy: CallPolicy = CallPolicy()
+    model: str = "unknown"
+    registry: Any = None
+    _latencies: Deque[float] = PrivateAttr(default_factory=lambda: deque(maxlen=200))
+    _counts: Counter = PrivateAttr(default_factory=Counter)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context):
+        if self.model == "unknown":
+            self.model = model_name(self.inner)
+
+    @property
+    def _llm_type(self) -> str:
+        return "call-policy"
+
+    def _registry(self) -> MetricsRegistry:
+        return self.registry or get_metrics_registry()
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self._counts[outcome] += 1
+        self._registry().inc("llm_call_policy_total", outcome=outcome, model=self.model)
+
+    def stats(self) -> Dict[str, int]:
+        """How often each path was taken."""
+        with self._lock:
+            return dict(self._counts)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a hedge fires, None if hedging is off or not yet calibrated."""
+        if not self.policy.hedge:
+            return None
+        if self.policy.hedge_after_s is not None:
+            return self.policy.hedge_after_s
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.policy.hedge_min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * self.policy.hedge_quantile))]
+
+    def _observe(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _finish(self, retries: int):
+        self._count("retry_success" if retries else "first_try")
+
+    def _give_up(self, error: BaseException, retries: int, deadline: float) -> bool:
+        """Count a failed attempt; True if the call should stop retrying."""
+        if isinstance(error, LLMDeadlineExceeded) or time.monotonic() >= deadline:
+            self._count("deadline_exceeded")
+            return True
+        if retries >= self.policy.max_retries or not _retryable(error):
+            self._count("failed")
+            return True
+        return False
+
+    # Sync calls
+
+    def _attempt(self, messages, stop, kwargs, deadline: float):
+        """One attempt, hedged if it runs long."""
+        def call():
+            start = time.monotonic()
+            result = self.inner.invoke(messages, stop=stop, **kwargs)
+            self._observe(time.monotonic() - start)
+            return result
+
+        futures = [_spawn(call)]
+        hedge_after = self.hedge_delay()
+        if hedge_after is not None and time.monotonic() + hedge_after < deadline:
+            if not wait(futures, timeout=hedge_after).done:
+                self._count("hedge_fired")
+                futures.append(_spawn(call))
+
+        # First success wins; abandoned calls finish in the background
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        self._count("hedge_won")
+                    return future.result()
+                error = future.exception()
+        if error is not None and not pending:
+            raise error
+        raise self._deadline_error()
+
+    def _deadline_error(self) -> LLMDeadlineExceeded:
+        return LLMDeadlineExceeded(
+            f"No complete response from {self.model} within {self.policy.deadline_s:g}s"
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        deadline = time.monotonic() + self.policy.deadline_s
+        retries = 0
+        while True:
+            try:
+                message = self._attempt(messages, stop, kwargs, deadline)
+                self._finish(retries)
+                return ChatResult(generations=[ChatGeneration(message=message)])
+            except Exception as e:
+                if self._give_up(e, retries, deadline):
+                    raise _failure(e, self.model) from e
+                retries += 1
+                self._count("retries")
+                time.sleep(min(self.policy.backoff(retries), max(deadline - time.monotonic(), 0)))
+
+    def _stream_attempt(self, messages, stop, kwargs, deadline: float) -> Iterator:
+        """Chunks of one streamed attempt, cut off when the deadline passes.
+
+        The stream is read on its own thread, so both a slow first chunk
+        and a reply that keeps trickling in are bounded by the deadline.
+        """
+        chunks: queue.Queue = queue.Queue()
+        stopped = threading.Event()
+
+        def read():
+            try:
+                for chunk in self.inner.stream(messages, stop=stop, **kwargs):
+                    if stopped.is_set():
+                        return
+                    chunks.put(("chunk", chunk))
+                chunks.put(("end", None))
+            except BaseException as e:
+                chunks.put(("error", e))
+
+        _spawn(read)
+        try:
+            while True:
+                try:
+                    kind, value = chunks.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    raise self._deadline_error()
+                if kind == "end":
+                    return
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            stopped.set()
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        deadline = time.monotonic() + self.policy.deadline_s
+        retries = 0
+        while True:
+            started = False
+            try:
+                for chunk in self._stream_attempt(messages, stop, kwargs, deadline):
+                    started = True
+                    yield ChatGenerationChunk(message=chunk)
+                self._finish(retries)
+                return
+            except Exception as e:
+                # Chunks already shown cannot be taken back, so only retry before the first
+                if started:
+                    self._count(
+                        "deadline_exceeded" if isinstance(e, LLMDeadlineExceeded) else "failed"
+                    )
+                    raise _failure(e, self.model) from e
+                if self._give_up(e, retries, deadline):
+                    raise _failure(e, self.model) from e
+                retries += 1
+                self._count("retries")
+                time.sleep(min(self.policy.backoff(retries), max(deadline - time.monotonic(), 0)))
+
+    # Async calls
+
+    async def _aattempt(self, messages, stop, kwargs, deadline: float):
+        """One attempt, hedged if it runs long; losing requests are cancelled."""
+        async def call():
+            start = time.monotonic()
+            result = await self.inner.ainvoke(messages, stop=stop, **kwargs)
+            self._observe(time.monotonic() - start)
+            return result
+
+        tasks = [asyncio.ensure_future(call())]
+        try:
+            hedge_after = self.hedge_delay()
+            if hedge_after is not None and time.monotonic() + hedge_after < deadline:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done:
+                    self._count("hedge_fired")
+                    tasks.append(asyncio.ensure_future(call()))
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(deadline - time.monotonic(), 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self._count("hedge_won")
+                        return task.result()
+                    error = task.exception()
+            if error is not None and not pending:
+                raise error
+            raise self._deadline_error()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        deadline = time.monotonic() + self.policy.deadline_s
+        retries = 0
+        while True:
+            try:
+                message = await self._aattempt(messages, stop, kwargs, deadline)
+                self._finish(retries)
+                return ChatResult(generations=[ChatGeneration(message=message)])
+            except Exception as e:
+                if self._give_up(e, retries, deadline):
+                    raise _failure(e, self.model) from e
+                retries += 1
+                self._count("retries")
+                await asyncio.sleep(
+                    min(self.policy.backoff(retries), max(deadline - time.monotonic(), 0))
+                )
+
+
+def _failure(error: BaseException, model: str) -> LLMCallFailed:
+    if isinstance(error, LLMCallFailed):
+        return error
+    return LLMCallFailed(f"Call to {model} failed: {error}")
@@ -0,0 +1,222 @@
+"""Bounded conversation context with a rolling summary of older turns."""
+
+import threading
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ..utils.cassette import cassette_from_env
+from ..utils.metrics import SessionMetrics, invoke_timed
+
+SUMMARY_PROMPT = """You are keeping notes on a real estate sales roleplay between an agent \
+(the trainee) and a client.
+
+Notes so far:
+{summary}
+
+Next part of the conversation:
+{transcript}
+
+Update the notes in at most {words} words, written as the client's memory of the \
+conversation: what the client has shared about their situation, objections raised and \
+how the agent handled them, questions still open, and anything agreed. Reply with the \
+notes only."""
+
+# Shared by all sessions; summaries are short and infrequent
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="context-summary")
+
+
+def message_text(content) -> str:
+    """Text of a message or chunk content (a string or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+    )
+
+
+def _summary_section(summary: str) -> str:
+    if not summary:
+        return ""
+    return f"\n\n## Earlier in This Conversation:\n{summary}"
+
+
+@dataclass(frozen=True)
+class ContextPolicy:
+    """How much conversation history is sent with each request.
+
+    Attributes:
+        max_exchanges: Exchanges (agent message + client reply) kept verbatim,
+            or None to send the whole conversation
+        summarize: Fold older exchanges into a running summary; if False they
+            are dropped
+        summary_words: Target length of the running summary
+        background: Summarize on a background thread; if False, a turn
+            waits for its summary, so each prompt depends only on the
+            conversation (needed to record and replay cassettes)
+    """
+    max_exchanges: Optional[int] = 6
+    summarize: bool = True
+    summary_words: int = 150
+    background: bool = True
+
+
+class ConversationContext:
+    """History sent to the LLM: a running summary plus the last few exchanges.
+
+    Exchanges pushed out of the window are summarized on a background thread
+    after the turn completes, so no turn waits on it. Until a summary has
+    absorbed them they are still sent verbatim, so nothing drops out of
+    context while a summary is being written.
+    """
+
+    def __init__(
+        self,
+        llm,
+        policy: Optional[ContextPolicy] = None,
+        metrics: Optional[SessionMetrics] = None,
+    ):
+        """Initialize context.
+
+        Args:
+            llm: Chat model used to write summaries
+            policy: Context policy (default: ContextPolicy(), summarizing in
+                the foreground while a cassette is active)
+            metrics: Session metrics that summary calls are recorded in
+        """
+        self.llm = llm
+        self.policy = policy or ContextPolicy(background=cassette_from_env() is None)
+        self.metrics = metrics or SessionMetrics()
+        self.summary = ""
+        self._recent: List[Tuple[HumanMessage, AIMessage]] = []  # sent verbatim
+        self._pending: List[Tuple[HumanMessage, AIMessage]] = []  # waiting to be summarized
+        self._lock = threading.Lock()
+        self._job: Optional[Future] = None
+        self._generation = 0  # bumped by clear() to discard in-flight summaries
+
+    def add(self, human: HumanMessage, ai: AIMessage):
+        """Record a completed exchange and summarize what fell out of the window."""
+        with self._lock:
+            self._recent.append((human, ai))
+            limit = self.policy.max_exchanges
+            if limit is not None and len(self._recent) > limit:
+                excess = len(self._recent) - limit
+                if self.policy.summarize:
+                    self._pending.extend(self._recent[:excess])
+                del self._recent[:excess]
+        self._schedule_summary()
+        if not self.policy.background:
+            self.wait()
+
+    def messages(self) -> List:
+        """History messages to send with the next request."""
+        with self._lock:
+            exchanges = self._pending + self._recent
+        return [message for exchange in exchanges for message in exchange]
+
+    def summary_prompt(self) -> str:
+        """System prompt section holding the running summary ("" if none yet)."""
+        return _summary_section(self.summary)
+
+    def prompt(self) -> Tuple[str, List]:
+        """(summary_prompt(), messages()) read together.
+
+        A summary landing between two separate reads would leave the
+        exchanges it folded out of both, so prompts should use this.
+        """
+        with self._lock:
+            summary = self.summary
+            exchanges = self._pending + self._recent
+        return (
+            _summary_section(summary),
+            [message for exchange in exchanges for message in exchange],
+        )
+
+    def snapshot(self) -> Tuple[str, int]:
+        """(summary, number of most recent exchanges not folded into it)."""
+        with self._lock:
+            return self.summary, len(self._pending) + len(self._recent)
+
+    def restore(self, summary: str, exchanges: List[Tuple[HumanMessage, AIMessage]]):
+        """Replace the context with a saved summary and the exchanges after it.
+
+        Exchanges beyond the window are summarized in the background, as if
+        they had just been added.
+        """
+        exchanges = list(exchanges)
+        limit = self.policy.max_exchanges
+        split = 0 if limit is None else max(len(exchanges) - limit, 0)
+        with self._lock:
+            self._generation += 1
+            self._job = None
+            self.summary = summary
+            self._pending = exchanges[:split] if self.policy.summarize else []
+            self._recent = exchanges[split:]
+        self._schedule_summary()
+        if not self.policy.background:
+            self.wait()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until summarizing has finished, including follow-up summaries."""
+        job = self._job
+        while job is not None:
+            job.result(timeout)
+            next_job = self._job
+            if next_job is job:
+                break
+            job = next_job
+
+    def clear(self):
+        """Forget the conversation."""
+        with self._lock:
+            self._generation += 1
+            self._recent = []
+            self._pending = []
+            self._job = None
+            self.summary = ""
+
+    def _schedule_summary(self):
+        """Start summarizing pending exchanges unless a summary is in progress."""
+        with self._lock:
+            if self._job is not None or not self._pending:
+                return
+            self._job = _executor.submit(
+                self._summarize, list(self._pending), self.summary, self._generation
+            )
+
+    def _summarize(self, exchanges: List[Tuple[HumanMessage, AIMessage]], summary: str,
+                   generation: int):
+        """Fold exchanges into the summary (runs on the executor)."""
+        try:
+            transcript = "\n".join(
+                f"Agent: {message_text(human.content)}\nClient: {message_text(ai.content)}"
+                for human, ai in exchanges
+            )
+            prompt = SUMMARY_PROMPT.format(
+                summary=summary or "(none yet)",
+                transcript=transcript,
+                words=self.policy.summary_words,
+            )
+            result = invoke_timed(
+                self.llm, [HumanMessage(content=prompt)], self.metrics, kind="summary"
+            )
+            new_summary = message_text(result.content)
+        except Exception as e:
+            # Keep the exchanges verbatim; the next turn retries
+            warnings.warn(f"Could not summarize conversation history: {e}")
+            new_summary = None
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._job = None
+            if new_summary is not None:
+                self.summary = new_summary.strip()
+                del self._pending[:len(exchanges)]
+            more = new_summary is not None and bool(self._pending)
+
+        if more:
+            self._schedule_summary()
@@ -1,14 +1,27 @@
 """Enhanced roleplay agent with CFR scoring and training modes."""
 
-import os
-from typing import Optional, List, Tuple
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, List, Tuple
 from pathlib import Path
 
-from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
+from .context import ContextPolicy, ConversationContext, message_text
+from .llm_pool import get_chat_model
+from .model_router import ModelRouter, RouteDecision, objection_likely
+from .opening_pool import OPENING_LINE, OpeningPool, get_opening_pool
 from ..characters.persona_character import PersonaCharacter
 from ..scoring.conversation_scorer import ConversationScorer, TurnScore
+from ..scoring.score_stats import ScoreAccumulator
+from ..utils.metrics import (
+    SessionMetrics, ainvoke_timed, invoke_timed, model_name, stream_timed,
+)
+
+# Format of the dicts produced by EnhancedRoleplayAgent.snapshot
+SNAPSHOT_VERSION = 1
 
 
 class EnhancedRoleplayAgent:
@@ -22,6 +35,9 @@ class EnhancedRoleplayAgent:
         model_name: Optional[str] = None,
         temperature: float = 0.7,
         api_key: Optional[str] = None,
+        context_policy: Optional[ContextPolicy] = None,
+        llm: Optional[BaseChatModel] = None,
+        router: Optional[ModelRouter] = None,
     ):
         """Initialize enhanced roleplay agent.
 
@@ -29,9 +45,17 @@ class EnhancedRoleplayAgent:
             persona: PersonaCharacter to roleplay
             difficulty: "beginner", "medium", or "advanced"
             training_mode: "practice", "scoring", or "challenge"
-            model_name: Model to use
+            model_name: Model to use for every turn (default: each turn is
+                routed to a model tier by the router)
             temperature: Temperature for generation
             api_key: Anthropic API key
+            context_policy: How much history is sent per turn (default:
+                last 6 exchanges plus a running summary)
+            llm: Chat model to use instead of ChatAnthropic (e.g. a cassette
+                replay model); model_name, temperature and api_key are then
+                ignored and turns are not routed
+            router: Model router (default: ModelRouter with temperature and
+                api_key)
         """
         self.persona = persona
         self.difficulty = difficulty
@@ -40,17 +64,26 @@ class EnhancedRoleplayAgent:
 
         # Conversation history
         self.conversation_turns: List[Tuple[str, str]] = []  # (agent, client) pairs
+        self.cooperation_history: List[int] = []  # persona cooperation after each turn
         self.turn_scores: List[TurnScore] = []
-
-        # Initialize LLM
-        self.llm = ChatAnthropic(
-            model=model_name or os.getenv("DEFAULT_MODEL", "claude-sonnet-4-5-20250929"),
-            temperature=temperature,
-            api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
-        )
-
-        # Message history
+        self.session_stats = ScoreAccumulator()
+
+        # Initialize LLM (shared with other sessions using the same settings).
+        # Unless a model is pinned, each turn is routed to a model tier and
+        # self.llm is the tier for this difficulty (used for openings and summaries)
+        self.router: Optional[ModelRouter] = None
+        if llm is None and model_name is None:
+            self.router = router or ModelRouter(temperature=temperature, api_key=api_key)
+            llm = self.router.model_for_difficulty(difficulty)
+        self.llm = llm or get_chat_model(model_name, temperature, api_key)
+
+        # Full message history, and the bounded part of it sent to the LLM
         self.message_history: List = []
+        self.metrics = SessionMetrics()
+        self.context = ConversationContext(self.llm, context_policy, self.metrics)
+
+        # Response dict of the last completed chat_stream call
+        self.last_response: Optional[dict] = None
 
     def chat(self, agent_message: str, thread_id: Optional[str] = None) -> dict:
         """Send message and get response with scoring.
@@ -61,34 +94,181 @@ class EnhancedRoleplayAgent:
 
         Returns:
             Dict with response, score, and feedback
+
+        Raises:
+            LLMCallFailed: The persona's reply could not be generated; the
+                turn is not recorded and can be sent again
         """
-        # Score the agent's message if we have context
-        if self.conversation_turns:
-            last_client_msg = self.conversation_turns[-1][1] if self.conversation_turns else ""
-            turn_score = self.scorer.score_turn(agent_message, context=last_client_msg)
-            self.turn_scores.append(turn_score)
+        with self._rollback_on_failure():
+            turn_score = self._score_message(agent_message)
+
+            # Invoke LLM
+            messages = self._build_messages(agent_message)
+            if self.router:
+                result = self.router.invoke(messages, self._route(agent_message), self.metrics)
+            else:
+                result = invoke_timed(self.llm, messages, self.metrics)
+
+        return self._record_turn(agent_message, result.content, turn_score)
+
+    def chat_stream(self, agent_message: str, thread_id: Optional[str] = None) -> Iterator[str]:
+        """Send message and yield the persona's response as it is generated.
+
+        Scoring happens before the first chunk is yielded. History and turns
+        are only updated once the stream is exhausted; the response dict
+        ``chat`` would return is then available as ``last_response``.
+
+        Args:
+            agent_message: What the agent (trainee) said
+            thread_id: Optional thread ID
+
+        Yields:
+            Text chunks of the persona's response
+        """
+        self.last_response = None
+        chunks = []
+        with self._rollback_on_failure():
+            turn_score = self._score_message(agent_message)
+
+            messages = self._build_messages(agent_message)
+            if self.router:
+                texts = self.router.stream(messages, self._route(agent_message), self.metrics)
+            else:
+                texts = (
+                    message_text(chunk.content)
+                    for chunk in stream_timed(self.llm, messages, self.metrics)
+                )
+            try:
+                for text in texts:
+                    if text:
+                        chunks.append(text)
+                        yield text
+            finally:
+                # Close now rather than at garbage collection, so an abandoned
+                # stream is recorded in metrics when it is abandoned
+                texts.close()
+
+        self.last_response = self._record_turn(agent_message, "".join(chunks), turn_score)
+
+    async def achat(self, agent_message: str, thread_id: Optional[str] = None) -> dict:
+        """Async version of chat that scores while the LLM call is in flight.
+
+        The prompt is built before scoring, so the cooperation adjustment from
+        this turn's score shapes the persona's next reply rather than this
+        one. Sessions can be served concurrently from one event loop, but each
+        agent must have at most one turn in flight.
+
+        Args:
+            agent_message: What the agent (trainee) said
+            thread_id: Optional thread ID
+
+        Returns:
+            Dict with response, score, and feedback
+        """
+        messages = self._build_messages(agent_message)
+
+        if self.router:
+            request = self.router.ainvoke(messages, self._route(agent_message), self.metrics)
+        else:
+            request = ainvoke_timed(self.llm, messages, self.metrics)
+
+        # Scoring is CPU work; run it in a thread alongside the request. The
+        # thread only scores: cooperation changes once both have succeeded, so
+        # a failed request leaves no trace even if scoring is still running.
+        turn_score, result = await asyncio.gather(
+            asyncio.to_thread(self._score_turn, agent_message), request
+        )
+        if turn_score:
+            self.persona.adjust_cooperation(turn_score.total)
 
+        return self._record_turn(agent_message, result.content, turn_score)
+
+    def start_from_pool(self, pool: Optional[OpeningPool] = None) -> Optional[dict]:
+        """Seed the opening exchange with a pre-generated persona reply.
+
+        Args:
+            pool: Opening pool (default: process-wide pool)
+
+        Returns:
+            Response dict like ``chat(OPENING_LINE)``, or None if no reply
+            was ready (start with ``chat(OPENING_LINE)`` instead)
+        """
+        if self.conversation_turns:
+            return None
+        pool = pool or get_opening_pool()
+        reply = pool.take(self.persona, self.difficulty, self.llm)
+        if reply is None:
+            return None
+        return self._record_turn(OPENING_LINE, reply, None)
+
+    @contextmanager
+    def _rollback_on_failure(self):
+        """Undo the turn's cooperation change if the persona's reply fails."""
+        cooperation = self.persona.cooperation_level
+        try:
+            yield
+        except BaseException:
+            self.persona.cooperation_level = cooperation
+            raise
+
+    def _score_turn(self, agent_message: str) -> Optional[TurnScore]:
+        """Score the agent's message without changing state (None on the opening turn)."""
+        # Score the agent's message if we have context
+        if not self.conversation_turns:
+            return None
+
+        last_client_msg = self.conversation_turns[-1][1]
+        start = time.perf_counter()
+        turn_score = self.scorer.score_turn(agent_message, context=last_client_msg)
+        self.metrics.record_scoring(time.perf_counter() - start)
+        return turn_score
+
+    def _score_message(self, agent_message: str) -> Optional[TurnScore]:
+        """Score the agent's message and adjust cooperation (None on the opening turn)."""
+        turn_score = self._score_turn(agent_message)
+        if turn_score:
             # Adjust persona cooperation based on score
             self.persona.adjust_cooperation(turn_score.total)
-        else:
-            turn_score = None
+        return turn_score
+
+    def _route(self, agent_message: str) -> RouteDecision:
+        """Model tier for the persona's reply to agent_message."""
+        last_client_msg = self.conversation_turns[-1][1] if self.conversation_turns else ""
+        objection = objection_likely(
+            self.persona, self.difficulty, (agent_message, last_client_msg)
+        )
+        return self.router.route(
+            self.difficulty, agent_message, self.persona.cooperation_level, objection
+        )
 
-        # Get persona response using LangChain
-        system_prompt = self.persona.get_system_prompt(self.difficulty)
+    def _build_messages(self, agent_message: str) -> List:
+        """Prompt messages for the persona's next response."""
+        # Cached persona prefix plus the per-turn state block
+        system_prompt = self.persona.get_system_prompt_blocks(self.difficulty)
+        summary, history = self.context.prompt()
+        if summary:
+            system_prompt.append({"type": "text", "text": summary})
         messages = [SystemMessage(content=system_prompt)]
-        messages.extend(self.message_history)
+        messages.extend(history)
         messages.append(HumanMessage(content=agent_message))
-
-        # Invoke LLM
-        result = self.llm.invoke(messages)
-        client_response = result.content
-
-        # Store in message history
-        self.message_history.append(HumanMessage(content=agent_message))
-        self.message_history.append(AIMessage(content=client_response))
+        return messages
+
+    def _record_turn(
+        self, agent_message: str, client_response: str, turn_score: Optional[TurnScore]
+    ) -> dict:
+        """Store a completed turn and build the response for the training mode."""
+        # Store in message history; older turns are summarized in the background
+        human, ai = HumanMessage(content=agent_message), AIMessage(content=client_response)
+        self.message_history.append(human)
+        self.message_history.append(ai)
+        self.context.add(human, ai)
 
         # Store turn
         self.conversation_turns.append((agent_message, client_response))
+        self.cooperation_history.append(self.persona.cooperation_level)
+        if turn_score:
+            self.turn_scores.append(turn_score)
+            self.session_stats.add(turn_score)
 
         # Prepare response based on training mode
         response = {
@@ -142,18 +322,15 @@ class EnhancedRoleplayAgent:
 
     def get_session_summary(self) -> dict:
         """Get summary of entire session."""
-        if not self.turn_scores:
+        stats = self.session_stats
+        if not stats.num_turns:
             return {"message": "No turns scored yet"}
 
-        total_score = sum(ts.total for ts in self.turn_scores)
-        max_score = sum(ts.max_score for ts in self.turn_scores)
-        percentage = (total_score / max_score * 100) if max_score > 0 else 0
-
         # Calculate averages
-        avg_ack = sum(ts.acknowledge_affirm for ts in self.turn_scores) / len(self.turn_scores)
-        avg_iso = sum(ts.isolate for ts in self.turn_scores) / len(self.turn_scores)
-        avg_handle = sum(ts.handle for ts in self.turn_scores) / len(self.turn_scores)
-        avg_close = sum(ts.close for ts in self.turn_scores) / len(self.turn_scores)
+        avg_ack = stats.average("acknowledge_affirm")
+        avg_iso = stats.average("isolate")
+        avg_handle = stats.average("handle")
+        avg_close = stats.average("close")
 
         # Identify strengths and improvements
         strengths = []
@@ -175,28 +352,16 @@ class EnhancedRoleplayAgent:
             improvements.append("Try Feel-Felt-Found or Has There Ever Been techniques")
 
         # Rapport breakers
-        total_breakers = sum(len(ts.rapport_breakers) for ts in self.turn_scores)
+        total_breakers = stats.rapport_breakers
         if total_breakers > 0:
             improvements.append(f"Avoid rapport breakers ({total_breakers} detected)")
 
-        # Grade
-        if percentage >= 90:
-            grade = "A"
-        elif percentage >= 80:
-            grade = "B"
-        elif percentage >= 70:
-            grade = "C"
-        elif percentage >= 60:
-            grade = "D"
-        else:
-            grade = "F"
-
         return {
-            "total_score": total_score,
-            "max_score": max_score,
-            "percentage": percentage,
-            "grade": grade,
-            "num_turns": len(self.turn_scores),
+            "total_score": stats.total_score,
+            "max_score": stats.max_score,
+            "percentage": stats.percentage,
+            "grade": stats.grade,
+            "num_turns": stats.num_turns,
             "averages": {
                 "acknowledge_affirm": round(avg_ack, 1),
                 "isolate": round(avg_iso, 1),
@@ -206,11 +371,86 @@ class EnhancedRoleplayAgent:
             "strengths": strengths,
             "improvements": improvements,
             "final_cooperation": self.persona.cooperation_level,
+            "metrics": self.metrics.summary(),
+            "routing": self.router.stats() if self.router else {},
+        }
+
+    def snapshot(self) -> dict:
+        """Compact, JSON-serializable state of the session.
+
+        Holds the conversation text, persona state and running summary.
+        Scores are not stored: they depend only on the agent's messages and
+        are recomputed by ``from_snapshot``.
+        """
+        summary, verbatim = self.context.snapshot()
+        return {
+            "version": SNAPSHOT_VERSION,
+            "persona_id": self.persona.id,
+            "difficulty": self.difficulty,
+            "training_mode": self.training_mode,
+            "model": None if self.router else model_name(self.llm),
+            "persona_state": self.persona.get_state(),
+            "turns": [list(turn) for turn in self.conversation_turns],
+            "cooperation": self.cooperation_history,
+            "summary": summary,
+            "verbatim": verbatim,
         }
 
+    @classmethod
+    def from_snapshot(
+        cls, data: dict, persona: PersonaCharacter, **kwargs
+    ) -> "EnhancedRoleplayAgent":
+        """Rebuild an agent from ``snapshot()`` output.
+
+        Args:
+            data: Snapshot dict
+            persona: Fresh persona with id ``data["persona_id"]``
+            **kwargs: Further EnhancedRoleplayAgent arguments (e.g. api_key)
+
+        Returns:
+            Agent ready to continue the conversation
+
+        Raises:
+            ValueError: If the snapshot has an unknown version or is for
+                another persona
+        """
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported session snapshot version: {data.get('version')}")
+        if data["persona_id"] != persona.id:
+            raise ValueError(f"Snapshot is for persona {data['persona_id']}, not {persona.id}")
+
+        kwargs.setdefault("model_name", data["model"])
+        agent = cls(persona, difficulty=data["difficulty"],
+                    training_mode=data["training_mode"], **kwargs)
+        persona.set_state(data["persona_state"])
+
+        agent.conversation_turns = [tuple(turn) for turn in data["turns"]]
+        agent.cooperation_history = list(data["cooperation"])
+        exchanges = [
+            (HumanMessage(content=agent_message), AIMessage(content=client_response))
+            for agent_message, client_response in agent.conversation_turns
+        ]
+        agent.message_history = [message for exchange in exchanges for message in exchange]
+
+        # Every turn after the opening was scored
+        for agent_message, _ in agent.conversation_turns[1:]:
+            turn_score = agent.scorer.score_turn(agent_message)
+            agent.turn_scores.append(turn_score)
+            agent.session_stats.add(turn_score)
+
+        verbatim = data["verbatim"]
+        agent.context.restore(data["summary"], exchanges[len(exchanges) - verbatim:])
+        return agent
+
     def reset(self):
         """Reset for new session."""
         self.persona.reset_conversation()
         self.conversation_turns = []
+        self.cooperation_history = []
         self.turn_scores = []
+        self.session_stats = ScoreAccumulator()
         self.message_history = []
+        self.context.clear()
+        self.metrics.clear()
+        self.last_response = None
+
@@ -0,0 +1,107 @@
+"""Process-wide pool of chat model clients shared by all sessions."""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from .call_policy import CallPolicy, PolicyChatModel, policy_from_env
+from ..utils.cassette import cassette_from_env
+
+DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+
+_lock = threading.Lock()
+_pool: Dict[Tuple[str, float, str, CallPolicy], BaseChatModel] = {}
+
+
+def get_chat_model(
+    model_name: Optional[str] = None,
+    temperature: float = 0.7,
+    api_key: Optional[str] = None,
+    policy: Optional[CallPolicy] = None,
+) -> BaseChatModel:
+    """Shared chat model for (model, temperature, api key, call policy).
+
+    Chat models hold no conversation state, so one client - and its
+    keep-alive HTTP connection pool - serves every session with the same
+    settings. If AIROLEPLAY_CASSETTE is set the client is wrapped in the
+    cassette. Calls go through the policy's deadline, retries and hedging;
+    the underlying client's own retries are turned off.
+
+    Args:
+        model_name: Model to use (defaults to DEFAULT_MODEL env var)
+        temperature: Temperature for generation
+        api_key: Anthropic API key (or uses ANTHROPIC_API_KEY env var)
+        policy: Call policy (defaults to policy_from_env())
+
+    Returns:
+        Pooled chat model
+    """
+    model_name = model_name or os.getenv("DEFAULT_MODEL", DEFAULT_MODEL)
+    api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+    # Pool keys hold a digest rather than the API key itself
+    key_digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+    policy = policy or policy_from_env()
+    pool_key = (model_name, temperature, key_digest, policy)
+
+    with _lock:
+        llm = _pool.get(pool_key)
+        if llm is None:
+            llm = ChatAnthropic(
+                model=model_name,
+                temperature=temperature,
+                api_key=api_key,
+                max_retries=0,
+                timeout=policy.deadline_s,
+            )
+            cassette = cassette_from_env()
+            if cassette is not None:
+                llm = cassette.wrap_chat_model(llm)
+            llm = PolicyChatModel(inner=llm, policy=policy, model=model_name)
+            _pool[pool_key] = llm
+    return llm
+
+
+def preconnect(
+    model_name: Optional[str] = None,
+    temperature: float = 0.7,
+    api_key: Optional[str] = None,
+    timeout: float = 5.0,
+) -> bool:
+    """Open the pooled client's HTTPS connection before the first turn.
+
+    Sends one unauthenticated HEAD request to the API host, so the DNS
+    lookup and TLS handshake are done (and the connection kept alive) by
+    the time a trainee sends their first message. Best effort: failures are
+    reported, not raised.
+
+    Returns:
+        True if a connection was established
+    """
+    llm = get_chat_model(model_name, temperature, api_key).inner
+    client = getattr(llm, "_client", None)
+    http_client = getattr(client, "_client", None)
+    if http_client is None:
+        # Cassette or other non-Anthropic model: nothing to connect
+        return False
+
+    try:
+        http_client.head(str(client.base_url), timeout=timeout)
+    except Exception as e:
+        print(f"⚠️  Could not pre-connect to {client.base_url}: {e}")
+        return False
+    return True
+
+
+def pool_size() -> int:
+    """Number of distinct pooled clients."""
+    return len(_pool)
+
+
+def clear_pool():
+    """Drop all pooled clients (e.g. after rotating API keys)."""
+    with _lock:
+        _pool.clear()
@@ -0,0 +1,289 @@
+"""Per-turn model tier routing with fallback to a stronger model."""
+
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from .call_policy import CallPolicy
+from .context import message_text
+from .llm_pool import DEFAULT_MODEL, get_chat_model
+from ..characters.persona_character import PersonaCharacter
+from ..utils.metrics import (
+    SessionMetrics, ainvoke_timed, get_metrics_registry, invoke_timed, stream_timed,
+)
+
+FAST_MODEL = "claude-haiku-4-5-20251001"
+
+# Phrases that mean the model stepped out of the roleplay instead of answering.
+# Discomfort or inability alone ("I'm not comfortable with that fee", "I can't
+# help with the down payment yet") is an ordinary client line, so it is not a
+# marker; API refusals are caught by their stop reason.
+REFUSAL_MARKERS = (
+    "as an ai",
+    "i'm an ai",
+    "i am an ai",
+    "i'm claude",
+    "i am claude",
+    "language model",
+    "this roleplay",
+    "the roleplay",
+    "i'm not able to roleplay",
+)
+
+# Stop reasons that leave an unusable reply
+BAD_STOP_REASONS = ("refusal", "max_tokens")
+
+
+def default_tiers() -> Tuple[Tuple[str, str], ...]:
+    """(tier, model) pairs from cheapest to strongest.
+
+    AIROLEPLAY_FAST_MODEL overrides the fast tier; the standard tier
+    follows DEFAULT_MODEL like the rest of the app.
+    """
+    return (
+        ("fast", os.getenv("AIROLEPLAY_FAST_MODEL", FAST_MODEL)),
+        ("standard", os.getenv("DEFAULT_MODEL", DEFAULT_MODEL)),
+    )
+
+
+@dataclass(frozen=True)
+class RoutingPolicy:
+    """How turns are scored for complexity and mapped to model tiers.
+
+    A turn earns points for difficulty, a long agent message, a resistant
+    client and a likely objection; it goes to the strongest tier whose
+    minimum points it reaches.
+
+    Attributes:
+        tiers: (tier, model) pairs from cheapest to strongest
+        tier_points: Minimum points for each tier (same order as tiers)
+        difficulty_points: Points for each difficulty level
+        long_message_words: Agent messages this long earn a point
+        low_cooperation: Cooperation below this earns a point
+        stream_check_chars: Streamed reply characters held back and checked
+            for a refusal before they are shown (only when a stronger tier
+            exists to fall back to)
+    """
+    tiers: Tuple[Tuple[str, str], ...] = field(default_factory=default_tiers)
+    tier_points: Tuple[int, ...] = (0, 2)
+    difficulty_points: Tuple[Tuple[str, int], ...] = (
+        ("beginner", 0), ("medium", 1), ("advanced", 2),
+    )
+    long_message_words: int = 40
+    low_cooperation: int = 4
+    stream_check_chars: int = 80
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """The tier chosen for a turn and why."""
+    tier: str
+    points: int
+    reasons: Tuple[str, ...] = ()
+
+
+def objection_likely(persona: PersonaCharacter, difficulty: str, texts: Iterable[str]) -> bool:
+    """True if any text touches a trigger phrase of an objection the persona may raise.
+
+    Args:
+        persona: Persona being played
+        difficulty: Difficulty level (limits the objections in play)
+        texts: Recent conversation text, e.g. the agent's message and the
+            client's last reply
+    """
+    text = " ".join(texts).lower()
+    return any(
+        phrase.lower() in text
+        for objection in persona.available_objections(difficulty)
+        for phrase in objection.trigger_phrases
+    )
+
+
+def fallback_reason(message) -> Optional[str]:
+    """Why a reply should be regenerated by a stronger model, or None if it is usable.
+
+    Args:
+        message: AIMessage or accumulated AIMessageChunk
+    """
+    text = message_text(message.content).strip()
+    stop_reason = (message.response_metadata or {}).get("stop_reason")
+    if stop_reason in BAD_STOP_REASONS:
+        return stop_reason
+    if not text:
+        return "empty"
+    lowered = text.lower().replace("\u2019", "'")
+    if any(marker in lowered for marker in REFUSAL_MARKERS):
+        return "refused"
+    return None
+
+
+class ModelRouter:
+    """Chooses a model tier per turn and escalates unusable replies.
+
+    Beginner small talk goes to the fast tier; advanced personas, long or
+    objection-heavy turns and resistant clients go to the standard tier.
+    A refused, empty or truncated reply is regenerated one tier up.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RoutingPolicy] = None,
+        temperature: float = 0.7,
+        api_key: Optional[str] = None,
+        call_policy: Optional[CallPolicy] = None,
+    ):
+        """Initialize router.
+
+        Args:
+            policy: Routing policy (default: RoutingPolicy())
+            temperature: Temperature for generation
+            api_key: Anthropic API key
+            call_policy: Deadline and retry policy for the pooled clients
+        """
+        self.policy = policy or RoutingPolicy()
+        self.temperature = temperature
+        self.api_key = api_key
+        self.call_policy = call_policy
+        self._tier_names = [tier for tier, _ in self.policy.tiers]
+        self._models = dict(self.policy.tiers)
+        self._difficulty_points = dict(self.policy.difficulty_points)
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def model(self, tier: str) -> BaseChatModel:
+        """Pooled chat model for a tier."""
+        return get_chat_model(self._models[tier], self.temperature, self.api_key, self.call_policy)
+
+    def stronger(self, tier: str) -> Optional[str]:
+        """The next tier up, or None for the strongest."""
+        i = self._tier_names.index(tier)
+        return self._tier_names[i + 1] if i + 1 < len(self._tier_names) else None
+
+    def _tier_for(self, points: int) -> str:
+        tier = self._tier_names[0]
+        for name, minimum in zip(self._tier_names, self.policy.tier_points):
+            if points >= minimum:
+                tier = name
+        return tier
+
+    def model_for_difficulty(self, difficulty: str) -> BaseChatModel:
+        """Model a turn gets from difficulty alone (e.g. the opening reply)."""
+        return self.model(self._tier_for(self._difficulty_points.get(difficulty, 1)))
+
+    def route(
+        self,
+        difficulty: str,
+        agent_message: str,
+        cooperation_level: int,
+        objection: bool = False,
+    ) -> RouteDecision:
+        """Choose the tier for a turn.
+
+        Args:
+            difficulty: "beginner", "medium", or "advanced"
+            agent_message: What the agent (trainee) said
+            cooperation_level: Persona's current cooperation (0-10)
+            objection: Whether the persona is likely to raise or press an
+                objection this turn
+
+        Returns:
+            RouteDecision with the tier and the signals that raised it
+        """
+        points = self._difficulty_points.get(difficulty, 1)
+        reasons = [difficulty] if points else []
+        if len(agent_message.split()) >= self.policy.long_message_words:
+            points += 1
+            reasons.append("long message")
+        if cooperation_level < self.policy.low_cooperation:
+            points += 1
+            reasons.append("resistant client")
+        if objection:
+            points += 1
+            reasons.append("objection likely")
+
+        decision = RouteDecision(self._tier_for(points), points, tuple(reasons))
+        with self._lock:
+            self._counts[f"routed:{decision.tier}"] += 1
+        get_metrics_registry().inc("llm_routed_total", tier=decision.tier)
+        return decision
+
+    def stats(self) -> Dict[str, int]:
+        """Turns routed to and escalated from each tier ("routed:fast", "escalated:fast")."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _escalate(self, tier: str, reason: Optional[str]) -> Optional[str]:
+        """Next tier to try, or None to keep the reply."""
+        stronger = self.stronger(tier)
+        if reason is None or stronger is None:
+            return None
+        with self._lock:
+            self._counts[f"escalated:{tier}"] += 1
+        get_metrics_registry().inc("llm_route_escalations_total", tier=tier, reason=reason)
+        return stronger
+
+    def invoke(self, messages: List, decision: RouteDecision, metrics: SessionMetrics):
+        """Invoke the routed model, escalating unusable replies."""
+        tier = decision.tier
+        while True:
+            result = invoke_timed(self.model(tier), messages, metrics)
+            tier = self._escalate(tier, fallback_reason(result))
+            if tier is None:
+                return result
+
+    async def ainvoke(self, messages: List, decision: RouteDecision, metrics: SessionMetrics):
+        """Async version of invoke."""
+        tier = decision.tier
+        while True:
+            result = await ainvoke_timed(self.model(tier), messages, metrics)
+            tier = self._escalate(tier, fallback_reason(result))
+            if tier is None:
+                return result
+
+    def stream(
+        self, messages: List, decision: RouteDecision, metrics: SessionMetrics
+    ) -> Iterator[str]:
+        """Stream the routed model's reply as text.
+
+        When a stronger tier exists, the first ``stream_check_chars``
+        characters are held back and checked, so a refusal can be replaced
+        before the trainee sees it. Later text is not checked.
+        """
+        tier = decision.tier
+        while True:
+            chunks = stream_timed(self.model(tier), messages, metrics)
+            try:
+                if self.stronger(tier) is None:
+                    for chunk in chunks:
+                        text = message_text(chunk.content)
+                        if text:
+                            yield text
+                    return
+
+                head = None
+                for chunk in chunks:
+                    head = chunk if head is None else head + chunk
+                    if len(message_text(head.content)) >= self.policy.stream_check_chars:
+                        break
+                reason = fallback_reason(head) if head is not None else "empty"
+                # A short reply ends within the check, so its stop reason is known too
+                next_tier = self._escalate(tier, reason)
+                if next_tier is not None:
+                    tier = next_tier
+                    continue
+
+                text = message_text(head.content) if head is not None else ""
+                if text:
+                    yield text
+                for chunk in chunks:
+                    text = message_text(chunk.content)
+                    if text:
+                        yield text
+                return
+            finally:
+                # Ends the stream (and records it) if the consumer stops early
+                chunks.close()
@@ -0,0 +1,140 @@
+"""Background-refilled pool of pre-generated opening replies."""
+
+import threading
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from .context import message_text
+from ..characters.persona_character import PersonaCharacter
+from ..characters.persona_registry import get_persona_registry
+from ..utils.metrics import SessionMetrics, invoke_timed, model_name
+
+OPENING_LINE = "Hi, I'm a real estate agent. How can I help you today?"
+
+PoolKey = Tuple[str, str, str]  # (persona id, difficulty, model)
+
+
+class OpeningPool:
+    """Pre-generated persona replies to the standard opening line.
+
+    Every session starts with the same agent line and a fresh persona, so
+    the persona's first reply can be generated before the session exists.
+    Each (persona, difficulty, model) keeps up to ``size`` replies ready;
+    taking one schedules a replacement on a background thread.
+    """
+
+    def __init__(self, size: int = 2, max_workers: int = 2):
+        """Initialize pool.
+
+        Args:
+            size: Replies kept ready per (persona, difficulty, model)
+            max_workers: Concurrent background generations
+        """
+        self.size = size
+        self.metrics = SessionMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="opening-pool")
+        self._lock = threading.Lock()
+        self._replies: Dict[PoolKey, Deque[str]] = {}
+        self._in_flight: Dict[PoolKey, int] = {}
+        self._sources: Dict[PoolKey, Tuple[PersonaCharacter, object]] = {}
+
+    def _key(self, persona: PersonaCharacter, difficulty: str, llm) -> PoolKey:
+        key = (persona.id, difficulty, model_name(llm))
+        if key not in self._sources:
+            # Generate from fresh state; the caller's persona changes as it is used
+            self._sources[key] = (PersonaCharacter(persona.template), llm)
+        return key
+
+    def warm(self, persona: PersonaCharacter, difficulty: str, llm):
+        """Start generating replies for a persona and difficulty up to the pool size."""
+        with self._lock:
+            key = self._key(persona, difficulty, llm)
+            ready = len(self._replies.get(key, ()))
+            missing = self.size - ready - self._in_flight.get(key, 0)
+            if missing <= 0:
+                return
+            self._in_flight[key] = self._in_flight.get(key, 0) + missing
+        for _ in range(missing):
+            self._executor.submit(self._generate, key)
+
+    def take(self, persona: PersonaCharacter, difficulty: str, llm) -> Optional[str]:
+        """Remove and return a ready reply (None if none is ready yet), then refill."""
+        with self._lock:
+            key = self._key(persona, difficulty, llm)
+            replies = self._replies.get(key)
+            reply = replies.popleft() if replies else None
+        self.warm(persona, difficulty, llm)
+        return reply
+
+    def ready(self, persona: PersonaCharacter, difficulty: str, llm) -> int:
+        """Number of replies ready for a persona and difficulty."""
+        key = (persona.id, difficulty, model_name(llm))
+        return len(self._replies.get(key, ()))
+
+    def clear(self, persona_ids: Optional[Iterable[str]] = None):
+        """Drop ready replies (e.g. after editing personas).
+
+        Args:
+            persona_ids: Only drop replies for these personas (default: all)
+        """
+        with self._lock:
+            if persona_ids is None:
+                self._replies.clear()
+                self._sources.clear()
+                return
+            persona_ids = set(persona_ids)
+            for key in [key for key in self._sources if key[0] in persona_ids]:
+                self._replies.pop(key, None)
+                del self._sources[key]
+
+    def _generate(self, key: PoolKey):
+        """Generate one reply for key (runs on the executor)."""
+        with self._lock:
+            source = self._sources.get(key)
+            if source is None:
+                # Cleared before this job started
+                self._in_flight[key] -= 1
+                return
+        persona, llm = source
+        difficulty = key[1]
+        try:
+            messages = [
+                SystemMessage(content=persona.get_system_prompt_blocks(difficulty)),
+                HumanMessage(content=OPENING_LINE),
+            ]
+            result = invoke_timed(llm, messages, self.metrics, kind="opening")
+            reply = message_text(result.content)
+        except Exception as e:
+            warnings.warn(f"Could not pre-generate opening for {persona.id}: {e}")
+            reply = None
+
+        with self._lock:
+            self._in_flight[key] -= 1
+            # Drop replies for a persona that was cleared while generating
+            if reply and self._sources.get(key) is source:
+                self._replies.setdefault(key, deque()).append(reply)
+
+
+_pool = OpeningPool()
+_pool_listening = False
+_pool_lock = threading.Lock()
+
+
+def get_opening_pool() -> OpeningPool:
+    """Return the process-wide opening reply pool.
+
+    The first call subscribes the pool to persona reloads, so importing
+    this module does not load the persona registry.
+    """
+    global _pool_listening
+    with _pool_lock:
+        if not _pool_listening:
+            # Replies written for an edited persona are stale
+            get_persona_registry().add_listener(_pool.clear)
+            _pool_listening = True
+    return _pool
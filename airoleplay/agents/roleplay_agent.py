@@ -3,10 +3,13 @@
 import os
 from typing import Optional, List
 
-from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 
+from .context import ContextPolicy, ConversationContext
+from .llm_pool import DEFAULT_MODEL, get_chat_model
 from ..characters.base import Character
+from ..utils.metrics import SessionMetrics, ainvoke_timed, invoke_timed
 
 
 class RoleplayAgent:
@@ -18,6 +21,8 @@ class RoleplayAgent:
         model_name: Optional[str] = None,
         temperature: float = 0.7,
         api_key: Optional[str] = None,
+        context_policy: Optional[ContextPolicy] = None,
+        llm: Optional[BaseChatModel] = None,
     ):
         """Initialize the roleplay agent.
 
@@ -26,21 +31,23 @@ class RoleplayAgent:
             model_name: Model to use (defaults to claude-sonnet-4-5)
             temperature: Temperature for generation (0.0-1.0)
             api_key: Anthropic API key (or uses ANTHROPIC_API_KEY env var)
+            context_policy: How much history is sent per turn (default:
+                last 6 exchanges plus a running summary)
+            llm: Chat model to use instead of ChatAnthropic (e.g. a cassette
+                replay model)
         """
         self.character = character
-        self.model_name = model_name or os.getenv(
-            "DEFAULT_MODEL", "claude-sonnet-4-5-20250929"
-        )
+        self.model_name = model_name or os.getenv("DEFAULT_MODEL", DEFAULT_MODEL)
         self.temperature = temperature
         self.system_prompt = character.get_system_prompt()
         self.message_history: List = []
 
-        # Initialize the LLM
-        self.llm = ChatAnthropic(
-            model=self.model_name,
-            temperature=self.temperature,
-            api_key=api_key or os.getenv("ANTHROPIC_API_KEY"),
-        )
+        # Initialize the LLM (shared with other sessions using the same settings)
+        self.llm = llm or get_chat_model(self.model_name, self.temperature, api_key)
+
+        # LLM call metrics, and the bounded part of the history sent to the LLM
+        self.metrics = SessionMetrics()
+        self.context = ConversationContext(self.llm, context_policy, self.metrics)
 
     def chat(self, message: str, thread_id: Optional[str] = None) -> str:
         """Send a message to the character and get a response.
@@ -52,17 +59,12 @@ class RoleplayAgent:
         Returns:
             The character's response
         """
-        # Build messages with system prompt and history
-        messages = [SystemMessage(content=self.system_prompt)]
-        messages.extend(self.message_history)
-        messages.append(HumanMessage(content=message))
+        messages = self._build_messages(message)
 
         # Invoke the LLM
-        response = self.llm.invoke(messages)
+        response = invoke_timed(self.llm, messages, self.metrics)
 
-        # Store in history
-        self.message_history.append(HumanMessage(content=message))
-        self.message_history.append(AIMessage(content=response.content))
+        self._record_turn(message, response.content)
 
         return response.content
 
@@ -76,20 +78,30 @@ class RoleplayAgent:
         Returns:
             The character's response
         """
-        # Build messages with system prompt and history
-        messages = [SystemMessage(content=self.system_prompt)]
-        messages.extend(self.message_history)
-        messages.append(HumanMessage(content=message))
+        messages = self._build_messages(message)
 
         # Invoke the LLM asynchronously
-        response = await self.llm.ainvoke(messages)
+        response = await ainvoke_timed(self.llm, messages, self.metrics)
 
-        # Store in history
-        self.message_history.append(HumanMessage(content=message))
-        self.message_history.append(AIMessage(content=response.content))
+        self._record_turn(message, response.content)
 
         return response.content
 
+    def _build_messages(self, message: str) -> List:
+        """Prompt messages: system prompt, running summary and recent history."""
+        summary, history = self.context.prompt()
+        messages = [SystemMessage(content=self.system_prompt + summary)]
+        messages.extend(history)
+        messages.append(HumanMessage(content=message))
+        return messages
+
+    def _record_turn(self, message: str, response: str):
+        """Store a completed exchange; older turns are summarized in the background."""
+        human, ai = HumanMessage(content=message), AIMessage(content=response)
+        self.message_history.append(human)
+        self.message_history.append(ai)
+        self.context.add(human, ai)
+
     def get_character_info(self) -> str:
         """Get information about the current character."""
         return str(self.character)
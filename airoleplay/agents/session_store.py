@@ -0,0 +1,197 @@
+"""Durable roleplay sessions: compressed SQLite snapshots with idle eviction."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .enhanced_roleplay_agent import EnhancedRoleplayAgent
+from ..characters.persona_registry import PersonaRegistry, get_persona_registry
+from ..utils.metrics import get_metrics_registry
+
+DEFAULT_DB = "airoleplay_sessions.db"
+
+
+class SessionStore:
+    """Keeps live agents in memory and a snapshot of every session on disk.
+
+    ``save`` writes the agent's snapshot (zlib-compressed JSON) after each
+    turn. ``get`` returns the live agent or lazily restores it from its
+    snapshot, so sessions survive restarts and redeploys. Agents idle for
+    longer than ``max_idle_s`` are dropped from memory; their snapshot
+    stays on disk until ``purge``.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DB,
+        max_idle_s: float = 1800.0,
+        personas: Optional[PersonaRegistry] = None,
+        compress_level: int = 6,
+    ):
+        """Initialize store.
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            max_idle_s: Seconds without use before an agent leaves memory
+            personas: Persona registry (default: process-wide registry)
+            compress_level: zlib compression level (1-9)
+        """
+        self.path = path
+        self.max_idle_s = max_idle_s
+        self.personas = personas or get_persona_registry()
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._live: "OrderedDict[str, Tuple[EnhancedRoleplayAgent, float]]" = OrderedDict()
+        self._next_eviction = 0.0
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, updated REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    def save(self, session_id: str, agent: EnhancedRoleplayAgent) -> int:
+        """Snapshot an agent to disk and keep it live.
+
+        Returns:
+            Compressed snapshot size in bytes
+        """
+        payload = json.dumps(agent.snapshot(), separators=(",", ":")).encode("utf-8")
+        blob = zlib.compress(payload, self.compress_level)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (id, updated, data) VALUES (?, ?, ?)",
+                (session_id, time.time(), blob),
+            )
+            self._db.commit()
+        self.put(session_id, agent)
+        get_metrics_registry().observe(
+            "session_snapshot_bytes", len(blob),
+            buckets=(1024, 4096, 16384, 65536, 262144),
+        )
+        return len(blob)
+
+    def put(self, session_id: str, agent: EnhancedRoleplayAgent):
+        """Keep an agent live without writing a snapshot."""
+        with self._lock:
+            self._live[session_id] = (agent, time.monotonic())
+            self._live.move_to_end(session_id)
+        self._maybe_evict()
+
+    def get(self, session_id: str, **agent_kwargs) -> Optional[EnhancedRoleplayAgent]:
+        """Live agent for a session, restored from its snapshot if needed.
+
+        Args:
+            session_id: Session to look up
+            **agent_kwargs: Extra EnhancedRoleplayAgent arguments used when
+                restoring (e.g. api_key)
+
+        Returns:
+            Agent, or None if the session has no snapshot
+        """
+        with self._lock:
+            entry = self._live.get(session_id)
+            if entry is not None:
+                self._live[session_id] = (entry[0], time.monotonic())
+                self._live.move_to_end(session_id)
+        if entry is not None:
+            self._maybe_evict()
+            return entry[0]
+
+        agent = self.load(session_id, **agent_kwargs)
+        if agent is not None:
+            self.put(session_id, agent)
+            get_metrics_registry().inc("sessions_restored_total")
+        return agent
+
+    def load(self, session_id: str, **agent_kwargs) -> Optional[EnhancedRoleplayAgent]:
+        """Restore an agent from its snapshot (None if there is none)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(zlib.decompress(row[0]))
+        persona = self.personas.create(data["persona_id"])
+        return EnhancedRoleplayAgent.from_snapshot(data, persona, **agent_kwargs)
+
+    def delete(self, session_id: str):
+        """Forget a session, live and on disk."""
+        with self._lock:
+            self._live.pop(session_id, None)
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+
+    def evict_idle(self, max_idle_s: Optional[float] = None) -> int:
+        """Drop agents idle longer than max_idle_s from memory.
+
+        Returns:
+            Number of agents evicted
+        """
+        cutoff = time.monotonic() - (self.max_idle_s if max_idle_s is None else max_idle_s)
+        evicted = 0
+        with self._lock:
+            # Least recently used first
+            while self._live:
+                session_id, (_, last_used) = next(iter(self._live.items()))
+                if last_used > cutoff:
+                    break
+                del self._live[session_id]
+                evicted += 1
+        if evicted:
+            get_metrics_registry().inc("sessions_evicted_total", evicted)
+        return evicted
+
+    def purge(self, max_age_s: float) -> int:
+        """Delete snapshots not updated for max_age_s seconds.
+
+        Returns:
+            Number of snapshots deleted
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM sessions WHERE updated < ?", (time.time() - max_age_s,)
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def live_count(self) -> int:
+        """Number of agents held in memory."""
+        return len(self._live)
+
+    def _maybe_evict(self):
+        """Evict idle agents, at most once a minute."""
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self._next_eviction = now + min(60.0, self.max_idle_s)
+            self.evict_idle()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store.
+
+    The database file is AIROLEPLAY_SESSION_DB (default
+    ``airoleplay_sessions.db`` in the working directory);
+    AIROLEPLAY_SESSION_IDLE sets the idle eviction time in seconds.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                os.getenv("AIROLEPLAY_SESSION_DB", DEFAULT_DB),
+                max_idle_s=float(os.getenv("AIROLEPLAY_SESSION_IDLE", "1800")),
+            )
+    return _store
@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from ..utils.cassette import cassette_from_env
+
 try:
     import openai
 except ImportError:
@@ -46,24 +48,38 @@ class CallTranscript:
 class AudioProcessor:
     """Process audio files for call coaching."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client=None):
         """Initialize audio processor.
 
         Args:
             api_key: OpenAI API key (or uses OPENAI_API_KEY env var)
+            client: OpenAI-compatible client to transcribe with (e.g. a
+                cassette replay client) instead of creating one
         """
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if client is not None:
+            self.client = client
+            return
+
+        # Replaying a cassette needs neither the package nor a key
+        cassette = cassette_from_env()
+        if cassette is not None and cassette.mode == "replay":
+            self.client = cassette.wrap_openai()
+            return
+
         if openai is None:
             raise ImportError(
                 "OpenAI package not installed. Run: pip install openai"
             )
 
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError(
                 "OpenAI API key required. Set OPENAI_API_KEY env var or pass api_key parameter"
             )
 
         self.client = openai.OpenAI(api_key=self.api_key)
+        if cassette is not None:
+            self.client = cassette.wrap_openai(self.client)
 
     def transcribe_audio(
         self,
@@ -1,10 +1,11 @@
 """Analyze call transcripts and generate coaching reports."""
 
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 
-from ..scoring.conversation_scorer import ConversationScorer, TurnScore
+from ..scoring.conversation_scorer import BatchScores, ConversationScorer, TurnScore
+from ..scoring.score_stats import ScoreAccumulator
 from .audio_processor import CallTranscript
 
 
@@ -23,7 +24,7 @@ class TimestampedFeedback:
 class CallAnalysisReport:
     """Complete analysis report for a call."""
     transcript: CallTranscript
-    turn_scores: List[TurnScore]
+    turn_scores: Sequence[TurnScore]  # rendered lazily from batch_scores
     overall_score: int
     max_score: int
     percentage: float
@@ -33,6 +34,7 @@ class CallAnalysisReport:
     improvement_areas: List[str]
     technique_recommendations: List[str]
     missed_opportunities: List[Dict[str, str]]
+    batch_scores: Optional[BatchScores] = None
 
     def __str__(self) -> str:
         """Generate text report."""
@@ -90,45 +92,32 @@ class CallAnalyzer:
         # Extract conversation turns (agent, client pairs)
         turns = self._extract_turns(transcript)
 
-        # Score each agent turn
-        turn_scores = []
-        for i, (agent_msg, client_msg) in enumerate(turns):
-            score = self.scorer.score_turn(agent_msg, context=client_msg)
-            turn_scores.append(score)
+        # Score all agent turns as one batch
+        scores = self.scorer.score_batch([agent_msg for agent_msg, _ in turns])
+        stats = ScoreAccumulator.from_batch(scores)
 
         # Calculate overall metrics
-        total_score = sum(ts.total for ts in turn_scores)
-        max_score = sum(ts.max_score for ts in turn_scores)
-        percentage = (total_score / max_score * 100) if max_score > 0 else 0
-
-        # Assign grade
-        if percentage >= 90:
-            grade = "A"
-        elif percentage >= 80:
-            grade = "B"
-        elif percentage >= 70:
-            grade = "C"
-        elif percentage >= 60:
-            grade = "D"
-        else:
-            grade = "F"
+        total_score = stats.total_score
+        max_score = stats.max_score
+        percentage = stats.percentage
+        grade = stats.grade
 
         # Generate timestamped feedback
         timestamped_feedback = self._generate_timestamped_feedback(
-            transcript, turns, turn_scores
+            transcript, turns, scores
         )
 
         # Extract key insights
-        key_wins = self._identify_key_wins(turn_scores)
-        improvement_areas = self._identify_improvements(turn_scores)
-        technique_recommendations = self._recommend_techniques(turn_scores)
-        missed_opportunities = self._find_missed_opportunities(transcript, turns, turn_scores)
+        key_wins = self._identify_key_wins(stats)
+        improvement_areas = self._identify_improvements(stats)
+        technique_recommendations = self._recommend_techniques(stats)
+        missed_opportunities = self._find_missed_opportunities(transcript, turns, scores)
 
         print(f"✓ Analysis complete: {total_score}/{max_score} ({percentage:.1f}%)")
 
         return CallAnalysisReport(
             transcript=transcript,
-            turn_scores=turn_scores,
+            turn_scores=scores.turn_scores(),
             overall_score=total_score,
             max_score=max_score,
             percentage=percentage,
@@ -137,7 +126,8 @@ class CallAnalyzer:
             key_wins=key_wins,
             improvement_areas=improvement_areas,
             technique_recommendations=technique_recommendations,
-            missed_opportunities=missed_opportunities
+            missed_opportunities=missed_opportunities,
+            batch_scores=scores
         )
 
     def _extract_turns(self, transcript: CallTranscript) -> List[Tuple[str, str]]:
@@ -164,19 +154,22 @@ class CallAnalyzer:
         self,
         transcript: CallTranscript,
         turns: List[Tuple[str, str]],
-        scores: List[TurnScore]
+        scores: BatchScores
     ) -> List[TimestampedFeedback]:
         """Generate feedback tied to specific timestamps."""
         feedback_list = []
 
         agent_turns = transcript.get_agent_turns()
+        columns = zip(
+            scores.rapport_breakers.tolist(), scores.isolate.tolist(), scores.total.tolist()
+        )
 
-        for i, (score, (agent_msg, client_msg)) in enumerate(zip(scores, turns)):
+        for i, ((breakers, isolate, total), _) in enumerate(zip(columns, turns)):
             timestamp = agent_turns[i][1] if i < len(agent_turns) else 0.0
 
             # Critical issues
-            if score.rapport_breakers:
-                for breaker in score.rapport_breakers:
+            if breakers:
+                for breaker in scores.turn(i).rapport_breakers:
                     feedback_list.append(TimestampedFeedback(
                         timestamp=timestamp,
                         turn_number=i+1,
@@ -186,7 +179,7 @@ class CallAnalyzer:
                     ))
 
             # Low isolation score
-            if score.isolate < 2:
+            if isolate < 2:
                 feedback_list.append(TimestampedFeedback(
                     timestamp=timestamp,
                     turn_number=i+1,
@@ -196,57 +189,53 @@ class CallAnalyzer:
                 ))
 
             # Strong performance
-            if score.total >= 9:
+            if total >= 9:
                 feedback_list.append(TimestampedFeedback(
                     timestamp=timestamp,
                     turn_number=i+1,
                     feedback_type="strength",
-                    message=f"Excellent CFR technique usage! Score: {score.total}/11"
+                    message=f"Excellent CFR technique usage! Score: {total}/11"
                 ))
 
         return feedback_list
 
-    def _identify_key_wins(self, scores: List[TurnScore]) -> List[str]:
+    def _identify_key_wins(self, stats: ScoreAccumulator) -> List[str]:
         """Identify what the agent did well."""
         wins = []
 
         # Count strong techniques
-        high_scoring_turns = [s for s in scores if s.total >= 8]
-        if len(high_scoring_turns) > len(scores) / 2:
+        high_scoring_turns = stats.count_at_least("total", 8)
+        if high_scoring_turns > stats.num_turns / 2:
             wins.append("Consistent use of CFR framework throughout call")
 
         # Check acknowledgement
-        avg_ack = sum(s.acknowledge_affirm for s in scores) / max(len(scores), 1)
+        avg_ack = stats.average("acknowledge_affirm")
         if avg_ack >= 2.5:
             wins.append("Excellent acknowledgement and affirmation skills")
 
         # Check isolation
-        avg_iso = sum(s.isolate for s in scores) / max(len(scores), 1)
+        avg_iso = stats.average("isolate")
         if avg_iso >= 2.5:
             wins.append("Strong objection isolation")
 
         # Check for advanced techniques
-        all_techniques = []
-        for score in scores:
-            all_techniques.extend(score.techniques_detected)
-
-        if "Feel-Felt-Found" in " ".join(all_techniques):
+        if stats.used_technique("Feel-Felt-Found"):
             wins.append("Used Feel-Felt-Found empathy technique")
 
-        if len(all_techniques) >= 3:
-            wins.append(f"Demonstrated variety of techniques ({len(set(all_techniques))} different)")
+        if sum(stats.technique_counts.values()) >= 3:
+            wins.append(f"Demonstrated variety of techniques ({len(stats.technique_counts)} different)")
 
         return wins
 
-    def _identify_improvements(self, scores: List[TurnScore]) -> List[str]:
+    def _identify_improvements(self, stats: ScoreAccumulator) -> List[str]:
         """Identify areas needing improvement."""
         improvements = []
 
         # Check averages
-        avg_ack = sum(s.acknowledge_affirm for s in scores) / max(len(scores), 1)
-        avg_iso = sum(s.isolate for s in scores) / max(len(scores), 1)
-        avg_handle = sum(s.handle for s in scores) / max(len(scores), 1)
-        avg_close = sum(s.close for s in scores) / max(len(scores), 1)
+        avg_ack = stats.average("acknowledge_affirm")
+        avg_iso = stats.average("isolate")
+        avg_handle = stats.average("handle")
+        avg_close = stats.average("close")
 
         if avg_ack < 2:
             improvements.append("Start responses with acknowledgement ('Perfect', 'I can appreciate that')")
@@ -261,35 +250,31 @@ class CallAnalyzer:
             improvements.append("Add closing questions ('Does that make sense?', 'Which works better?')")
 
         # Rapport breakers
-        total_breakers = sum(len(s.rapport_breakers) for s in scores)
+        total_breakers = stats.rapport_breakers
         if total_breakers > 0:
             improvements.append(f"Avoid rapport breakers ({total_breakers} instances detected)")
 
         return improvements
 
-    def _recommend_techniques(self, scores: List[TurnScore]) -> List[str]:
+    def _recommend_techniques(self, stats: ScoreAccumulator) -> List[str]:
         """Recommend specific techniques to practice."""
         recommendations = []
 
         # Check what techniques are missing
-        all_techniques = []
-        for score in scores:
-            all_techniques.extend(score.techniques_detected)
-
-        if "Feel-Felt-Found" not in " ".join(all_techniques):
+        if not stats.used_technique("Feel-Felt-Found"):
             recommendations.append(
                 "Try Feel-Felt-Found: 'I know how you FEEL... clients have FELT the same... "
                 "but what they FOUND was...'"
             )
 
-        if "Has There Ever Been" not in " ".join(all_techniques):
+        if not stats.used_technique("Has There Ever Been"):
             recommendations.append(
                 "Use 'Has There Ever Been': Leverage past mistakes to prevent new ones"
             )
 
         # Check isolation
-        low_isolation_count = sum(1 for s in scores if s.isolate < 2)
-        if low_isolation_count > len(scores) / 2:
+        low_isolation_count = stats.count_below("isolate", 2)
+        if low_isolation_count > stats.num_turns / 2:
             recommendations.append(
                 "Practice isolation: 'Besides X, is there any other reason you wouldn't Y?'"
             )
@@ -300,18 +285,19 @@ class CallAnalyzer:
         self,
         transcript: CallTranscript,
         turns: List[Tuple[str, str]],
-        scores: List[TurnScore]
+        scores: BatchScores
     ) -> List[Dict[str, str]]:
         """Find specific moments where better techniques could have been used."""
         opportunities = []
 
         agent_turns = transcript.get_agent_turns()
+        columns = zip(scores.isolate.tolist(), scores.acknowledge_affirm.tolist())
 
-        for i, (score, (agent_msg, client_msg)) in enumerate(zip(scores, turns)):
+        for i, ((isolate, acknowledge_affirm), (_, client_msg)) in enumerate(zip(columns, turns)):
             timestamp = agent_turns[i][1] if i < len(agent_turns) else 0.0
 
             # Missed isolation
-            if score.isolate == 0 and client_msg:
+            if isolate == 0 and client_msg:
                 opportunities.append({
                     "timestamp": f"{timestamp:.1f}s",
                     "context": f"Client said: '{client_msg[:50]}...'",
@@ -320,7 +306,7 @@ class CallAnalyzer:
                 })
 
             # No acknowledgement
-            if score.acknowledge_affirm == 0:
+            if acknowledge_affirm == 0:
                 opportunities.append({
                     "timestamp": f"{timestamp:.1f}s",
                     "context": "Response started without acknowledgement",
@@ -1,6 +1,13 @@
 """Character definitions and management."""
 
 from .base import Character
-from .persona_character import PersonaCharacter
+from .persona_character import PersonaCharacter, PersonaTemplate
+from .persona_registry import PersonaRegistry, get_persona_registry
 
-__all__ = ["Character", "PersonaCharacter"]
+__all__ = [
+    "Character",
+    "PersonaCharacter",
+    "PersonaTemplate",
+    "PersonaRegistry",
+    "get_persona_registry",
+]
@@ -3,74 +3,293 @@
 import json
 import random
 from pathlib import Path
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass, field
-
-
-@dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, List, Any, Mapping, Sequence, Tuple
+from dataclasses import dataclass
+
+
+# Rendered system prompt prefixes, keyed by (persona id, difficulty)
+_prompt_prefixes: Dict[Tuple[str, str], str] = {}
+
+
+# Top-level persona fields and the JSON types they must have
+PERSONA_FIELDS = {
+    "id": str,
+    "label": str,
+    "tone": dict,
+    "persona_traits": list,
+    "context": dict,
+    "goals": list,
+    "objection_patterns": list,
+    "knowledge_snippets": list,
+    "escalation_rules": dict,
+}
+TONE_KEYS = ("formality", "energy", "pace_wpm", "directness")
+OBJECTION_FIELDS = (
+    "name", "trigger_phrases", "emotion", "response_playbook", "evidence", "magic_phrases",
+)
+
+
+def clear_prompt_cache(persona_id: Optional[str] = None):
+    """Forget rendered prompt prefixes (e.g. after editing persona files).
+
+    Args:
+        persona_id: Only forget this persona's prefixes (default: all)
+    """
+    if persona_id is None:
+        _prompt_prefixes.clear()
+        return
+    for key in [key for key in _prompt_prefixes if key[0] == persona_id]:
+        _prompt_prefixes.pop(key, None)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn parsed JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
 class ObjectionPattern:
     """Represents an objection the persona can raise."""
     name: str
-    trigger_phrases: List[str]
+    trigger_phrases: Tuple[str, ...]
     emotion: str
-    response_playbook: List[str]
-    evidence: List[str]
-    magic_phrases: List[str]
-
+    response_playbook: Tuple[str, ...]
+    evidence: Tuple[str, ...]
+    magic_phrases: Tuple[str, ...]
 
-@dataclass
-class PersonaCharacter:
-    """A roleplay persona with CFR technique integration."""
 
+@dataclass(frozen=True)
+class PersonaTemplate:
+    """Validated, read-only persona definition, shared by every session using it."""
     id: str
     label: str
-    tone: Dict[str, Any]
-    persona_traits: List[str]
-    context: Dict[str, Any]
-    goals: List[str]
-    objection_patterns: List[ObjectionPattern]
-    knowledge_snippets: List[str]
-    escalation_rules: Dict[str, Any]
-
-    # Internal state
-    current_objection_index: int = 0
-    cooperation_level: int = 5  # 0-10, higher = more cooperative
-    objections_raised: List[str] = field(default_factory=list)
-    agent_technique_quality: int = 0  # Tracks how well agent is doing
+    tone: Mapping[str, Any]
+    persona_traits: Tuple[str, ...]
+    context: Mapping[str, Any]
+    goals: Tuple[str, ...]
+    objection_patterns: Tuple[ObjectionPattern, ...]
+    knowledge_snippets: Tuple[str, ...]
+    escalation_rules: Mapping[str, Any]
 
     @classmethod
-    def from_json(cls, json_path: str) -> "PersonaCharacter":
-        """Load a persona from JSON file."""
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+    def from_dict(cls, data: Mapping[str, Any]) -> "PersonaTemplate":
+        """Validate parsed persona JSON and freeze it.
 
-        # Convert objection_patterns to ObjectionPattern objects
-        objections = [
-            ObjectionPattern(
+        Raises:
+            ValueError: If a field is missing or has the wrong type
+        """
+        for name, kind in PERSONA_FIELDS.items():
+            if not isinstance(data.get(name), kind):
+                raise ValueError(f"'{name}' must be a {kind.__name__}")
+        missing = [key for key in TONE_KEYS if key not in data["tone"]]
+        if missing:
+            raise ValueError(f"'tone' is missing {', '.join(missing)}")
+
+        objections = []
+        for i, obj in enumerate(data["objection_patterns"]):
+            missing = [key for key in OBJECTION_FIELDS if key not in obj]
+            if missing:
+                raise ValueError(f"objection_patterns[{i}] is missing {', '.join(missing)}")
+            objections.append(ObjectionPattern(
                 name=obj['name'],
-                trigger_phrases=obj['trigger_phrases'],
+                trigger_phrases=tuple(obj['trigger_phrases']),
                 emotion=obj['emotion'],
-                response_playbook=obj['response_playbook'],
-                evidence=obj['evidence'],
-                magic_phrases=obj['magic_phrases']
-            )
-            for obj in data['objection_patterns']
-        ]
+                response_playbook=tuple(obj['response_playbook']),
+                evidence=tuple(obj['evidence']),
+                magic_phrases=tuple(obj['magic_phrases'])
+            ))
 
         return cls(
             id=data['id'],
             label=data['label'],
-            tone=data['tone'],
-            persona_traits=data['persona_traits'],
-            context=data['context'],
-            goals=data['goals'],
-            objection_patterns=objections,
-            knowledge_snippets=data['knowledge_snippets'],
-            escalation_rules=data['escalation_rules']
+            tone=_freeze(data['tone']),
+            persona_traits=_freeze(data['persona_traits']),
+            context=_freeze(data['context']),
+            goals=_freeze(data['goals']),
+            objection_patterns=tuple(objections),
+            knowledge_snippets=_freeze(data['knowledge_snippets']),
+            escalation_rules=_freeze(data['escalation_rules'])
         )
 
+    @classmethod
+    def from_json(cls, json_path: str) -> "PersonaTemplate":
+        """Load and validate a persona JSON file.
+
+        Raises:
+            ValueError: If the file is not valid JSON or not a valid persona
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        try:
+            return cls.from_dict(data)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid persona {Path(json_path).name}: {e}")
+
+
+class PersonaState:
+    """Per-conversation persona state: cooperation and objection progress."""
+
+    __slots__ = (
+        "cooperation_level", "current_objection_index", "objections_raised",
+        "agent_technique_quality",
+    )
+
+    def __init__(
+        self,
+        cooperation_level: int = 5,
+        current_objection_index: int = 0,
+        objections_raised: Optional[List[str]] = None,
+        agent_technique_quality: int = 0,
+    ):
+        """Initialize state.
+
+        Args:
+            cooperation_level: 0-10, higher = more cooperative
+            current_objection_index: Next objection pattern to raise
+            objections_raised: Names of the objections raised so far
+            agent_technique_quality: Tracks how well agent is doing
+        """
+        self.cooperation_level = cooperation_level
+        self.current_objection_index = current_objection_index
+        self.objections_raised = objections_raised if objections_raised is not None else []
+        self.agent_technique_quality = agent_technique_quality
+
+    def reset(self):
+        """Return to the start-of-conversation state."""
+        self.cooperation_level = 5
+        self.current_objection_index = 0
+        self.objections_raised = []
+        self.agent_technique_quality = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """State as a JSON-serializable dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PersonaState":
+        """State saved by ``to_dict``."""
+        return cls(
+            cooperation_level=data["cooperation_level"],
+            current_objection_index=data["current_objection_index"],
+            objections_raised=list(data["objections_raised"]),
+            agent_technique_quality=data["agent_technique_quality"],
+        )
+
+    def __repr__(self) -> str:
+        return (f"PersonaState(cooperation_level={self.cooperation_level}, "
+                f"objections_raised={self.objections_raised!r})")
+
+
+def _template_field(name: str) -> property:
+    return property(lambda self: getattr(self.template, name), doc=f"Template {name} (read-only).")
+
+
+def _state_field(name: str) -> property:
+    def set_field(self, value):
+        setattr(self.state, name, value)
+    return property(lambda self: getattr(self.state, name), set_field, doc=f"State {name}.")
+
+
+class PersonaCharacter:
+    """A roleplay persona with CFR technique integration.
+
+    Pairs a shared, read-only PersonaTemplate with this conversation's
+    PersonaState, so any number of sessions can play the same persona from
+    one copy of its data. Template fields and state fields read like plain
+    attributes.
+    """
+
+    __slots__ = ("template", "state")
+
+    # Read-only persona data, shared through the template
+    id = _template_field("id")
+    label = _template_field("label")
+    tone = _template_field("tone")
+    persona_traits = _template_field("persona_traits")
+    context = _template_field("context")
+    goals = _template_field("goals")
+    objection_patterns = _template_field("objection_patterns")
+    knowledge_snippets = _template_field("knowledge_snippets")
+    escalation_rules = _template_field("escalation_rules")
+
+    # Per-conversation state
+    cooperation_level = _state_field("cooperation_level")
+    current_objection_index = _state_field("current_objection_index")
+    objections_raised = _state_field("objections_raised")
+    agent_technique_quality = _state_field("agent_technique_quality")
+
+    def __init__(self, template: PersonaTemplate, state: Optional[PersonaState] = None):
+        """Initialize persona.
+
+        Args:
+            template: Persona definition (shared, never modified)
+            state: Conversation state (default: a fresh PersonaState)
+        """
+        self.template = template
+        self.state = state if state is not None else PersonaState()
+
+    @classmethod
+    def from_json(cls, json_path: str) -> "PersonaCharacter":
+        """Load a persona from JSON file."""
+        return cls(PersonaTemplate.from_json(json_path))
+
+    @classmethod
+    def from_template(cls, template: PersonaTemplate) -> "PersonaCharacter":
+        """New persona in its initial state, sharing the template's read-only data."""
+        return cls(template)
+
     def get_system_prompt(self, difficulty: str = "medium") -> str:
         """Generate system prompt for this persona with CFR integration."""
+        return self.get_prompt_prefix(difficulty) + self.get_prompt_state()
+
+    def get_system_prompt_blocks(self, difficulty: str = "medium") -> List[Dict[str, Any]]:
+        """System prompt as Anthropic content blocks with a cache breakpoint.
+
+        The persona prefix is byte-stable for a given persona and difficulty,
+        so it is marked for provider-side prompt caching; the per-turn state
+        block follows it uncached.
+        """
+        return [
+            {
+                "type": "text",
+                "text": self.get_prompt_prefix(difficulty),
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": self.get_prompt_state()},
+        ]
+
+    def get_prompt_prefix(self, difficulty: str = "medium") -> str:
+        """Stable part of the system prompt: persona, objections and rules.
+
+        Rendered once per (persona id, difficulty) and reused afterwards.
+        """
+        key = (self.id, difficulty)
+        prefix = _prompt_prefixes.get(key)
+        if prefix is None:
+            prefix = _prompt_prefixes[key] = self._render_prompt_prefix(difficulty)
+        return prefix
+
+    def get_prompt_state(self) -> str:
+        """Per-turn part of the system prompt: current cooperation."""
+        prompt_parts = ["\n\n## Current State:"]
+        prompt_parts.append(f"\n- Current cooperation level: {self.cooperation_level}/10")
+
+        if self.cooperation_level < 4:
+            prompt_parts.append("\n- You are resistant and skeptical. Push back on suggestions.")
+        elif self.cooperation_level < 7:
+            prompt_parts.append("\n- You are cautiously interested. Need convincing.")
+        else:
+            prompt_parts.append("\n- You are cooperative and ready to move forward.")
+
+        return "".join(prompt_parts)
+
+    def _render_prompt_prefix(self, difficulty: str) -> str:
+        """Render the stable part of the system prompt."""
         prompt_parts = []
 
         # Base persona description
@@ -96,24 +315,8 @@ class PersonaCharacter:
         for goal in self.goals:
             prompt_parts.append(f"- {goal}")
 
-        # Objection handling instructions
-        prompt_parts.append(f"\n\n## Objection Behavior:")
-        prompt_parts.append(f"- Current cooperation level: {self.cooperation_level}/10")
-
-        if self.cooperation_level < 4:
-            prompt_parts.append("- You are resistant and skeptical. Push back on suggestions.")
-        elif self.cooperation_level < 7:
-            prompt_parts.append("- You are cautiously interested. Need convincing.")
-        else:
-            prompt_parts.append("- You are cooperative and ready to move forward.")
-
         # Add available objections based on difficulty
-        if difficulty == "beginner":
-            objections_to_use = self.objection_patterns[:2]  # Easy objections only
-        elif difficulty == "advanced":
-            objections_to_use = self.objection_patterns  # All objections
-        else:  # medium
-            objections_to_use = self.objection_patterns[:4]
+        objections_to_use = self.available_objections(difficulty)
 
         prompt_parts.append(f"\n\n## Objections You May Raise:")
         prompt_parts.append("Trigger ONE objection per conversation turn maximum.")
@@ -161,6 +364,7 @@ class PersonaCharacter:
         prompt_parts.append("- Respond naturally based on your personality")
         prompt_parts.append("- Let the agent practice their techniques")
         prompt_parts.append("- Be realistic - don't make it too easy or too hard")
+        prompt_parts.append("- Match your cooperation to the Current State below")
 
         return "".join(prompt_parts)
 
@@ -170,38 +374,57 @@ class PersonaCharacter:
         Args:
             agent_response_quality: Score from 0-10 on how well agent responded
         """
+        state = self.state
         if agent_response_quality >= 8:
-            self.cooperation_level = min(10, self.cooperation_level + 2)
+            state.cooperation_level = min(10, state.cooperation_level + 2)
         elif agent_response_quality >= 5:
-            self.cooperation_level = min(10, self.cooperation_level + 1)
+            state.cooperation_level = min(10, state.cooperation_level + 1)
         elif agent_response_quality < 3:
-            self.cooperation_level = max(0, self.cooperation_level - 2)
+            state.cooperation_level = max(0, state.cooperation_level - 2)
         else:
-            self.cooperation_level = max(0, self.cooperation_level - 1)
+            state.cooperation_level = max(0, state.cooperation_level - 1)
+
+    def available_objections(self, difficulty: str = "medium") -> Sequence[ObjectionPattern]:
+        """Objections the persona may raise at a difficulty level."""
+        if difficulty == "beginner":
+            return self.objection_patterns[:2]  # Easy objections only
+        elif difficulty == "advanced":
+            return self.objection_patterns  # All objections
+        else:  # medium
+            return self.objection_patterns[:4]
 
     def get_next_objection(self) -> Optional[ObjectionPattern]:
         """Get the next objection to potentially raise."""
-        if self.current_objection_index >= len(self.objection_patterns):
+        state = self.state
+        if state.current_objection_index >= len(self.objection_patterns):
             return None
 
-        objection = self.objection_patterns[self.current_objection_index]
-        self.current_objection_index += 1
-        self.objections_raised.append(objection.name)
+        objection = self.objection_patterns[state.current_objection_index]
+        state.current_objection_index += 1
+        state.objections_raised.append(objection.name)
         return objection
 
+    def get_state(self) -> Dict[str, Any]:
+        """Per-conversation state (cooperation and objection progress)."""
+        return self.state.to_dict()
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restore per-conversation state saved by ``get_state``."""
+        self.state = PersonaState.from_dict(state)
+
     def reset_conversation(self):
         """Reset persona state for new conversation."""
-        self.current_objection_index = 0
-        self.cooperation_level = 5
-        self.objections_raised = []
-        self.agent_technique_quality = 0
+        self.state.reset()
 
     def get_suggested_magic_phrase(self, objection_name: str) -> List[str]:
         """Get magic phrases suggested for handling a specific objection."""
         for obj in self.objection_patterns:
             if obj.name == objection_name:
-                return obj.magic_phrases
+                return list(obj.magic_phrases)
         return []
 
+    def __repr__(self) -> str:
+        return f"PersonaCharacter(id={self.id!r}, state={self.state!r})"
+
     def __str__(self) -> str:
         return f"Persona: {self.label} (Cooperation: {self.cooperation_level}/10)"
@@ -0,0 +1,366 @@
+"""Persona packs: a persona directory compiled into one indexed, memory-mapped SQLite file.
+
+Build a pack, then point the app at it with AIROLEPLAY_PERSONA_PACK:
+
+    python -m airoleplay.characters.persona_pack build airoleplay/personas -o personas.pack
+    python -m airoleplay.characters.persona_pack list personas.pack --trait skeptical
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .persona_character import PersonaCharacter, PersonaTemplate, clear_prompt_cache
+from .persona_registry import PERSONAS_DIR
+
+PACK_FORMAT = 1
+DEFAULT_PACK = "personas.pack"
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE personas (
+    id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    market TEXT,
+    traits TEXT NOT NULL,
+    objections INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE traits (trait TEXT, persona_id TEXT, PRIMARY KEY (trait, persona_id)) WITHOUT ROWID;
+CREATE TABLE objections (name TEXT, persona_id TEXT, PRIMARY KEY (name, persona_id)) WITHOUT ROWID;
+CREATE INDEX personas_label ON personas (label);
+CREATE INDEX personas_market ON personas (market);
+"""
+
+
+@dataclass(frozen=True)
+class PersonaInfo:
+    """Persona metadata read from a pack index, without parsing the persona."""
+    id: str
+    label: str
+    market: Optional[str]
+    traits: Tuple[str, ...]
+    objections: int
+
+
+def build_pack(personas_dir: Path = PERSONAS_DIR, pack_path: str = DEFAULT_PACK) -> int:
+    """Compile every persona JSON file in a directory into a pack.
+
+    Each file is validated as a PersonaTemplate; the build fails rather than
+    ship a pack with a bad or duplicate persona. The pack is written next to
+    its destination and swapped in with one rename, so a running PersonaPack
+    never sees a half-written file.
+
+    Args:
+        personas_dir: Directory holding the persona JSON files
+        pack_path: Pack file to write
+
+    Returns:
+        Number of personas packed
+
+    Raises:
+        ValueError: If a persona file is invalid or an id is defined twice
+    """
+    rows = []
+    owners: Dict[str, str] = {}
+    for path in sorted(Path(personas_dir).glob("*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            template = PersonaTemplate.from_dict(data)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid persona {path.name}: {e}")
+        if template.id in owners:
+            raise ValueError(f"Persona id {template.id} is defined in both "
+                             f"{owners[template.id]} and {path.name}")
+        owners[template.id] = path.name
+        rows.append((template, json.dumps(data, separators=(",", ":")).encode("utf-8")))
+
+    tmp_path = f"{pack_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = sqlite3.connect(tmp_path)
+    try:
+        db.execute("PRAGMA journal_mode=OFF")
+        db.executescript(_SCHEMA)
+        db.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+            ("format", str(PACK_FORMAT)),
+            ("built", str(time.time())),
+            ("count", str(len(rows))),
+        ])
+        for template, blob in rows:
+            db.execute(
+                "INSERT INTO personas (id, label, market, traits, objections, digest, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (template.id, template.label, template.context.get("market"),
+                 json.dumps(list(template.persona_traits)), len(template.objection_patterns),
+                 hashlib.sha1(blob).hexdigest(), blob),
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO traits (trait, persona_id) VALUES (?, ?)",
+                [(trait, template.id) for trait in template.persona_traits],
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO objections (name, persona_id) VALUES (?, ?)",
+                [(objection.name, template.id) for objection in template.objection_patterns],
+            )
+        db.commit()
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+    db.close()
+    os.replace(tmp_path, pack_path)
+    return len(rows)
+
+
+class PersonaPack:
+    """Persona templates served from a pack file, with the PersonaRegistry interface.
+
+    Opening a pack reads only its header, so startup cost does not depend
+    on the number of personas. The file is memory-mapped and read through
+    its indexes: ``find``, ``by_label`` and ``count`` never parse persona
+    data, and ``get`` parses one persona on first use and keeps the most
+    recently used templates. A rebuilt pack (new file at the same path) is
+    picked up within ``check_interval`` seconds; listeners get the ids
+    whose content changed.
+    """
+
+    def __init__(self, path: str = DEFAULT_PACK, check_interval: float = 2.0,
+                 cache_size: int = 256):
+        """Initialize pack.
+
+        Args:
+            path: Pack file built by build_pack
+            check_interval: Seconds between checks for a rebuilt pack
+            cache_size: Parsed templates kept in memory
+
+        Raises:
+            ValueError: If the file is not a pack this version can read
+        """
+        self.path = str(path)
+        self.check_interval = check_interval
+        self.cache_size = cache_size
+        self.version = 0  # bumped whenever a rebuilt pack changes a persona
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, PersonaTemplate]" = OrderedDict()
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._signature = self._stat()
+        self._db = self._open()
+        self._next_check = time.monotonic() + check_interval
+
+    def _stat(self) -> Tuple[int, int, int]:
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _open(self) -> sqlite3.Connection:
+        # Packs are only ever replaced, never edited in place, so the open
+        # file can be read without locking and mapped whole
+        db = sqlite3.connect(
+            f"{Path(self.path).resolve().as_uri()}?mode=ro&immutable=1",
+            uri=True, check_same_thread=False,
+        )
+        db.execute(f"PRAGMA mmap_size={max(os.path.getsize(self.path), 1 << 20)}")
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        except sqlite3.DatabaseError as e:
+            db.close()
+            raise ValueError(f"{self.path} is not a persona pack: {e}")
+        if row is None or int(row[0]) != PACK_FORMAT:
+            db.close()
+            raise ValueError(f"{self.path} has pack format {row and row[0]}, "
+                             f"expected {PACK_FORMAT}; rebuild it")
+        return db
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        self._refresh()
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    def _refresh(self):
+        """Switch to a rebuilt pack if the check interval has passed."""
+        if time.monotonic() < self._next_check:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                signature = self._stat()
+                if signature == self._signature:
+                    return
+                db = self._open()
+            except (OSError, ValueError) as e:
+                # Keep serving the pack already open (e.g. file caught mid-deploy)
+                warnings.warn(f"Keeping current persona pack: {e}")
+                return
+            old = dict(self._db.execute("SELECT id, digest FROM personas"))
+            new = dict(db.execute("SELECT id, digest FROM personas"))
+            changed = {
+                persona_id for persona_id in old.keys() | new.keys()
+                if old.get(persona_id) != new.get(persona_id)
+            }
+            self._db.close()
+            self._db = db
+            self._signature = signature
+            for persona_id in changed:
+                self._cache.pop(persona_id, None)
+            if changed:
+                self.version += 1
+
+        if changed:
+            for persona_id in changed:
+                clear_prompt_cache(persona_id)
+            for listener in list(self._listeners):
+                listener(changed)
+
+    def get(self, persona_id: str) -> PersonaTemplate:
+        """Template for a persona id.
+
+        Raises:
+            KeyError: If the pack has no persona with that id
+        """
+        self._refresh()
+        with self._lock:
+            template = self._cache.get(persona_id)
+            if template is not None:
+                self._cache.move_to_end(persona_id)
+                return template
+            row = self._db.execute(
+                "SELECT data FROM personas WHERE id = ?", (persona_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(persona_id)
+        template = PersonaTemplate.from_dict(json.loads(row[0]))
+        with self._lock:
+            self._cache[persona_id] = template
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return template
+
+    def create(self, persona_id: str) -> PersonaCharacter:
+        """New persona for a session, in its initial conversation state."""
+        return PersonaCharacter.from_template(self.get(persona_id))
+
+    def templates(self) -> List[PersonaTemplate]:
+        """All templates, sorted by label (parses every persona; prefer find)."""
+        return [self.get(persona_id) for persona_id in self.by_label().values()]
+
+    def by_label(self) -> Dict[str, str]:
+        """Persona ids keyed by label, sorted by label."""
+        return dict(self._query("SELECT label, id FROM personas ORDER BY label"))
+
+    def count(self) -> int:
+        """Number of personas in the pack."""
+        return self._query("SELECT COUNT(*) FROM personas")[0][0]
+
+    def find(
+        self,
+        traits: Iterable[str] = (),
+        market: Optional[str] = None,
+        objection: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[PersonaInfo]:
+        """Personas matching every given filter, sorted by label.
+
+        Args:
+            traits: Traits the persona must all have (e.g. "skeptical")
+            market: Market from the persona context (e.g. "Denver")
+            objection: Name of an objection the persona can raise
+            limit: Maximum number of results
+
+        Returns:
+            Metadata for the matching personas
+        """
+        where, params = [], []
+        for trait in traits:
+            where.append("id IN (SELECT persona_id FROM traits WHERE trait = ?)")
+            params.append(trait)
+        if market is not None:
+            where.append("market = ?")
+            params.append(market)
+        if objection is not None:
+            where.append("id IN (SELECT persona_id FROM objections WHERE name = ?)")
+            params.append(objection)
+        sql = "SELECT id, label, market, traits, objections FROM personas"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY label"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            PersonaInfo(persona_id, label, market, tuple(json.loads(traits)), objections)
+            for persona_id, label, market, traits, objections in self._query(sql, params)
+        ]
+
+    def traits(self) -> Dict[str, int]:
+        """Number of personas with each trait."""
+        return dict(self._query(
+            "SELECT trait, COUNT(*) FROM traits GROUP BY trait ORDER BY trait"
+        ))
+
+    def add_listener(self, callback: Callable[[Set[str]], None]):
+        """Call callback with the changed persona ids after each reload."""
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """Check for a rebuilt pack on the next access instead of waiting for the interval."""
+        self._next_check = 0.0
+
+    def close(self):
+        """Close the pack file."""
+        with self._lock:
+            self._db.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m airoleplay.characters.persona_pack",
+        description="Build and query persona packs.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compile a persona directory into a pack")
+    build.add_argument("personas_dir", nargs="?", default=str(PERSONAS_DIR),
+                       help="Directory of persona JSON files (default: bundled personas)")
+    build.add_argument("-o", "--output", default=DEFAULT_PACK,
+                       help=f"Pack file to write (default: {DEFAULT_PACK})")
+
+    query = commands.add_parser("list", help="List personas in a pack")
+    query.add_argument("pack", nargs="?", default=DEFAULT_PACK, help="Pack file")
+    query.add_argument("--trait", action="append", default=[],
+                       help="Required trait (repeatable)")
+    query.add_argument("--market", help="Market from the persona context")
+    query.add_argument("--objection", help="Objection the persona can raise")
+    query.add_argument("--limit", type=int, default=None, help="Maximum results")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        count = build_pack(Path(args.personas_dir), args.output)
+        print(f"✓ Packed {count} personas into {args.output} "
+              f"({time.perf_counter() - start:.2f}s)")
+        return
+
+    pack = PersonaPack(args.pack)
+    matches = pack.find(args.trait, args.market, args.objection, args.limit)
+    for info in matches:
+        print(f"{info.id:<32} {info.label:<40} {info.market or '-':<16} "
+              f"{info.objections:>3} objections  {', '.join(info.traits)}")
+    print(f"✓ {len(matches)} of {pack.count()} personas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Process-wide registry of persona templates with per-file reload."""
+
+import os
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .persona_character import PersonaCharacter, PersonaTemplate, clear_prompt_cache
+
+if TYPE_CHECKING:
+    from .persona_pack import PersonaPack
+
+PERSONAS_DIR = Path(__file__).parent.parent / "personas"
+
+FileSignature = Tuple[int, int]  # (mtime_ns, size)
+
+
+class PersonaRegistry:
+    """Parsed, validated persona templates served by id.
+
+    The persona directory is listed (one stat per file) at most once per
+    ``check_interval`` seconds and only new or modified files are parsed,
+    so a check stays cheap with hundreds of personas. A file that fails to
+    parse is reported and the last good version of it kept. Templates are
+    immutable; ``create`` gives each session its own PersonaCharacter
+    sharing the template's data.
+    """
+
+    def __init__(self, personas_dir: Path = PERSONAS_DIR, check_interval: float = 2.0):
+        """Initialize registry.
+
+        Args:
+            personas_dir: Directory holding the persona JSON files
+            check_interval: Seconds between directory checks
+        """
+        self.personas_dir = Path(personas_dir)
+        self.check_interval = check_interval
+        self.version = 0  # bumped whenever a template is added, changed or removed
+        self._lock = threading.Lock()
+        self._templates: Dict[str, PersonaTemplate] = {}
+        self._files: Dict[Path, Tuple[FileSignature, Optional[str]]] = {}  # -> (signature, id)
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._next_check = 0.0
+
+    def _refresh(self):
+        """Re-read changed files if the check interval has passed."""
+        if time.monotonic() < self._next_check:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            changed = self._scan()
+            self._next_check = time.monotonic() + self.check_interval
+
+        if changed:
+            for persona_id in changed:
+                clear_prompt_cache(persona_id)
+            for listener in list(self._listeners):
+                listener(changed)
+
+    def _scan(self) -> Set[str]:
+        """Sync templates with the directory; returns the ids that changed."""
+        entries = {}
+        with os.scandir(self.personas_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    entries[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+        templates = dict(self._templates)
+        changed: Set[str] = set()
+        for path in set(self._files) - set(entries):
+            _, persona_id = self._files.pop(path)
+            if persona_id is not None:
+                templates.pop(persona_id, None)
+                changed.add(persona_id)
+        owners = {
+            persona_id: path for path, (_, persona_id) in self._files.items() if persona_id
+        }
+
+        for path, signature in sorted(entries.items()):
+            previous = self._files.get(path)
+            if previous is not None and previous[0] == signature:
+                continue
+            old_id = previous[1] if previous else None
+            try:
+                template = PersonaTemplate.from_json(str(path))
+            except (OSError, ValueError) as e:
+                # Keep serving the last good version (e.g. file caught mid-write)
+                warnings.warn(f"Skipping persona file {path.name}: {e}")
+                self._files[path] = (signature, old_id)
+                continue
+
+            owner = owners.get(template.id)
+            if owner is not None and owner != path:
+                warnings.warn(f"Skipping {path.name}: persona id {template.id} "
+                              f"is already defined in {owner.name}")
+                self._files[path] = (signature, None)
+                continue
+            if old_id is not None and old_id != template.id:
+                templates.pop(old_id, None)
+                owners.pop(old_id, None)
+                changed.add(old_id)
+            templates[template.id] = template
+            owners[template.id] = path
+            self._files[path] = (signature, template.id)
+            changed.add(template.id)
+
+        if changed:
+            # Replace rather than mutate, so lock-free readers see a whole set
+            self._templates = templates
+            self.version += 1
+        return changed
+
+    def get(self, persona_id: str) -> PersonaTemplate:
+        """Template for a persona id.
+
+        Raises:
+            KeyError: If no persona file defines that id
+        """
+        self._refresh()
+        return self._templates[persona_id]
+
+    def create(self, persona_id: str) -> PersonaCharacter:
+        """New persona for a session, in its initial conversation state."""
+        return PersonaCharacter.from_template(self.get(persona_id))
+
+    def templates(self) -> List[PersonaTemplate]:
+        """All templates, sorted by label."""
+        self._refresh()
+        return sorted(self._templates.values(), key=lambda template: template.label)
+
+    def by_label(self) -> Dict[str, str]:
+        """Persona ids keyed by label, sorted by label."""
+        return {template.label: template.id for template in self.templates()}
+
+    def add_listener(self, callback: Callable[[Set[str]], None]):
+        """Call callback with the changed persona ids after each reload."""
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """Check the directory on the next access instead of waiting for the interval."""
+        self._next_check = 0.0
+
+
+_registry: Optional[Union[PersonaRegistry, "PersonaPack"]] = None
+_registry_lock = threading.Lock()
+
+
+def get_persona_registry() -> Union[PersonaRegistry, "PersonaPack"]:
+    """Return the process-wide persona registry.
+
+    If AIROLEPLAY_PERSONA_PACK names a pack file (see persona_pack), personas
+    are served from it; otherwise they are read from the persona directory.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            pack_path = os.getenv("AIROLEPLAY_PERSONA_PACK")
+            if pack_path:
+                from .persona_pack import PersonaPack
+                _registry = PersonaPack(pack_path)
+            else:
+                _registry = PersonaRegistry()
+    return _registry
@@ -0,0 +1,259 @@
+"""Bulk CFR scoring of stored conversations across all CPU cores.
+
+Usage:
+    python -m airoleplay.score conversations.jsonl -o scores.jsonl
+    python -m airoleplay.score transcripts/ -o scores.parquet --format parquet
+    cat conversations.jsonl | python -m airoleplay.score - > scores.jsonl
+
+Input is a JSONL stream (a file, or ``-`` for stdin) with one conversation
+per line, or a directory of ``*.jsonl`` streams and ``*.json`` files holding
+one conversation each. A conversation looks like::
+
+    {"id": "call-123", "turns": [["agent said", "client said"], ...]}
+
+Turns may also be objects with ``agent`` and ``client`` keys. Conversations
+are scored in chunks on a process pool and written in input order; only a
+bounded number of chunks is in memory at any time.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .scoring.conversation_scorer import ConversationScorer
+from .scoring.score_stats import ScoreAccumulator
+
+_scorer: Optional[ConversationScorer] = None
+
+
+def iter_conversations(source: str) -> Iterator[Dict[str, Any]]:
+    """Yield conversations from a JSONL stream, a JSON file or a directory.
+
+    Args:
+        source: Path to a file or directory, or "-" for stdin
+
+    Yields:
+        Conversation dicts; ones without an id get "<file>:<line>"
+    """
+    if source == "-":
+        yield from _iter_jsonl(sys.stdin, "stdin")
+        return
+
+    path = Path(source)
+    if not path.exists():
+        raise FileNotFoundError(f"Input not found: {source}")
+
+    files = sorted(path.glob("*.json*")) if path.is_dir() else [path]
+    for file_path in files:
+        if file_path.suffix == ".jsonl":
+            with open(file_path, 'r', encoding='utf-8') as f:
+                yield from _iter_jsonl(f, file_path.name)
+        elif file_path.suffix == ".json":
+            with open(file_path, 'r', encoding='utf-8') as f:
+                conversation = json.load(f)
+            conversation.setdefault("id", file_path.stem)
+            yield conversation
+
+
+def _iter_jsonl(lines: Iterable[str], name: str) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            conversation = json.loads(line)
+            conversation.setdefault("id", f"{name}:{line_number}")
+            yield conversation
+
+
+def _agent_messages(conversation: Dict[str, Any]) -> List[str]:
+    """Agent side of each turn."""
+    return [
+        turn["agent"] if isinstance(turn, dict) else turn[0]
+        for turn in conversation.get("turns", [])
+    ]
+
+
+def score_conversation_record(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """Score one conversation into a flat result record."""
+    global _scorer
+    if _scorer is None:
+        _scorer = ConversationScorer()
+
+    batch = _scorer.score_batch(_agent_messages(conversation))
+    stats = ScoreAccumulator.from_batch(batch)
+
+    return {
+        "id": conversation["id"],
+        "rules_version": batch.rules.version,
+        "num_turns": stats.num_turns,
+        "total_score": stats.total_score,
+        "max_score": stats.max_score,
+        "percentage": round(stats.percentage, 2),
+        "grade": stats.grade,
+        "avg_acknowledge_affirm": round(stats.average("acknowledge_affirm"), 3),
+        "avg_isolate": round(stats.average("isolate"), 3),
+        "avg_handle": round(stats.average("handle"), 3),
+        "avg_close": round(stats.average("close"), 3),
+        "rapport_breakers": stats.rapport_breakers,
+        "turn_acknowledge_affirm": batch.acknowledge_affirm.tolist(),
+        "turn_isolate": batch.isolate.tolist(),
+        "turn_handle": batch.handle.tolist(),
+        "turn_close": batch.close.tolist(),
+        "turn_rapport_breakers": batch.rapport_breakers.tolist(),
+    }
+
+
+def _score_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Worker entry point: score a chunk of conversations."""
+    return [score_conversation_record(conversation) for conversation in chunk]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def score_stream(
+    conversations: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    max_pending: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Score conversations on a process pool, yielding result chunks in order.
+
+    Args:
+        conversations: Conversation dicts (may be a lazy iterator)
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Conversations sent to a worker at a time
+        max_pending: Chunks in flight at once (defaults to 2 per worker)
+
+    Yields:
+        Lists of result records, one list per input chunk
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    if workers == 1:
+        for chunk in _chunks(conversations, chunk_size):
+            yield _score_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(conversations, chunk_size):
+            pending.append(pool.submit(_score_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+class _JsonlWriter:
+    def __init__(self, output: Optional[str]):
+        self._file = open(output, 'w', encoding='utf-8') if output else sys.stdout
+
+    def write(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, output: Optional[str]):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "pyarrow package not installed. Run: pip install pyarrow"
+            )
+        if not output:
+            raise ValueError("Parquet output needs a file path (-o scores.parquet)")
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._output = output
+        self._writer = None
+        # Declared up front: a chunk of empty conversations would otherwise
+        # infer list<null> columns that later chunks can't be written to
+        per_turn = pyarrow.list_(pyarrow.int8())
+        self._schema = pyarrow.schema([
+            ("id", pyarrow.string()),
+            ("rules_version", pyarrow.int64()),
+            ("num_turns", pyarrow.int64()),
+            ("total_score", pyarrow.int64()),
+            ("max_score", pyarrow.int64()),
+            ("percentage", pyarrow.float64()),
+            ("grade", pyarrow.string()),
+            ("avg_acknowledge_affirm", pyarrow.float64()),
+            ("avg_isolate", pyarrow.float64()),
+            ("avg_handle", pyarrow.float64()),
+            ("avg_close", pyarrow.float64()),
+            ("rapport_breakers", pyarrow.int64()),
+            ("turn_acknowledge_affirm", per_turn),
+            ("turn_isolate", per_turn),
+            ("turn_handle", per_turn),
+            ("turn_close", per_turn),
+            ("turn_rapport_breakers", per_turn),
+        ])
+
+    def write(self, records: List[Dict[str, Any]]):
+        records = [{**record, "id": str(record["id"])} for record in records]
+        table = self._pa.Table.from_pylist(records, schema=self._schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._output, self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m airoleplay.score",
+        description="Score stored conversations with the CFR scorer.",
+    )
+    parser.add_argument("input", help="JSONL file, JSON/JSONL directory, or - for stdin")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout, JSONL only)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default=None,
+                        help="Output format (default: from output suffix, else jsonl)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Conversations per work unit (default: 64)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or (
+        "parquet" if args.output and args.output.endswith(".parquet") else "jsonl"
+    )
+    if output_format == "parquet":
+        writer = _ParquetWriter(args.output)
+    else:
+        writer = _JsonlWriter(args.output)
+
+    scored = 0
+    try:
+        for records in score_stream(
+            iter_conversations(args.input), workers=args.workers, chunk_size=args.chunk_size
+        ):
+            writer.write(records)
+            scored += len(records)
+    finally:
+        writer.close()
+
+    print(f"✓ Scored {scored} conversations", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,18 @@
 """Conversation scoring module."""
 
-from .conversation_scorer import ConversationScorer, TurnScore, ConversationScore
+from .conversation_scorer import BatchScores, ConversationScorer, TurnScore, ConversationScore
+from .rules import ScoringRules, get_rules
+from .score_cache import ScoreCache, get_score_cache
+from .score_stats import ScoreAccumulator
 
-__all__ = ["ConversationScorer", "TurnScore", "ConversationScore"]
+__all__ = [
+    "ConversationScorer",
+    "TurnScore",
+    "ConversationScore",
+    "BatchScores",
+    "ScoreAccumulator",
+    "ScoringRules",
+    "get_rules",
+    "ScoreCache",
+    "get_score_cache",
+]
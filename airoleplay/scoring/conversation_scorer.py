@@ -1,49 +1,168 @@
 """CFR-based conversation scoring and analysis."""
 
-import re
-import json
+from collections.abc import Sequence
 from typing import Dict, List, Tuple, Optional
-from pathlib import Path
 from dataclasses import dataclass, field
 
-
-@dataclass
-class TurnScore:
-    """Score for a single conversation turn."""
-    acknowledge_affirm: int = 0  # 0-3
-    isolate: int = 0  # 0-3
-    handle: int = 0  # 0-3
-    close: int = 0  # 0-2
-    magic_phrases_used: List[str] = field(default_factory=list)
-    techniques_detected: List[str] = field(default_factory=list)
-    rapport_breakers: List[str] = field(default_factory=list)
-    feedback: List[str] = field(default_factory=list)
+import numpy as np
+
+from .rules import ScoringRules, get_rules
+from .score_cache import ScoreCache, get_score_cache
+from .score_stats import MAX_TURN_SCORE, ScoreAccumulator, _letter_grade
+from .turn_score import (
+    EMBEDDED_COMMAND, FB_FEEL_FELT_FOUND, HANDLE_TECHNIQUES,
+    TurnScore, pack_state, state_bits, unpack_columns,
+)
+
+
+@dataclass(frozen=True, eq=False)
+class BatchScores:
+    """Columnar scores for many agent turns, one array entry per turn.
+
+    Each turn is kept as its packed TurnScore state plus int8 point and
+    technique columns derived from it. Full per-turn detail (feedback text,
+    phrase names) is rendered on demand by ``turn``.
+    """
+    acknowledge_affirm: np.ndarray  # 0-3
+    isolate: np.ndarray  # 0-3
+    handle: np.ndarray  # 0-3
+    close: np.ndarray  # 0-2
+    rapport_breakers: np.ndarray  # breakers detected per turn
+    feel_felt_found: np.ndarray  # 1 if the technique was used
+    has_there_ever: np.ndarray
+    level_shift: np.ndarray
+    embedded_command: np.ndarray
+    states: np.ndarray  # packed TurnScore state
+    embedded_commands: Dict[int, str]  # turn index -> first embedded command
+    messages: Tuple[str, ...]
+    rules: ScoringRules
+
+    @classmethod
+    def from_states(
+        cls,
+        states: List[int],
+        embedded_commands: Dict[int, str],
+        messages: Tuple[str, ...],
+        rules: ScoringRules,
+    ) -> "BatchScores":
+        """Build a batch from packed turn states."""
+        # Rule sets too large for 64-bit states fall back to Python ints
+        dtype = np.uint64 if state_bits(rules) <= 64 else object
+        states = np.array(states, dtype=dtype)
+        return cls(
+            **unpack_columns(states, rules),
+            states=states,
+            embedded_commands=embedded_commands,
+            messages=messages,
+            rules=rules,
+        )
+
+    def __len__(self) -> int:
+        return len(self.messages)
 
     @property
-    def total(self) -> int:
-        """Calculate total score."""
-        return self.acknowledge_affirm + self.isolate + self.handle + self.close
+    def total(self) -> np.ndarray:
+        """Total score per turn."""
+        return (
+            self.acknowledge_affirm.astype(np.int16) + self.isolate + self.handle + self.close
+        )
 
     @property
     def max_score(self) -> int:
-        """Maximum possible score."""
-        return 11  # 3+3+3+2
+        """Maximum possible score per turn."""
+        return MAX_TURN_SCORE
+
+    @property
+    def basic_handling(self) -> np.ndarray:
+        """1 for turns where no handling technique was detected."""
+        techniques = (
+            self.feel_felt_found | self.has_there_ever | self.level_shift | self.embedded_command
+        )
+        return (techniques == 0).astype(np.int8)
+
+    @property
+    def total_score(self) -> int:
+        """Sum of all turn scores."""
+        return int(self.total.sum())
+
+    @property
+    def max_possible_score(self) -> int:
+        """Maximum possible score for all turns."""
+        return len(self) * MAX_TURN_SCORE
+
+    @property
+    def percentage(self) -> float:
+        """Score as percentage."""
+        if self.max_possible_score == 0:
+            return 0.0
+        return (self.total_score / self.max_possible_score) * 100
+
+    @property
+    def grade(self) -> str:
+        """Letter grade."""
+        return _letter_grade(self.percentage)
+
+    def technique_counts(self) -> Dict[str, int]:
+        """Count of each entry TurnScore.techniques_detected would hold."""
+        templates = self.rules.feedback_templates
+        columns = [getattr(self, name) for name in HANDLE_TECHNIQUES] + [self.basic_handling]
+        counts: Dict[str, int] = {}
+        for code, column in enumerate(columns, FB_FEEL_FELT_FOUND):
+            template = templates[code]
+            # Lines that name a technique (the embedded command line names the command)
+            if "technique" in template.lower() and "{" not in template:
+                count = int(column.sum())
+                if count:
+                    counts[template] = counts.get(template, 0) + count
+        return counts
+
+    def turn(self, index: int) -> TurnScore:
+        """Full TurnScore for one turn."""
+        return TurnScore(int(self.states[index]), self.rules, self.embedded_commands.get(index))
+
+    def turn_scores(self) -> "TurnScoreView":
+        """Lazy sequence of TurnScore objects for the batch."""
+        return TurnScoreView(self)
+
+
+class TurnScoreView(Sequence):
+    """Read-only sequence that builds each TurnScore of a batch on access."""
+
+    def __init__(self, batch: BatchScores):
+        self._batch = batch
+
+    def __len__(self) -> int:
+        return len(self._batch)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        return self._batch.turn(index)
 
 
 @dataclass
 class ConversationScore:
     """Overall conversation score."""
-    turns: List[TurnScore] = field(default_factory=list)
+    turns: Sequence = field(default_factory=list)
     overall_feedback: List[str] = field(default_factory=list)
+    batch: Optional[BatchScores] = None
 
     @property
     def total_score(self) -> int:
         """Sum of all turn scores."""
+        if self.batch is not None:
+            return self.batch.total_score
         return sum(turn.total for turn in self.turns)
 
     @property
     def max_possible_score(self) -> int:
         """Maximum possible score for all turns."""
+        if self.batch is not None:
+            return self.batch.max_possible_score
         return sum(turn.max_score for turn in self.turns)
 
     @property
@@ -56,80 +175,30 @@ class ConversationScore:
     @property
     def grade(self) -> str:
         """Letter grade."""
-        pct = self.percentage
-        if pct >= 90:
-            return "A"
-        elif pct >= 80:
-            return "B"
-        elif pct >= 70:
-            return "C"
-        elif pct >= 60:
-            return "D"
-        else:
-            return "F"
+        return _letter_grade(self.percentage)
 
 
 class ConversationScorer:
     """Scores conversations based on CFR framework."""
 
-    def __init__(self):
-        """Initialize scorer with technique patterns."""
-        # Load techniques and magic phrases
-        data_dir = Path(__file__).parent.parent / "data"
-
-        with open(data_dir / "techniques.json", 'r') as f:
-            self.techniques = json.load(f)
-
-        with open(data_dir / "magic_phrases.json", 'r') as f:
-            self.magic_phrases = json.load(f)
-
-        # Compile patterns
-        self._compile_patterns()
-
-    def _compile_patterns(self):
-        """Compile regex patterns for detection."""
-        # Acknowledgement terms
-        self.acknowledge_terms = [
-            "perfect", "that makes perfect sense", "absolutely", "great",
-            "fantastic", "you're absolutely right", "that's valid", "you're right",
-            "i can appreciate that", "i understand your concern", "amazing",
-            "most people tell me that", "i can see the benefit", "wonderful"
-        ]
-
-        # Rapport breakers (exact match needed)
-        self.rapport_breakers = {
-            r"\bi understand\b(?! your concern)": "Used 'I understand' without qualifier - breaks rapport",
-            r"\byou'?re wrong\b": "Told client they're wrong - breaks rapport",
-            r"\bactually\b": "Used 'actually' - can sound argumentative",
-            r"\bbut you said\b": "Contradicted client - breaks rapport"
-        }
-
-        # Isolation questions
-        self.isolation_patterns = [
-            r"besides .+, is there any",
-            r"other than .+, is there",
-            r"out of curiosity, what",
-            r"what is the benefit",
-            r"what specifically makes you",
-            r"any other reason you wouldn't"
-        ]
-
-        # Closing patterns
-        self.closing_patterns = [
-            r"which works better",
-            r"does that (make sense|sound good|work for you)",
-            r"would you like to",
-            r"why don't we",
-            r"let's",
-            r"can you see",
-            r"please sign"
-        ]
-
-        # Feel-Felt-Found pattern
-        self.feel_felt_found_pattern = r"(how you feel|you felt|they found)"
-
-        # Has there ever been pattern
-        self.has_there_ever_pattern = r"has there ever been a time"
+    def __init__(self, rules: Optional[ScoringRules] = None, cache: Optional[ScoreCache] = None):
+        """Initialize scorer.
+
+        Args:
+            rules: Fixed rule set to score with. By default the process-wide
+                rules are used, picking up edits to the rule files.
+            cache: Turn score cache. Defaults to the process-wide cache;
+                pass ScoreCache(max_size=0) to disable caching.
+        """
+        self._pinned_rules = rules
+        self.cache = cache if cache is not None else get_score_cache()
+
+    @property
+    def rules(self) -> ScoringRules:
+        """Rule set used for the next turn."""
+        if self._pinned_rules is not None:
+            return self._pinned_rules
+        return get_rules()
 
     def score_turn(self, agent_message: str, context: Optional[str] = None) -> TurnScore:
         """Score a single agent response.
@@ -141,169 +210,108 @@ class ConversationScorer:
         Returns:
             TurnScore with detailed feedback
         """
-        score = TurnScore()
-        agent_lower = agent_message.lower()
-
-        # 1. ACKNOWLEDGE & AFFIRM (0-3 points)
-        ack_score, ack_feedback = self._score_acknowledge_affirm(agent_lower)
-        score.acknowledge_affirm = ack_score
-        score.feedback.extend(ack_feedback)
-
-        # 2. ISOLATE (0-3 points)
-        iso_score, iso_feedback = self._score_isolate(agent_lower)
-        score.isolate = iso_score
-        score.feedback.extend(iso_feedback)
-
-        # 3. HANDLE (0-3 points)
-        handle_score, handle_feedback = self._score_handle(agent_lower, agent_message)
-        score.handle = handle_score
-        score.feedback.extend(handle_feedback)
-        score.techniques_detected.extend([fb for fb in handle_feedback if "technique" in fb.lower()])
-
-        # 4. CLOSE (0-2 points)
-        close_score, close_feedback = self._score_close(agent_lower)
-        score.close = close_score
-        score.feedback.extend(close_feedback)
-
-        # Detect magic phrases
-        score.magic_phrases_used = self._detect_magic_phrases(agent_lower)
-
-        # Detect rapport breakers (NEGATIVE points)
-        score.rapport_breakers = self._detect_rapport_breakers(agent_lower)
-        if score.rapport_breakers:
-            # Penalize total score
-            penalty = len(score.rapport_breakers)
-            score.feedback.append(f"⚠️ Rapport breakers detected: -{penalty} points")
-
+        rules = self.rules
+        score = self.cache.get(rules, agent_message)
+        if score is None:
+            score = self._score_turn(rules, agent_message)
+            self.cache.put(rules, agent_message, score)
         return score
 
-    def _score_acknowledge_affirm(self, agent_lower: str) -> Tuple[int, List[str]]:
-        """Score acknowledge & affirm step (0-3 points)."""
-        score = 0
-        feedback = []
-
-        # Check for acknowledgement terms
-        found_terms = [term for term in self.acknowledge_terms if term in agent_lower]
-
-        if len(found_terms) >= 2:
-            score = 3
-            feedback.append(f"✓ Excellent acknowledgement: used '{found_terms[0]}' and '{found_terms[1]}'")
-        elif len(found_terms) == 1:
-            score = 2
-            feedback.append(f"✓ Good acknowledgement: used '{found_terms[0]}'")
-        else:
-            score = 0
-            feedback.append("⚠️ Missing acknowledgement - start with 'Perfect', 'I can appreciate that', etc.")
+    def _score_turn(self, rules: ScoringRules, agent_message: str) -> TurnScore:
+        """Score a single agent response, bypassing the cache."""
+        state, embedded = self._turn_state(rules, agent_message)
+        return TurnScore(state, rules, embedded)
 
-        return score, feedback
+    def score_batch(self, messages: Sequence) -> BatchScores:
+        """Score many agent responses without building per-turn objects.
 
-    def _score_isolate(self, agent_lower: str) -> Tuple[int, List[str]]:
-        """Score isolation step (0-3 points)."""
-        score = 0
-        feedback = []
-
-        # Check for isolation questions
-        matches = [p for p in self.isolation_patterns if re.search(p, agent_lower)]
+        Args:
+            messages: Agent messages to score
 
-        if len(matches) >= 2:
-            score = 3
-            feedback.append("✓ Excellent isolation: asked multiple clarifying questions")
-        elif len(matches) == 1:
-            score = 2
-            feedback.append("✓ Good isolation: asked clarifying question")
-        else:
-            score = 0
-            feedback.append("⚠️ Missing isolation - ask 'Besides that, is there any other reason you wouldn't...?'")
+        Returns:
+            BatchScores with one entry per message in each column
+        """
+        rules = self.rules
+        messages = tuple(messages)
+        states = []
+        embedded_commands = {}
 
-        return score, feedback
+        for i, message in enumerate(messages):
+            state, embedded = self._turn_state(rules, message)
+            states.append(state)
+            if embedded is not None:
+                embedded_commands[i] = embedded
 
-    def _score_handle(self, agent_lower: str, agent_full: str) -> Tuple[int, List[str]]:
-        """Score handling step (0-3 points)."""
-        score = 0
-        feedback = []
-        techniques_found = []
-
-        # Check for Feel-Felt-Found
-        if re.search(self.feel_felt_found_pattern, agent_lower):
-            score += 2
-            techniques_found.append("Feel-Felt-Found technique")
-            feedback.append("✓ Used Feel-Felt-Found empathy technique")
-
-        # Check for Has There Ever Been
-        if re.search(self.has_there_ever_pattern, agent_lower):
-            score += 2
-            techniques_found.append("Has There Ever Been technique")
-            feedback.append("✓ Used 'Has There Ever Been' pattern - leveraging past mistakes")
-
-        # Check for Level Shift phrases
-        level_shift_phrases = [
-            "what i think you're saying", "the real issue", "what appears most important",
-            "what i sense", "i believe you're asking", "what i hear you saying"
-        ]
-        if any(phrase in agent_lower for phrase in level_shift_phrases):
-            score += 1
-            techniques_found.append("Level Shift")
-            feedback.append("✓ Used Level Shift to reframe")
-
-        # Check for embedded commands (ALL CAPS words)
-        embedded = re.findall(r'\b[A-Z]{2,}(?:\s+[A-Z]{2,})*\b', agent_full)
-        if embedded and len(embedded) > 0:
-            score += 1
-            feedback.append(f"✓ Used embedded command: {embedded[0]}")
-
-        # If no techniques detected
-        if score == 0:
-            score = 1  # Basic handling
-            feedback.append("⚠️ Consider using Feel-Felt-Found or Has There Ever Been technique")
-
-        # Cap at 3
-        score = min(3, score)
-
-        return score, feedback
-
-    def _score_close(self, agent_lower: str) -> Tuple[int, List[str]]:
-        """Score closing step (0-2 points)."""
-        score = 0
-        feedback = []
+        return BatchScores.from_states(states, embedded_commands, messages, rules)
 
-        # Check for closing patterns
-        matches = [p for p in self.closing_patterns if re.search(p, agent_lower)]
-
-        if len(matches) >= 2:
-            score = 2
-            feedback.append("✓ Strong close: multiple closing questions/statements")
-        elif len(matches) == 1:
-            score = 1
-            feedback.append("✓ Attempted close")
-        else:
-            score = 0
-            feedback.append("⚠️ Missing close - try 'Does that make sense?', 'Which works better for you?'")
-
-        return score, feedback
-
-    def _detect_magic_phrases(self, agent_lower: str) -> List[str]:
-        """Detect which magic phrases were used."""
-        used = []
-
-        for phrase_key, phrase_data in self.magic_phrases["magic_phrases"].items():
-            # Check if any example patterns match
-            if "pattern" in phrase_data:
-                # Simple pattern matching
-                pattern_keywords = phrase_data["pattern"].lower().split()
-                if any(keyword in agent_lower for keyword in pattern_keywords[:3]):
-                    used.append(phrase_data["name"])
+    def _turn_state(self, rules: ScoringRules, agent_message: str) -> Tuple[int, Optional[str]]:
+        """Packed TurnScore state and first embedded command for one turn."""
+        agent_lower = agent_message.lower()
+        phrases = rules.phrase_matcher.categories(agent_lower)
+        techniques, embedded = self._detect_techniques(rules, agent_lower, agent_message, phrases)
+
+        # Points and feedback text are derived from the state on demand
+        state = pack_state(
+            rules,
+            acknowledge_terms=self._detect_acknowledge_terms(rules, phrases),
+            isolation_matches=len(rules.isolation_plan.matched(agent_lower)),
+            close_matches=len(rules.closing_plan.matched(agent_lower)),
+            techniques=techniques,
+            rapport_breakers=self._detect_rapport_breakers(rules, agent_lower),
+            magic_phrases=self._detect_magic_phrases(rules, phrases),
+        )
+        return state, embedded
+
+    def _detect_acknowledge_terms(self, rules: ScoringRules, phrases: Dict[str, set]) -> List[int]:
+        """Indices of the acknowledgement terms used, in rule order."""
+        found = phrases.get("acknowledge")
+        if not found:
+            return []
+        return [i for i, term in enumerate(rules.acknowledge_terms) if term in found]
+
+    def _detect_techniques(
+        self, rules: ScoringRules, agent_lower: str, agent_full: str, phrases: Dict[str, set]
+    ) -> Tuple[int, Optional[str]]:
+        """Handling technique flags and the first embedded command (or None)."""
+        techniques = 0
+
+        for pattern in rules.handle_plan.matched(agent_lower):
+            techniques |= rules.handle_patterns[pattern]
+
+        for i, name in enumerate(HANDLE_TECHNIQUES):
+            if f"technique:{name}" in phrases:
+                techniques |= 1 << i
+
+        # Embedded commands (ALL CAPS words) need the original case
+        embedded = rules.embedded_command_pattern.search(agent_full)
+        if embedded:
+            techniques |= EMBEDDED_COMMAND
+            return techniques, embedded.group()
+
+        return techniques, None
+
+    def _detect_magic_phrases(self, rules: ScoringRules, phrases: Dict[str, set]) -> int:
+        """Bit mask of the magic phrases used, in rule order."""
+        used = 0
+        phrase_keys = None
+
+        for category in phrases:
+            # Any of the pattern's leading keywords counts as a match
+            if category.startswith("magic:"):
+                phrase_keys = phrase_keys or list(rules.magic_phrase_keywords)
+                used |= 1 << phrase_keys.index(category[len("magic:"):])
 
         return used
 
-    def _detect_rapport_breakers(self, agent_lower: str) -> List[str]:
-        """Detect rapport-breaking phrases."""
-        breakers = []
-
-        for pattern, message in self.rapport_breakers.items():
-            if re.search(pattern, agent_lower):
-                breakers.append(message)
-
-        return breakers
+    def _detect_rapport_breakers(self, rules: ScoringRules, agent_lower: str) -> int:
+        """Bit mask of the rapport breaker rules matched, in rule order."""
+        matched = rules.rapport_breaker_plan.matched(agent_lower)
+        if not matched:
+            return 0
+        return sum(
+            1 << i for i, pattern in enumerate(rules.rapport_breaker_plan.patterns)
+            if pattern in matched
+        )
 
     def score_conversation(self, conversation_turns: List[Tuple[str, str]]) -> ConversationScore:
         """Score an entire conversation.
@@ -312,30 +320,30 @@ class ConversationScorer:
             conversation_turns: List of (agent_message, client_message) tuples
 
         Returns:
-            ConversationScore with all turns and overall feedback
+            ConversationScore with all turns and overall feedback. Turns are
+            scored as a batch; ``turns`` renders TurnScore detail on access.
         """
-        conv_score = ConversationScore()
-
-        for i, (agent_msg, client_msg) in enumerate(conversation_turns):
-            turn_score = self.score_turn(agent_msg, context=client_msg)
-            conv_score.turns.append(turn_score)
+        batch = self.score_batch([agent_msg for agent_msg, _ in conversation_turns])
+        conv_score = ConversationScore(turns=batch.turn_scores(), batch=batch)
 
         # Generate overall feedback
-        conv_score.overall_feedback = self._generate_overall_feedback(conv_score)
+        conv_score.overall_feedback = self._generate_overall_feedback(
+            ScoreAccumulator.from_batch(batch)
+        )
 
         return conv_score
 
-    def _generate_overall_feedback(self, conv_score: ConversationScore) -> List[str]:
+    def _generate_overall_feedback(self, stats: ScoreAccumulator) -> List[str]:
         """Generate coaching feedback for entire conversation."""
         feedback = []
 
         # Overall performance
-        feedback.append(f"Overall Score: {conv_score.total_score}/{conv_score.max_possible_score} ({conv_score.percentage:.1f}%) - Grade: {conv_score.grade}")
+        feedback.append(f"Overall Score: {stats.total_score}/{stats.max_score} ({stats.percentage:.1f}%) - Grade: {stats.grade}")
 
         # Strengths
         strengths = []
-        avg_ack = sum(t.acknowledge_affirm for t in conv_score.turns) / max(len(conv_score.turns), 1)
-        avg_iso = sum(t.isolate for t in conv_score.turns) / max(len(conv_score.turns), 1)
+        avg_ack = stats.average("acknowledge_affirm")
+        avg_iso = stats.average("isolate")
 
         if avg_ack >= 2.5:
             strengths.append("Excellent at acknowledging and affirming")
@@ -353,7 +361,7 @@ class ConversationScorer:
             improvements.append("Practice isolation questions more")
 
         # Count rapport breakers
-        total_breakers = sum(len(t.rapport_breakers) for t in conv_score.turns)
+        total_breakers = stats.rapport_breakers
         if total_breakers > 0:
             improvements.append(f"Avoid rapport breakers ({total_breakers} detected)")
 
@@ -361,11 +369,7 @@ class ConversationScorer:
             feedback.append(f"\n⚠️ Areas to improve: {', '.join(improvements)}")
 
         # Technique recommendations
-        all_techniques = []
-        for turn in conv_score.turns:
-            all_techniques.extend(turn.techniques_detected)
-
-        if not all_techniques:
+        if not stats.technique_counts:
             feedback.append("\n💡 Try using: Feel-Felt-Found, Has There Ever Been, or Level Shift techniques")
 
         return feedback
@@ -0,0 +1,104 @@
+"""Aho-Corasick phrase matching for single-pass rule detection."""
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+
+class PhraseHit(NamedTuple):
+    """A literal phrase found in scanned text."""
+    offset: int
+    phrase: str
+    category: str
+
+
+class PhraseMatcher:
+    """Finds every occurrence of many literal phrases in one pass over the text.
+
+    Phrases are compiled into an Aho-Corasick automaton whose failure links are
+    folded into a full transition table, so scanning costs one dict lookup per
+    character no matter how many phrases are registered. Matching is plain
+    substring matching (same semantics as ``phrase in text``), overlapping
+    phrases are all reported, and one phrase may belong to several categories.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        """Build the automaton.
+
+        Args:
+            phrases: (phrase, category) pairs to match verbatim
+        """
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[Tuple[str, str, int], ...]] = [()]
+
+        # Trie of all phrases
+        seen = set()
+        for phrase, category in phrases:
+            if not phrase or (phrase, category) in seen:
+                continue
+            seen.add((phrase, category))
+
+            state = 0
+            for ch in phrase:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][ch] = next_state
+                state = next_state
+            outputs[state] += ((phrase, category, len(phrase)),)
+
+        # Breadth-first pass: failure links, inherited outputs and the final
+        # transition table (a state falls back to its failure state's moves)
+        fail = [0] * len(goto)
+        transitions: List[Dict[str, int]] = [dict() for _ in goto]
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            transitions[state] = {**transitions[fail[state]], **goto[state]}
+            for ch, child in goto[state].items():
+                fail[child] = transitions[fail[state]].get(ch, 0) if state else 0
+                outputs[child] += outputs[fail[child]]
+                queue.append(child)
+
+        self._transitions = transitions
+        self._outputs = outputs
+        self.size = len(seen)
+
+    def scan(self, text: str) -> List[PhraseHit]:
+        """Return every phrase occurrence in text, ordered by end position.
+
+        Args:
+            text: Text to scan (match case is the caller's responsibility)
+
+        Returns:
+            List of PhraseHit with the start offset of each occurrence
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        hits = []
+        state = 0
+
+        for end, ch in enumerate(text):
+            state = transitions[state].get(ch, 0)
+            if outputs[state]:
+                for phrase, category, length in outputs[state]:
+                    hits.append(PhraseHit(end - length + 1, phrase, category))
+
+        return hits
+
+    def categories(self, text: str) -> Dict[str, set]:
+        """Group the phrases found in text by category.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dict of category -> set of phrases that occurred at least once
+        """
+        found: Dict[str, set] = {}
+        for hit in self.scan(text):
+            found.setdefault(hit.category, set()).add(hit.phrase)
+        return found
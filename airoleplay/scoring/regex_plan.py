@@ -0,0 +1,292 @@
+"""Combined regex plans for multi-rule scoring categories."""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+
+# Characters that can be lifted out of a rule as a plain literal
+_LITERAL_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789 ',-")
+_QUANTIFIERS = set("?*+{")
+
+
+def _leading_literal(pattern: str, index: int) -> bool:
+    """Whether pattern[index] is a literal character with no quantifier."""
+    return (
+        len(pattern) > index
+        and pattern[index] in _LITERAL_CHARS
+        and (len(pattern) == index + 1 or pattern[index + 1] not in _QUANTIFIERS)
+    )
+
+
+def _structure(pattern: str) -> Iterator[Tuple[int, str]]:
+    """Yield (index, char) for the ``(``, ``)`` and ``|`` that shape a pattern.
+
+    Escaped characters and character classes are skipped, so ``\\|`` or
+    ``[(|]`` are not mistaken for structure.
+
+    Raises:
+        ValueError: If a character class or escape is unterminated
+    """
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            j = i + 1
+            if j < n and pattern[j] == "^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            if j >= n:
+                raise ValueError(f"Unterminated character class in {pattern!r}")
+            i = j + 1
+            continue
+        if ch in "()|":
+            yield i, ch
+        i += 1
+    if i > n:
+        raise ValueError(f"Trailing backslash in {pattern!r}")
+
+
+def _split_branches(pattern: str) -> Optional[List[str]]:
+    """Split a rule like ``(a|b|c)`` or ``a|b`` into its top-level branches.
+
+    Returns:
+        The branches ([pattern] when there is no top-level alternation), or
+        None when the pattern can't be split safely (verbose mode, a branch
+        that doesn't compile on its own)
+    """
+    if "(?x" in pattern:
+        return None
+    try:
+        body = pattern
+        if pattern.startswith("(") and not pattern.startswith("(?") and pattern.endswith(")"):
+            # Unwrap one capturing group around the whole pattern
+            depth = 0
+            for index, ch in _structure(pattern):
+                depth += {"(": 1, ")": -1}.get(ch, 0)
+                if depth == 0:
+                    break
+            if index == len(pattern) - 1:
+                body = pattern[1:-1]
+
+        branches, depth, start = [], 0, 0
+        for index, ch in _structure(body):
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif depth == 0:
+                branches.append(body[start:index])
+                start = index + 1
+        branches.append(body[start:])
+    except ValueError:
+        return None
+
+    if len(branches) == 1:
+        return [pattern]
+    for branch in branches:
+        try:
+            re.compile(branch)
+        except re.error:
+            return None
+    return branches
+
+
+def _alternative(group: str, pattern: str, hoist: bool = True) -> Tuple[str, Optional[str]]:
+    """Build one zero-width alternative for a rule branch.
+
+    Each branch sits in a lookahead so overlapping rules are all seen. When
+    the branch starts with a literal character (optionally after ``\\b``)
+    that character is hoisted in front of the lookahead; with every
+    alternative starting with a literal, the regex engine skips
+    non-candidate positions the same way a single literal search does.
+
+    Args:
+        group: Group name for the branch
+        pattern: Branch pattern, with no top-level alternation
+        hoist: Whether hoisting is allowed (False for rules that could not
+            be split into branches)
+
+    Returns:
+        (alternative regex, hoisted first character or None)
+    """
+    if hoist and _leading_literal(pattern, 0):
+        first = pattern[0]
+        return f"{re.escape(first)}(?=(?P<{group}>{pattern[1:]}))", first
+
+    if hoist and pattern.startswith(r"\b") and _leading_literal(pattern, 2):
+        first = pattern[2]
+        escaped = re.escape(first)
+        return f"{escaped}(?<=\\b{escaped})(?=(?P<{group}>{pattern[3:]}))", first
+
+    return f"(?=(?P<{group}>{pattern}))", None
+
+
+def _samples(parsed, limit: int = 64) -> List[str]:
+    """Strings built from a parsed pattern, one per alternation branch taken.
+
+    They are not guaranteed to match (anchors and lookarounds are ignored),
+    only to exercise every branch of the pattern.
+    """
+    results = [""]
+    for op, av in parsed:
+        name = str(op)
+        if name == "LITERAL":
+            options = [chr(av)]
+        elif name == "NOT_LITERAL":
+            options = ["y" if chr(av) == "x" else "x"]
+        elif name == "ANY":
+            options = ["a"]
+        elif name == "IN":
+            options = [_class_sample(av)]
+        elif name == "CATEGORY":
+            options = [_CATEGORY_SAMPLES.get(str(av), "a")]
+        elif name == "BRANCH":
+            options = [s for branch in av[1] for s in _samples(branch, limit)]
+        elif name == "SUBPATTERN":
+            options = _samples(av[-1], limit)
+        elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            low, _, item = av
+            options = [s * max(low, 1) for s in _samples(item, limit)]
+            if low == 0:
+                options.insert(0, "")
+        elif name == "ATOMIC_GROUP":
+            options = _samples(av, limit)
+        else:
+            # Anchors, lookarounds and group references consume nothing here
+            options = [""]
+        results = [r + options[0] for r in results] + [results[0] + o for o in options[1:]]
+        del results[limit:]
+    return results
+
+
+_CATEGORY_SAMPLES = {
+    "CATEGORY_DIGIT": "1", "CATEGORY_NOT_DIGIT": "a", "CATEGORY_SPACE": " ",
+    "CATEGORY_NOT_SPACE": "a", "CATEGORY_WORD": "a", "CATEGORY_NOT_WORD": " ",
+}
+
+
+def _class_sample(items) -> str:
+    """A character from a parsed character class."""
+    op, av = items[0]
+    name = str(op)
+    if name == "LITERAL":
+        return chr(av)
+    if name == "RANGE":
+        return chr(av[0])
+    if name == "CATEGORY":
+        return _CATEGORY_SAMPLES.get(str(av), "a")
+    return "#"  # negated class
+
+
+def probe_texts(pattern: str) -> List[str]:
+    """Texts that exercise every branch of a pattern, bare and inside a sentence."""
+    try:
+        samples = _samples(_sre_parse.parse(pattern))
+    except re.error:
+        return []
+    return [text for sample in samples for text in (sample, f"so {sample}, ok")]
+
+
+class RegexPlan:
+    """All regex rules of one scoring category, compiled into a single pattern.
+
+    ``matched`` runs one ``finditer`` over the text and reports which rules
+    occur anywhere in it, with the same result as calling ``re.search`` per
+    rule. The pattern reports one alternative per offset, so a rule that can
+    start with the same character as the reported one is re-checked at that
+    offset only.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        """Compile the category.
+
+        Args:
+            patterns: Rule patterns, in reporting order
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        self._rules = {pattern: re.compile(pattern) for pattern in self.patterns}
+
+        alternatives = []
+        self._groups: Dict[str, str] = {}
+        group_firsts: Dict[str, Optional[str]] = {}
+        for i, pattern in enumerate(self.patterns):
+            branches = _split_branches(pattern)
+            for j, branch in enumerate(branches or [pattern]):
+                group = f"rule{i}_{j}"
+                alternative, first = _alternative(group, branch, hoist=branches is not None)
+                alternatives.append(alternative)
+                self._groups[group] = pattern
+                group_firsts[group] = first
+        self.combined = re.compile("|".join(alternatives))
+
+        # Rules that could be hidden by a hit of each group at the same offset
+        self._rivals: Dict[str, Tuple[str, ...]] = {}
+        for group, first in group_firsts.items():
+            rivals = {
+                self._groups[other]
+                for other, other_first in group_firsts.items()
+                if self._groups[other] != self._groups[group]
+                and (first is None or other_first is None or other_first == first)
+            }
+            self._rivals[group] = tuple(p for p in self.patterns if p in rivals)
+
+    def matched(self, text: str) -> List[str]:
+        """Return the rule patterns that match somewhere in text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Matching patterns, in the order the rules were declared
+        """
+        groups = self._groups
+        rivals = self._rivals
+        found = set()
+        shadowed = []
+
+        for match in self.combined.finditer(text):
+            group = match.lastgroup
+            found.add(groups[group])
+            if rivals[group]:
+                shadowed.append((group, match.start()))
+
+        if not found:
+            return []
+
+        for group, offset in shadowed:
+            for pattern in rivals[group]:
+                if pattern not in found and self._rules[pattern].match(text, offset):
+                    found.add(pattern)
+
+        return [pattern for pattern in self.patterns if pattern in found]
+
+    def check(self, texts: Iterable[str] = ()) -> None:
+        """Verify the plan against ``re.search`` per rule.
+
+        Every rule's probe texts (one per alternation branch) are checked,
+        plus any texts given.
+
+        Raises:
+            ValueError: If the plan and the rules disagree on a text
+        """
+        probes = [text for pattern in self.patterns for text in probe_texts(pattern)]
+        for text in [*probes, *texts]:
+            expected = [pattern for pattern in self.patterns if self._rules[pattern].search(text)]
+            actual = self.matched(text)
+            if actual != expected:
+                missing = sorted(set(expected) - set(actual))
+                extra = sorted(set(actual) - set(expected))
+                raise ValueError(
+                    f"Combined rule plan disagrees with its rules on {text!r} "
+                    f"(missed {missing}, extra {extra})"
+                )
@@ -0,0 +1,276 @@
+"""Process-wide, immutable scoring rule set with hot reload."""
+
+import json
+import re
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .phrase_matcher import PhraseMatcher
+from .regex_plan import RegexPlan
+from .score_stats import DIMENSIONS
+from .turn_score import HANDLE_TECHNIQUES, TIERS
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+RULE_FILES = ("scoring_rules.json", "techniques.json", "magic_phrases.json")
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn parsed JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _points(step: str, value: Any) -> int:
+    """Validate a points value against the step's maximum."""
+    if not isinstance(value, int) or not 0 <= value <= DIMENSIONS[step]:
+        raise ValueError(f"{step}: points must be whole numbers from 0 to {DIMENSIONS[step]}")
+    return value
+
+
+def _template(name: str, template: Any, args: int) -> str:
+    """Validate a feedback template that takes ``args`` positional arguments."""
+    try:
+        template.format(*["x"] * args)
+    except (AttributeError, IndexError, KeyError, ValueError):
+        raise ValueError(f"{name}: feedback must be text using at most {args} {{n}} placeholders")
+    return template
+
+
+def _tiered(spec: Mapping[str, Any], section: str, step: str, args: Tuple[int, ...]):
+    """Points and feedback templates for a step scored by match count."""
+    rules = spec[section]
+    points = tuple(_points(step, rules["points"][tier]) for tier in TIERS)
+    templates = [
+        _template(f"{section}.feedback.{tier}", rules["feedback"][tier], n)
+        for tier, n in zip(TIERS, args)
+    ]
+    return points, templates
+
+
+def _compile_handle(spec: Mapping[str, Any]):
+    """Patterns, phrases, points table and templates for the handle step."""
+    handle = spec["handle"]
+    cap = _points("handle", handle["cap"])
+    basic = _points("handle", handle["basic_points"])
+
+    patterns: Dict[str, int] = {}
+    phrases: List[Tuple[str, str]] = []
+    technique_points = []
+    templates = []
+    for i, name in enumerate(HANDLE_TECHNIQUES):
+        technique = handle["techniques"][name]
+        for pattern in technique.get("patterns", ()):
+            patterns[pattern] = patterns.get(pattern, 0) | 1 << i
+        phrases += [
+            (phrase.lower(), f"technique:{name}") for phrase in technique.get("phrases", ())
+        ]
+        technique_points.append(_points("handle", technique["points"]))
+        args = 1 if name == "embedded_command" else 0
+        templates.append(_template(f"handle.{name}.feedback", technique["feedback"], args))
+    templates.append(_template("handle.basic_feedback", handle["basic_feedback"], 0))
+
+    # Points for every combination of technique flags
+    points = tuple(
+        min(cap, sum(p for i, p in enumerate(technique_points) if flags & 1 << i) or basic)
+        for flags in range(1 << len(HANDLE_TECHNIQUES))
+    )
+    embedded = re.compile(handle["techniques"]["embedded_command"]["case_sensitive_pattern"])
+    return patterns, phrases, points, templates, embedded
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    """Compiled scoring rules.
+
+    Instances are never mutated after ``load`` returns, so one instance can be
+    shared by every scorer and thread in the process.
+    """
+    version: int
+    techniques: Mapping[str, Any]
+    magic_phrases: Mapping[str, Any]
+    acknowledge_terms: Tuple[str, ...]
+    acknowledge_points: Tuple[int, int, int]  # by tier: none, one, multiple
+    isolation_points: Tuple[int, int, int]
+    closing_points: Tuple[int, int, int]
+    handle_points: Tuple[int, ...]  # by technique flags
+    rapport_breakers: Mapping[str, str]
+    handle_patterns: Mapping[str, int]  # pattern -> technique flags
+    feedback_templates: Tuple[str, ...]  # indexed by feedback code
+    magic_phrase_keywords: Mapping[str, Tuple[str, ...]]
+    phrase_matcher: PhraseMatcher
+    isolation_plan: RegexPlan
+    closing_plan: RegexPlan
+    rapport_breaker_plan: RegexPlan
+    handle_plan: RegexPlan
+    embedded_command_pattern: re.Pattern
+
+    @classmethod
+    def load(cls, data_dir: Path = DATA_DIR, version: int = 1) -> "ScoringRules":
+        """Read the rule data files and compile them.
+
+        Args:
+            data_dir: Directory holding scoring_rules.json, techniques.json
+                and magic_phrases.json
+            version: Version number to stamp on the rule set
+
+        Returns:
+            Compiled ScoringRules
+
+        Raises:
+            ValueError: If a file is not valid JSON, the scoring rules are
+                incomplete or out of range, or a category's combined plan
+                disagrees with its patterns
+        """
+        with open(data_dir / "scoring_rules.json", 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+
+        with open(data_dir / "techniques.json", 'r') as f:
+            techniques = _freeze(json.load(f))
+
+        with open(data_dir / "magic_phrases.json", 'r') as f:
+            magic_phrases = _freeze(json.load(f))
+
+        try:
+            return cls._compile(spec, techniques, magic_phrases, version)
+        except (KeyError, TypeError, re.error) as e:
+            raise ValueError(f"Invalid scoring_rules.json: {e!r}")
+
+    @classmethod
+    def _compile(
+        cls, spec: Mapping[str, Any], techniques: Mapping[str, Any],
+        magic_phrases: Mapping[str, Any], version: int,
+    ) -> "ScoringRules":
+        """Compile the parsed rule file into matching plans and lookup tables."""
+        acknowledge_terms = tuple(term.lower() for term in spec["acknowledge"]["terms"])
+        acknowledge_points, acknowledge_feedback = _tiered(
+            spec, "acknowledge", "acknowledge_affirm", args=(0, 1, 2)
+        )
+        isolation_points, isolation_feedback = _tiered(spec, "isolate", "isolate", args=(0, 0, 0))
+        closing_points, closing_feedback = _tiered(spec, "close", "close", args=(0, 0, 0))
+        (handle_patterns, handle_phrases, handle_points,
+         handle_feedback, embedded) = _compile_handle(spec)
+
+        breakers = spec["rapport_breakers"]
+        rapport_breakers = {rule["pattern"]: rule["message"] for rule in breakers["rules"]}
+        penalty_feedback = _template(
+            "rapport_breakers.penalty_feedback", breakers["penalty_feedback"], 1
+        )
+
+        # Magic phrase keywords (first words of each pattern)
+        magic_phrase_keywords = MappingProxyType({
+            phrase_key: tuple(phrase_data["pattern"].lower().split()[:3])
+            for phrase_key, phrase_data in magic_phrases["magic_phrases"].items()
+            if "pattern" in phrase_data
+        })
+
+        # One combined regex per category, checked against its rules so an
+        # edit the combiner can't handle is rejected instead of silently
+        # matching less
+        plans = {
+            "isolate": RegexPlan(spec["isolate"]["patterns"]),
+            "close": RegexPlan(spec["close"]["patterns"]),
+            "rapport_breakers": RegexPlan(list(rapport_breakers)),
+            "handle": RegexPlan(list(handle_patterns)),
+        }
+        for category, plan in plans.items():
+            try:
+                plan.check()
+            except ValueError as e:
+                raise ValueError(f"Invalid scoring_rules.json: {category} patterns: {e}")
+
+        # One automaton for every literal phrase, so a turn is scanned once
+        literals = [(term, "acknowledge") for term in acknowledge_terms]
+        literals += handle_phrases
+        for phrase_key, keywords in magic_phrase_keywords.items():
+            literals += [(keyword, f"magic:{phrase_key}") for keyword in keywords]
+
+        return cls(
+            version=version,
+            techniques=techniques,
+            magic_phrases=magic_phrases,
+            acknowledge_terms=acknowledge_terms,
+            acknowledge_points=acknowledge_points,
+            isolation_points=isolation_points,
+            closing_points=closing_points,
+            handle_points=handle_points,
+            rapport_breakers=MappingProxyType(rapport_breakers),
+            handle_patterns=MappingProxyType(handle_patterns),
+            feedback_templates=tuple(
+                acknowledge_feedback + isolation_feedback + handle_feedback
+                + closing_feedback + [penalty_feedback]
+            ),
+            magic_phrase_keywords=magic_phrase_keywords,
+            phrase_matcher=PhraseMatcher(literals),
+            isolation_plan=plans["isolate"],
+            closing_plan=plans["close"],
+            rapport_breaker_plan=plans["rapport_breakers"],
+            handle_plan=plans["handle"],
+            embedded_command_pattern=embedded,
+        )
+
+
+class RuleRegistry:
+    """Holds the current ScoringRules and swaps in a new set when files change.
+
+    Rule files are stat'ed at most once per ``check_interval`` seconds. A
+    reload compiles a complete new rule set before replacing the reference,
+    so readers always see either the old or the new set, never a mix.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, check_interval: float = 1.0):
+        """Initialize registry.
+
+        Args:
+            data_dir: Directory holding the rule files
+            check_interval: Seconds between file modification checks
+        """
+        self.data_dir = Path(data_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._rules: Optional[ScoringRules] = None
+        self._mtimes: Optional[Tuple[int, ...]] = None
+        self._next_check = 0.0
+
+    def _file_mtimes(self) -> Tuple[int, ...]:
+        return tuple((self.data_dir / name).stat().st_mtime_ns for name in RULE_FILES)
+
+    def get(self) -> ScoringRules:
+        """Return the current rule set, reloading it if the files changed."""
+        rules = self._rules
+        if rules is not None and time.monotonic() < self._next_check:
+            return rules
+
+        with self._lock:
+            if self._rules is not None and time.monotonic() < self._next_check:
+                return self._rules
+
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                mtimes = self._file_mtimes()
+                if mtimes != self._mtimes or self._rules is None:
+                    version = self._rules.version + 1 if self._rules else 1
+                    self._rules = ScoringRules.load(self.data_dir, version=version)
+                    self._mtimes = mtimes
+            except (OSError, ValueError) as e:
+                # Keep serving the last good rules (e.g. file caught mid-write)
+                if self._rules is None:
+                    raise
+                warnings.warn(f"Keeping scoring rules v{self._rules.version}: reload failed ({e})")
+
+            return self._rules
+
+
+_registry = RuleRegistry()
+
+
+def get_rules() -> ScoringRules:
+    """Return the process-wide scoring rules."""
+    return _registry.get()
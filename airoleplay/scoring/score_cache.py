@@ -0,0 +1,108 @@
+"""Bounded LRU/TTL cache of turn scores for repeated agent messages."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .conversation_scorer import TurnScore
+    from .rules import ScoringRules
+
+
+class ScoreCache:
+    """Least-recently-used cache of TurnScores keyed on message and rule version.
+
+    Messages are normalized by stripping surrounding whitespace, which never
+    changes a score. Entries remember the rule set they were scored with, so
+    a rules reload (or a scorer with different pinned rules) is a miss rather
+    than a stale hit. TurnScores are immutable and hand out fresh lists, so a
+    cached score can be shared by every caller.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl: Optional[float] = 3600.0):
+        """Initialize cache.
+
+        Args:
+            max_size: Maximum number of cached turns (0 disables caching)
+            ttl: Seconds an entry stays valid, or None to keep until evicted
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # (rule version, digest) -> (rules, expiry time, score)
+        self._entries: "OrderedDict[Tuple[int, bytes], tuple]" = OrderedDict()
+
+    @staticmethod
+    def key(rules: "ScoringRules", agent_message: str) -> Tuple[int, bytes]:
+        """Cache key: rule version and a digest of the normalized message."""
+        digest = hashlib.blake2b(agent_message.strip().encode("utf-8"), digest_size=16).digest()
+        return rules.version, digest
+
+    def get(self, rules: "ScoringRules", agent_message: str) -> Optional["TurnScore"]:
+        """Return the cached score, or None on a miss."""
+        if not self.max_size:
+            return None
+
+        key = self.key(rules, agent_message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_rules, expires, score = entry
+                if entry_rules is rules and time.monotonic() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return score
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, rules: "ScoringRules", agent_message: str, score: "TurnScore"):
+        """Store score, evicting the least recently used entry if full."""
+        if not self.max_size:
+            return
+
+        key = self.key(rules, agent_message)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (rules, expires, score)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self),
+            "max_size": self.max_size,
+        }
+
+
+_cache = ScoreCache()
+
+
+def get_score_cache() -> ScoreCache:
+    """Return the process-wide turn score cache."""
+    return _cache
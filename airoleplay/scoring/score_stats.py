@@ -0,0 +1,136 @@
+"""Incremental score statistics for sessions, conversations and calls."""
+
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .conversation_scorer import BatchScores, TurnScore
+
+MAX_TURN_SCORE = 11  # 3+3+3+2
+
+# Maximum points per CFR step
+DIMENSIONS = {
+    "acknowledge_affirm": 3,
+    "isolate": 3,
+    "handle": 3,
+    "close": 2,
+    "total": MAX_TURN_SCORE,
+}
+
+
+def _letter_grade(percentage: float) -> str:
+    """Letter grade for a score percentage."""
+    if percentage >= 90:
+        return "A"
+    elif percentage >= 80:
+        return "B"
+    elif percentage >= 70:
+        return "C"
+    elif percentage >= 60:
+        return "D"
+    else:
+        return "F"
+
+
+class ScoreAccumulator:
+    """Running statistics over scored turns, updated in O(1) per turn.
+
+    Keeps a histogram of points per CFR step (and of turn totals), the
+    rapport breaker count and how often each technique was detected. Every
+    summary (averages, threshold counts, grade) is derived from these without
+    revisiting the turns.
+    """
+
+    __slots__ = ("num_turns", "rapport_breakers", "technique_counts", "_histograms")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.num_turns = 0
+        self.rapport_breakers = 0
+        self.technique_counts: Dict[str, int] = {}
+        self._histograms = {name: [0] * (top + 1) for name, top in DIMENSIONS.items()}
+
+    @classmethod
+    def from_batch(cls, batch: "BatchScores") -> "ScoreAccumulator":
+        """Build statistics for a whole batch from its columns."""
+        stats = cls()
+        stats.add_batch(batch)
+        return stats
+
+    def add(self, turn_score: "TurnScore"):
+        """Add one scored turn."""
+        histograms = self._histograms
+        histograms["acknowledge_affirm"][turn_score.acknowledge_affirm] += 1
+        histograms["isolate"][turn_score.isolate] += 1
+        histograms["handle"][turn_score.handle] += 1
+        histograms["close"][turn_score.close] += 1
+        histograms["total"][turn_score.total] += 1
+
+        self.num_turns += 1
+        self.rapport_breakers += len(turn_score.rapport_breakers)
+        for technique in turn_score.techniques_detected:
+            self.technique_counts[technique] = self.technique_counts.get(technique, 0) + 1
+
+    def add_batch(self, batch: "BatchScores"):
+        """Add every turn of a batch."""
+        columns = {
+            "acknowledge_affirm": batch.acknowledge_affirm,
+            "isolate": batch.isolate,
+            "handle": batch.handle,
+            "close": batch.close,
+            "total": batch.total,
+        }
+        for name, column in columns.items():
+            histogram = self._histograms[name]
+            counts = np.bincount(column, minlength=len(histogram)).tolist()
+            for points, count in enumerate(counts):
+                histogram[points] += count
+
+        self.num_turns += len(batch)
+        self.rapport_breakers += int(batch.rapport_breakers.sum())
+        for technique, count in batch.technique_counts().items():
+            self.technique_counts[technique] = self.technique_counts.get(technique, 0) + count
+
+    def sum(self, dimension: str) -> int:
+        """Total points earned on one dimension."""
+        return sum(points * count for points, count in enumerate(self._histograms[dimension]))
+
+    def average(self, dimension: str) -> float:
+        """Average points per turn on one dimension (0.0 with no turns)."""
+        return self.sum(dimension) / max(self.num_turns, 1)
+
+    def count_at_least(self, dimension: str, points: int) -> int:
+        """Number of turns scoring at least ``points`` on a dimension."""
+        return sum(self._histograms[dimension][max(points, 0):])
+
+    def count_below(self, dimension: str, points: int) -> int:
+        """Number of turns scoring below ``points`` on a dimension."""
+        return self.num_turns - self.count_at_least(dimension, points)
+
+    def used_technique(self, name: str) -> bool:
+        """Whether any detected technique mentions ``name``."""
+        return any(name in technique for technique in self.technique_counts)
+
+    @property
+    def total_score(self) -> int:
+        """Sum of all turn scores."""
+        return self.sum("total")
+
+    @property
+    def max_score(self) -> int:
+        """Maximum possible score for all turns."""
+        return self.num_turns * MAX_TURN_SCORE
+
+    @property
+    def percentage(self) -> float:
+        """Score as percentage."""
+        if self.max_score == 0:
+            return 0.0
+        return (self.total_score / self.max_score) * 100
+
+    @property
+    def grade(self) -> str:
+        """Letter grade."""
+        return _letter_grade(self.percentage)
+
@@ -0,0 +1,308 @@
+"""Compact per-turn score with lazily rendered feedback."""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .score_stats import MAX_TURN_SCORE
+
+if TYPE_CHECKING:
+    from .rules import ScoringRules
+
+# Count tiers of the acknowledge, isolate and close steps
+TIERS = ("none", "one", "multiple")
+
+# Handling techniques, in reporting order; technique i sets flag 1 << i
+HANDLE_TECHNIQUES = ("feel_felt_found", "has_there_ever", "level_shift", "embedded_command")
+FEEL_FELT_FOUND = 1
+HAS_THERE_EVER = 2
+LEVEL_SHIFT = 4
+EMBEDDED_COMMAND = 8
+
+# Feedback codes, indexing ScoringRules.feedback_templates
+FB_ACK_NONE = 0  # + tier
+FB_ISO_NONE = 3  # + tier
+FB_FEEL_FELT_FOUND = 6  # + technique index
+FB_BASIC_HANDLING = 10
+FB_CLOSE_NONE = 11  # + tier
+FB_RAPPORT_PENALTY = 14
+
+# Bit layout of TurnScore state: three 2-bit count tiers (acknowledge,
+# isolate, close), four technique flags, two acknowledgement term slots
+# (rule index + 1, 0 = empty), then one bit per rapport breaker rule
+# followed by one bit per magic phrase.
+_ACK_SHIFT = 0
+_ISO_SHIFT = 2
+_CLOSE_SHIFT = 4
+_FLAGS_SHIFT = 6
+_TERMS_SHIFT = 10
+
+
+def _term_bits(rules: "ScoringRules") -> int:
+    return len(rules.acknowledge_terms).bit_length()
+
+
+def _breakers_shift(rules: "ScoringRules") -> int:
+    return _TERMS_SHIFT + 2 * _term_bits(rules)
+
+
+def state_bits(rules: "ScoringRules") -> int:
+    """Number of bits a packed turn state needs under a rule set."""
+    return (
+        _breakers_shift(rules)
+        + len(rules.rapport_breaker_plan.patterns)
+        + len(rules.magic_phrase_keywords)
+    )
+
+
+def pack_state(
+    rules: "ScoringRules",
+    acknowledge_terms: Sequence[int] = (),
+    isolation_matches: int = 0,
+    close_matches: int = 0,
+    techniques: int = 0,
+    rapport_breakers: int = 0,
+    magic_phrases: int = 0,
+) -> int:
+    """Pack what was detected in one turn into an integer.
+
+    Args:
+        rules: Rule set the indices refer to
+        acknowledge_terms: Indices of the acknowledgement terms used
+        isolation_matches: Number of isolation rules matched
+        close_matches: Number of closing rules matched
+        techniques: Handling technique flags (FEEL_FELT_FOUND, ...)
+        rapport_breakers: Bit mask of rapport breaker rules matched
+        magic_phrases: Bit mask of magic phrases used
+
+    Returns:
+        Packed state
+    """
+    term_bits = _term_bits(rules)
+    state = (
+        min(len(acknowledge_terms), 2) << _ACK_SHIFT
+        | min(isolation_matches, 2) << _ISO_SHIFT
+        | min(close_matches, 2) << _CLOSE_SHIFT
+        | techniques << _FLAGS_SHIFT
+    )
+    for slot, term in enumerate(acknowledge_terms[:2]):
+        state |= (term + 1) << (_TERMS_SHIFT + slot * term_bits)
+
+    breakers_shift = _breakers_shift(rules)
+    state |= rapport_breakers << breakers_shift
+    state |= magic_phrases << (breakers_shift + len(rules.rapport_breaker_plan.patterns))
+    return state
+
+
+def unpack_columns(states: np.ndarray, rules: "ScoringRules") -> Dict[str, np.ndarray]:
+    """Per-turn int8 point, breaker count and technique columns from packed states."""
+    def field(shift: int, mask: int) -> np.ndarray:
+        return ((states >> shift) & mask).astype(np.intp)
+
+    def lookup(table, index: np.ndarray) -> np.ndarray:
+        return np.asarray(table, dtype=np.int8)[index]
+
+    breakers = np.zeros(len(states), dtype=np.int8)
+    breakers_shift = _breakers_shift(rules)
+    for i in range(len(rules.rapport_breaker_plan.patterns)):
+        breakers += field(breakers_shift + i, 1).astype(np.int8)
+
+    flags = field(_FLAGS_SHIFT, 0xF)
+    return {
+        "acknowledge_affirm": lookup(rules.acknowledge_points, field(_ACK_SHIFT, 3)),
+        "isolate": lookup(rules.isolation_points, field(_ISO_SHIFT, 3)),
+        "handle": lookup(rules.handle_points, flags),
+        "close": lookup(rules.closing_points, field(_CLOSE_SHIFT, 3)),
+        "rapport_breakers": breakers,
+        "feel_felt_found": ((flags & FEEL_FELT_FOUND) > 0).astype(np.int8),
+        "has_there_ever": ((flags & HAS_THERE_EVER) > 0).astype(np.int8),
+        "level_shift": ((flags & LEVEL_SHIFT) > 0).astype(np.int8),
+        "embedded_command": ((flags & EMBEDDED_COMMAND) > 0).astype(np.int8),
+    }
+
+
+def _bits(mask: int) -> List[int]:
+    """Indices of the set bits in mask."""
+    indices = []
+    index = 0
+    while mask:
+        if mask & 1:
+            indices.append(index)
+        mask >>= 1
+        index += 1
+    return indices
+
+
+class TurnScore:
+    """Score for a single conversation turn.
+
+    The whole score is packed into one integer recording what was detected:
+    how many acknowledgement terms, isolation and closing rules matched, the
+    handling techniques used, and which terms, rapport breakers and magic
+    phrases matched (as indices into the rule set it was scored with).
+    Points, feedback codes and feedback text are derived from that state and
+    the rule set only when read, so an archived turn costs a small object and
+    one int. Scores are immutable; the list properties return fresh lists.
+    """
+
+    __slots__ = ("_state", "_rules", "_embedded")
+
+    def __init__(
+        self,
+        state: int = 0,
+        rules: Optional["ScoringRules"] = None,
+        embedded_command: Optional[str] = None,
+    ):
+        """Initialize score.
+
+        Args:
+            state: Packed score (see ``pack_state``)
+            rules: Rule set the state was scored with (default: current rules)
+            embedded_command: First embedded command found, if any
+        """
+        if rules is None:
+            from .rules import get_rules
+            rules = get_rules()
+        self._state = state
+        self._rules = rules
+        self._embedded = embedded_command
+
+    @property
+    def state(self) -> int:
+        """Packed score."""
+        return self._state
+
+    def _field(self, shift: int, mask: int = 3) -> int:
+        return (self._state >> shift) & mask
+
+    @property
+    def acknowledge_affirm(self) -> int:
+        """Acknowledge & affirm points (0-3)."""
+        return self._rules.acknowledge_points[self._field(_ACK_SHIFT)]
+
+    @property
+    def isolate(self) -> int:
+        """Isolation points (0-3)."""
+        return self._rules.isolation_points[self._field(_ISO_SHIFT)]
+
+    @property
+    def handle(self) -> int:
+        """Handling points (0-3)."""
+        return self._rules.handle_points[self.techniques]
+
+    @property
+    def close(self) -> int:
+        """Closing points (0-2)."""
+        return self._rules.closing_points[self._field(_CLOSE_SHIFT)]
+
+    @property
+    def techniques(self) -> int:
+        """Handling technique flags."""
+        return self._field(_FLAGS_SHIFT, 0xF)
+
+    @property
+    def total(self) -> int:
+        """Calculate total score."""
+        return self.acknowledge_affirm + self.isolate + self.handle + self.close
+
+    @property
+    def max_score(self) -> int:
+        """Maximum possible score."""
+        return MAX_TURN_SCORE
+
+    def _matches(self):
+        """(acknowledgement term indices, breaker mask, magic phrase mask)."""
+        rules = self._rules
+        term_bits = _term_bits(rules)
+        term_mask = (1 << term_bits) - 1
+        terms = []
+        for slot in range(2):
+            term = self._field(_TERMS_SHIFT + slot * term_bits, term_mask)
+            if term:
+                terms.append(term - 1)
+
+        matches = self._state >> _breakers_shift(rules)
+        num_breakers = len(rules.rapport_breaker_plan.patterns)
+        return terms, matches & ((1 << num_breakers) - 1), matches >> num_breakers
+
+    @property
+    def rapport_breakers(self) -> List[str]:
+        """Rapport breaker messages, in rule order."""
+        _, breakers, _ = self._matches()
+        patterns = self._rules.rapport_breaker_plan.patterns
+        return [self._rules.rapport_breakers[patterns[i]] for i in _bits(breakers)]
+
+    @property
+    def magic_phrases_used(self) -> List[str]:
+        """Names of the magic phrases used."""
+        _, _, magic = self._matches()
+        if not magic:
+            return []
+        keys = list(self._rules.magic_phrase_keywords)
+        phrases = self._rules.magic_phrases["magic_phrases"]
+        return [phrases[keys[i]]["name"] for i in _bits(magic)]
+
+    @property
+    def feedback_codes(self) -> List[tuple]:
+        """Feedback as (code, *arguments) tuples, in reporting order."""
+        terms, breakers, _ = self._matches()
+        term_names = [self._rules.acknowledge_terms[i] for i in terms]
+
+        codes = [
+            (FB_ACK_NONE + self._field(_ACK_SHIFT), *term_names),
+            (FB_ISO_NONE + self._field(_ISO_SHIFT),),
+        ]
+
+        techniques = self.techniques
+        for i, name in enumerate(HANDLE_TECHNIQUES):
+            if techniques & (1 << i):
+                args = (self._embedded,) if name == "embedded_command" else ()
+                codes.append((FB_FEEL_FELT_FOUND + i, *args))
+        if not techniques:
+            codes.append((FB_BASIC_HANDLING,))
+
+        codes.append((FB_CLOSE_NONE + self._field(_CLOSE_SHIFT),))
+
+        if breakers:
+            codes.append((FB_RAPPORT_PENALTY, len(_bits(breakers))))
+
+        return codes
+
+    def _render(self, code: int, args) -> str:
+        return self._rules.feedback_templates[code].format(*args)
+
+    @property
+    def feedback(self) -> List[str]:
+        """Rendered feedback lines."""
+        return [self._render(code, args) for code, *args in self.feedback_codes]
+
+    @property
+    def techniques_detected(self) -> List[str]:
+        """Handling feedback lines that name a technique."""
+        techniques = []
+        for code, *args in self.feedback_codes:
+            if FB_FEEL_FELT_FOUND <= code <= FB_BASIC_HANDLING:
+                text = self._render(code, args)
+                if "technique" in text.lower():
+                    techniques.append(text)
+        return techniques
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TurnScore):
+            return NotImplemented
+        return (
+            self._state == other._state
+            and self._rules is other._rules
+            and self._embedded == other._embedded
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._state, self._embedded))
+
+    def __repr__(self) -> str:
+        return (
+            f"TurnScore(acknowledge_affirm={self.acknowledge_affirm}, isolate={self.isolate}, "
+            f"handle={self.handle}, close={self.close}, "
+            f"magic_phrases_used={self.magic_phrases_used!r}, "
+            f"rapport_breakers={self.rapport_breakers!r})"
+        )
@@ -0,0 +1,326 @@
+"""Record/replay cassettes for LLM and Whisper calls."""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from .metrics import model_name
+
+MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """Request/response pairs keyed by a canonical hash of the request.
+
+    Modes:
+        record: Always call the provider and store the response
+        replay: Only serve stored responses (raises CassetteMiss otherwise)
+        auto: Serve stored responses, recording the ones that are missing
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "auto",
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+    ):
+        """Initialize cassette.
+
+        Args:
+            path: JSON file holding the recordings (created on first record)
+            mode: "record", "replay" or "auto"
+            simulate_latency: Sleep for the recorded provider latency on replay
+            latency_scale: Multiplier applied to recorded latencies
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Use one of: {', '.join(MODES)}")
+        self.path = Path(path)
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)["entries"]
+
+    @staticmethod
+    def key(request: Dict) -> str:
+        """Canonical hash of a JSON-serializable request."""
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Stored entry for key, None if it should be recorded."""
+        if self.mode == "record":
+            return None
+        entry = self._entries.get(key)
+        if entry is None and self.mode == "replay":
+            raise CassetteMiss(f"No recording for request {key[:12]} in {self.path}")
+        return entry
+
+    def store(self, key: str, entry: Dict):
+        """Record an entry and write the cassette file."""
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "entries": self._entries}, f, indent=1,
+                          ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def delay(self, seconds: float) -> float:
+        """Seconds to wait on replay for a recorded duration."""
+        return seconds * self.latency_scale if self.simulate_latency else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def wrap_chat_model(self, llm: Optional[BaseChatModel] = None, **kwargs) -> "CassetteChatModel":
+        """Chat model that records llm's responses to (or replays them from) this cassette.
+
+        Args:
+            llm: Provider model (may be None in replay mode)
+            **kwargs: model / temperature for the request key when llm is None
+
+        Returns:
+            CassetteChatModel
+        """
+        fields = {
+            "model": model_name(llm) if llm is not None else kwargs.get("model", "unknown"),
+            "temperature": getattr(llm, "temperature", kwargs.get("temperature")),
+        }
+        return CassetteChatModel(cassette=self, inner=llm, **fields)
+
+    def wrap_openai(self, client: Any = None) -> "CassetteOpenAI":
+        """OpenAI-compatible client that records/replays audio transcriptions."""
+        return CassetteOpenAI(self, client)
+
+
+def _message_request(messages: List[BaseMessage]) -> List[Dict]:
+    return [{"type": message.type, "content": message.content} for message in messages]
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model backed by a Cassette, delegating misses to a provider model."""
+
+    cassette: Any
+    inner: Optional[BaseChatModel] = None
+    model: str = "unknown"
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def _key(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> str:
+        return self.cassette.key({
+            "kind": "chat",
+            "model": self.model,
+            "temperature": self.temperature,
+            "stop": stop,
+            "messages": _message_request(messages),
+        })
+
+    def _require_inner(self) -> BaseChatModel:
+        if self.inner is None:
+            raise CassetteMiss("Request not recorded and no provider model to record from")
+        return self.inner
+
+    def _entry(self, result: AIMessage, start: float, first_token: Optional[float] = None):
+        end = time.perf_counter()
+        return {
+            "content": result.content,
+            "usage_metadata": result.usage_metadata,
+            "response_metadata": result.response_metadata,
+            "latency_s": end - start,
+            "first_token_s": (first_token or end) - start,
+        }
+
+    @staticmethod
+    def _message(entry: Dict) -> AIMessage:
+        return AIMessage(
+            content=entry["content"],
+            usage_metadata=entry.get("usage_metadata"),
+            response_metadata=entry.get("response_metadata") or {},
+        )
+
+    @staticmethod
+    def _chunks(entry: Dict) -> List[AIMessageChunk]:
+        """Split a recorded reply into word chunks; usage rides on the last one."""
+        content = entry["content"]
+        if not isinstance(content, str):
+            return [AIMessageChunk(content=content, usage_metadata=entry.get("usage_metadata"))]
+        words = content.split(" ")
+        texts = [word + " " for word in words[:-1]] + [words[-1]]
+        chunks = [AIMessageChunk(content=text) for text in texts]
+        chunks[-1].usage_metadata = entry.get("usage_metadata")
+        return chunks
+
+    def _pacing(self, entry: Dict, count: int):
+        """(wait before the first chunk, wait between later chunks) on replay."""
+        first = self.cassette.delay(entry.get("first_token_s", entry["latency_s"]))
+        rest = self.cassette.delay(entry["latency_s"]) - first
+        return first, max(rest, 0.0) / max(count - 1, 1)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages, stop)
+        entry = self.cassette.lookup(key)
+        if entry is None:
+            start = time.perf_counter()
+            result = self._require_inner().invoke(messages, stop=stop, **kwargs)
+            entry = self._entry(result, start)
+            self.cassette.store(key, entry)
+        else:
+            time.sleep(self.cassette.delay(entry["latency_s"]))
+        return ChatResult(generations=[ChatGeneration(message=self._message(entry))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._key(messages, stop)
+        entry = self.cassette.lookup(key)
+        if entry is None:
+            start = time.perf_counter()
+            result = await self._require_inner().ainvoke(messages, stop=stop, **kwargs)
+            entry = self._entry(result, start)
+            self.cassette.store(key, entry)
+        else:
+            await asyncio.sleep(self.cassette.delay(entry["latency_s"]))
+        return ChatResult(generations=[ChatGeneration(message=self._message(entry))])
+
+    def _stream(self, messages, stop=None, run_manager=None,
+                **kwargs) -> Iterator[ChatGenerationChunk]:
+        key = self._key(messages, stop)
+        entry = self.cassette.lookup(key)
+        if entry is None:
+            # Record while passing chunks through as they arrive
+            start = time.perf_counter()
+            first_token = None
+            result = None
+            for chunk in self._require_inner().stream(messages, stop=stop, **kwargs):
+                if first_token is None and chunk.content:
+                    first_token = time.perf_counter()
+                result = chunk if result is None else result + chunk
+                yield ChatGenerationChunk(message=chunk)
+            if result is not None:
+                self.cassette.store(key, self._entry(result, start, first_token))
+            return
+
+        chunks = self._chunks(entry)
+        first, gap = self._pacing(entry, len(chunks))
+        time.sleep(first)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(gap)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None,
+                       **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._key(messages, stop)
+        entry = self.cassette.lookup(key)
+        if entry is None:
+            start = time.perf_counter()
+            first_token = None
+            result = None
+            async for chunk in self._require_inner().astream(messages, stop=stop, **kwargs):
+                if first_token is None and chunk.content:
+                    first_token = time.perf_counter()
+                result = chunk if result is None else result + chunk
+                yield ChatGenerationChunk(message=chunk)
+            if result is not None:
+                self.cassette.store(key, self._entry(result, start, first_token))
+            return
+
+        chunks = self._chunks(entry)
+        first, gap = self._pacing(entry, len(chunks))
+        await asyncio.sleep(first)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(gap)
+            yield ChatGenerationChunk(message=chunk)
+
+
+class _Transcriptions:
+    """``client.audio.transcriptions`` backed by a cassette."""
+
+    def __init__(self, cassette: Cassette, client: Any):
+        self._cassette = cassette
+        self._client = client
+
+    def create(self, file, **kwargs):
+        """Same arguments as ``openai.OpenAI().audio.transcriptions.create``."""
+        audio = file.read()
+        file.seek(0)
+        key = self._cassette.key({
+            "kind": "transcription",
+            "audio_sha256": hashlib.sha256(audio).hexdigest(),
+            **kwargs,
+        })
+
+        entry = self._cassette.lookup(key)
+        if entry is None:
+            if self._client is None:
+                raise CassetteMiss("Transcription not recorded and no OpenAI client to record from")
+            start = time.perf_counter()
+            response = self._client.audio.transcriptions.create(file=file, **kwargs)
+            data = response.model_dump() if hasattr(response, "model_dump") else dict(response)
+            entry = {"response": data, "latency_s": time.perf_counter() - start}
+            self._cassette.store(key, entry)
+        else:
+            time.sleep(self._cassette.delay(entry["latency_s"]))
+
+        # Attribute access like the SDK object; segments stay dicts
+        return SimpleNamespace(**entry["response"])
+
+
+class CassetteOpenAI:
+    """Minimal OpenAI client stand-in covering ``audio.transcriptions.create``."""
+
+    def __init__(self, cassette: Cassette, client: Any = None):
+        """Initialize client.
+
+        Args:
+            cassette: Cassette to record to / replay from
+            client: Real ``openai.OpenAI`` client used for recording (None to replay only)
+        """
+        self.audio = SimpleNamespace(transcriptions=_Transcriptions(cassette, client))
+
+
+_env_cassettes: Dict[str, Cassette] = {}
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """Cassette configured by environment variables, or None.
+
+    AIROLEPLAY_CASSETTE names the cassette file. AIROLEPLAY_CASSETTE_MODE
+    (record/replay/auto, default auto) and AIROLEPLAY_CASSETTE_LATENCY (a
+    scale factor for recorded latency; unset means no simulated latency)
+    are optional.
+    """
+    path = os.getenv("AIROLEPLAY_CASSETTE")
+    if not path:
+        return None
+    if path not in _env_cassettes:
+        latency = os.getenv("AIROLEPLAY_CASSETTE_LATENCY")
+        _env_cassettes[path] = Cassette(
+            path,
+            mode=os.getenv("AIROLEPLAY_CASSETTE_MODE", "auto"),
+            simulate_latency=latency is not None,
+            latency_scale=float(latency) if latency else 1.0,
+        )
+    return _env_cassettes[path]
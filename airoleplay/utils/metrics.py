@@ -0,0 +1,341 @@
+"""In-process metrics registry and per-session LLM call metrics."""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages.ai import add_usage
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+SCORING_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative bucket counts plus count and sum."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms with Prometheus-style labels."""
+
+    def __init__(self, prefix: str = "airoleplay"):
+        """Initialize registry.
+
+        Args:
+            prefix: Prepended to metric names in the Prometheus exposition
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    @staticmethod
+    def _labels(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add value to a counter."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+                **labels):
+        """Record a value in a histogram (buckets are fixed on first use)."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def snapshot(self) -> Dict:
+        """All metrics as plain data."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "buckets": dict(zip(h.buckets, h.counts)),
+                    }
+                    for key, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        def fmt(labels: Dict[str, str], **extra) -> str:
+            pairs = {**labels, **extra}
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs.items()) + "}"
+
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in snapshot["counters"].items():
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full} counter")
+            for entry in series:
+                lines.append(f"{full}{fmt(entry['labels'])} {entry['value']:g}")
+        for name, series in snapshot["histograms"].items():
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full} histogram")
+            for entry in series:
+                labels = entry["labels"]
+                for bound, count in entry["buckets"].items():
+                    lines.append(f"{full}_bucket{fmt(labels, le=f'{bound:g}')} {count}")
+                lines.append(f"{full}_bucket{fmt(labels, le='+Inf')} {entry['count']}")
+                lines.append(f"{full}_sum{fmt(labels)} {entry['sum']:g}")
+                lines.append(f"{full}_count{fmt(labels)} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Write a JSON snapshot to path."""
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def serve(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve the Prometheus exposition on a background thread.
+
+        Returns:
+            The running server (call ``shutdown()`` to stop it)
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def reset(self):
+        """Drop all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+@dataclass
+class LLMCallMetrics:
+    """Timing and token usage of one LLM call."""
+    model: str
+    kind: str  # "chat", "stream" or "summary"
+    latency_s: float
+    first_token_s: float  # equal to latency_s for non-streamed calls
+    input_tokens: int = 0  # includes cached tokens
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    status: str = "ok"  # "cancelled" or "error" for a stream that did not finish
+
+    @classmethod
+    def from_usage(
+        cls,
+        model: str,
+        kind: str,
+        start: float,
+        usage: Optional[Dict],
+        first_token: Optional[float] = None,
+        status: str = "ok",
+    ) -> "LLMCallMetrics":
+        """Build from a ``time.perf_counter()`` start and LangChain usage metadata.
+
+        Args:
+            model: Model name
+            kind: Call kind
+            start: perf_counter value when the call was made
+            usage: ``usage_metadata`` of the response (may be None)
+            first_token: perf_counter value when the first token arrived
+            status: "ok", or "cancelled" / "error" for an unfinished stream
+
+        Returns:
+            LLMCallMetrics ending now
+        """
+        end = time.perf_counter()
+        usage = usage or {}
+        details = usage.get("input_token_details") or {}
+        return cls(
+            model=model,
+            kind=kind,
+            latency_s=end - start,
+            first_token_s=(first_token if first_token is not None else end) - start,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            cache_read_tokens=details.get("cache_read") or 0,
+            cache_creation_tokens=details.get("cache_creation") or 0,
+            status=status,
+        )
+
+    def record(self, registry: MetricsRegistry):
+        """Add this call to registry."""
+        labels = {"model": self.model, "kind": self.kind}
+        registry.inc("llm_calls_total", status=self.status, **labels)
+        registry.observe("llm_latency_seconds", self.latency_s, **labels)
+        registry.observe("llm_time_to_first_token_seconds", self.first_token_s, **labels)
+        registry.inc("llm_input_tokens_total", self.input_tokens, **labels)
+        registry.inc("llm_output_tokens_total", self.output_tokens, **labels)
+        registry.inc("llm_cache_read_tokens_total", self.cache_read_tokens, **labels)
+        registry.inc("llm_cache_creation_tokens_total", self.cache_creation_tokens, **labels)
+
+
+class SessionMetrics:
+    """LLM calls and scoring times of one roleplay session.
+
+    Everything recorded here is also added to a metrics registry, so
+    per-session summaries and process-wide totals stay consistent.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """Initialize session metrics.
+
+        Args:
+            registry: Registry to report to (default: process-wide registry)
+        """
+        self.registry = registry or get_metrics_registry()
+        self.calls: List[LLMCallMetrics] = []
+        self.scoring_times: List[float] = []
+
+    def record_call(self, call: LLMCallMetrics):
+        """Record one LLM call."""
+        self.calls.append(call)
+        call.record(self.registry)
+
+    def record_scoring(self, seconds: float):
+        """Record the time taken to score one turn."""
+        self.scoring_times.append(seconds)
+        self.registry.observe("scoring_seconds", seconds, buckets=SCORING_BUCKETS)
+
+    def summary(self) -> Dict:
+        """Totals and averages for the session."""
+        # Latency of unfinished streams would understate a full reply
+        calls = [call for call in self.calls if call.kind != "summary" and call.status == "ok"]
+        input_tokens = sum(call.input_tokens for call in self.calls)
+        cache_read = sum(call.cache_read_tokens for call in self.calls)
+
+        def average(values: List[float]) -> float:
+            return round(sum(values) / len(values), 3) if values else 0.0
+
+        return {
+            "llm_calls": len(self.calls),
+            "cancelled_calls": sum(call.status == "cancelled" for call in self.calls),
+            "avg_latency_s": average([call.latency_s for call in calls]),
+            "max_latency_s": round(max((call.latency_s for call in calls), default=0.0), 3),
+            "avg_time_to_first_token_s": average([call.first_token_s for call in calls]),
+            "input_tokens": input_tokens,
+            "output_tokens": sum(call.output_tokens for call in self.calls),
+            "cache_read_tokens": cache_read,
+            "cache_creation_tokens": sum(call.cache_creation_tokens for call in self.calls),
+            "cache_hit_rate": round(cache_read / input_tokens, 3) if input_tokens else 0.0,
+            "avg_scoring_ms": average([t * 1000 for t in self.scoring_times]),
+            "calls": [asdict(call) for call in self.calls],
+        }
+
+    def clear(self):
+        """Forget the session's calls (the registry keeps its totals)."""
+        self.calls = []
+        self.scoring_times = []
+
+
+def model_name(llm) -> str:
+    """Model name of a LangChain chat model."""
+    return getattr(llm, "model", None) or getattr(llm, "model_name", None) or type(llm).__name__
+
+
+def invoke_timed(llm, messages: list, metrics: SessionMetrics, kind: str = "chat"):
+    """``llm.invoke(messages)``, recording the call in metrics."""
+    start = time.perf_counter()
+    result = llm.invoke(messages)
+    metrics.record_call(
+        LLMCallMetrics.from_usage(model_name(llm), kind, start, result.usage_metadata)
+    )
+    return result
+
+
+async def ainvoke_timed(llm, messages: list, metrics: SessionMetrics, kind: str = "chat"):
+    """``await llm.ainvoke(messages)``, recording the call in metrics."""
+    start = time.perf_counter()
+    result = await llm.ainvoke(messages)
+    metrics.record_call(
+        LLMCallMetrics.from_usage(model_name(llm), kind, start, result.usage_metadata)
+    )
+    return result
+
+
+def stream_timed(llm, messages: list, metrics: SessionMetrics, kind: str = "stream"):
+    """``llm.stream(messages)``, recording the call in metrics when it ends.
+
+    A stream the consumer closes early is recorded as "cancelled" and one
+    that raises as "error", with the usage seen up to that point.
+
+    Yields:
+        Message chunks as they arrive
+    """
+    usage = None
+    first_token = None
+    status = "error"
+    start = time.perf_counter()
+    chunks = llm.stream(messages)
+    try:
+        for chunk in chunks:
+            if chunk.usage_metadata:
+                usage = add_usage(usage, chunk.usage_metadata)
+            if chunk.content and first_token is None:
+                first_token = time.perf_counter()
+            yield chunk
+        status = "ok"
+    except GeneratorExit:
+        status = "cancelled"
+        raise
+    finally:
+        chunks.close()
+        metrics.record_call(
+            LLMCallMetrics.from_usage(model_name(llm), kind, start, usage, first_token, status)
+        )
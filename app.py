@@ -1,13 +1,19 @@
 """Streamlit web interface for AI Roleplay + Call Coaching System."""
 
 import os
+import uuid
 import streamlit as st
 from pathlib import Path
 from dotenv import load_dotenv
 import tempfile
 
-from airoleplay.characters.persona_character import PersonaCharacter
+from airoleplay.characters.persona_registry import get_persona_registry
 from airoleplay.agents.enhanced_roleplay_agent import EnhancedRoleplayAgent
+from airoleplay.agents.call_policy import LLMCallFailed
+from airoleplay.agents.llm_pool import preconnect
+from airoleplay.agents.model_router import ModelRouter, default_tiers
+from airoleplay.agents.opening_pool import OPENING_LINE, get_opening_pool
+from airoleplay.agents.session_store import get_session_store
 from airoleplay.call_analysis.audio_processor import AudioProcessor
 from airoleplay.call_analysis.call_analyzer import CallAnalyzer
 
@@ -47,23 +53,57 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'agent' not in st.session_state:
-    st.session_state.agent = None
-if 'conversation_history' not in st.session_state:
-    st.session_state.conversation_history = []
+
+@st.cache_resource
+def warm_llm_client() -> bool:
+    """Pre-connect the shared LLM clients once per server process."""
+    return all([preconnect(model) for _, model in default_tiers()])
+
+
+if os.getenv("ANTHROPIC_API_KEY"):
+    warm_llm_client()
+
+
+def session_id() -> str:
+    """Id of this trainee's roleplay session, kept in the URL so it survives restarts."""
+    sid = st.query_params.get("session")
+    if not sid:
+        sid = uuid.uuid4().hex
+        st.query_params["session"] = sid
+    return sid
+
+
+def history_from_agent(agent) -> list:
+    """Rebuild the displayed conversation from a restored agent."""
+    history = []
+    scores = iter(agent.turn_scores)
+    turns = zip(agent.conversation_turns, agent.cooperation_history)
+    for i, ((agent_message, client_response), cooperation) in enumerate(turns):
+        if i:
+            entry = {"role": "agent", "content": agent_message}
+            turn_score = next(scores)
+            if agent.training_mode in ("scoring", "practice"):
+                entry["score"] = turn_score.total
+                entry["max_score"] = turn_score.max_score
+                entry["feedback"] = turn_score.feedback
+            history.append(entry)
+        history.append({"role": "client", "content": client_response, "cooperation": cooperation})
+    return history
+
+
+# Initialize session state; agents live in the session store, not in session_state
 if 'session_started' not in st.session_state:
-    st.session_state.session_started = False
+    # Resume a session that was in progress before a restart or reconnect
+    restored = get_session_store().get(session_id())
+    st.session_state.session_started = restored is not None
+    st.session_state.conversation_history = history_from_agent(restored) if restored else []
+    if restored:
+        st.session_state.persona_name = restored.persona.label
 
 
 def load_personas():
-    """Load available personas."""
-    personas_dir = Path(__file__).parent / "airoleplay" / "personas"
-    return {
-        "Investor – Cash Flow Focused": str(personas_dir / "investor.json"),
-        "First Time Buyer – Anxious/Curious": str(personas_dir / "first_time_buyer.json"),
-        "Seller / Downsizer – Convenience & Timing": str(personas_dir / "seller.json")
-    }
+    """Available persona ids, keyed by label."""
+    return get_persona_registry().by_label()
 
 
 def main():
@@ -138,46 +178,56 @@ def live_roleplay_page():
 
         # Show persona info
         if selected_persona:
-            persona_path = personas[selected_persona]
-            persona = PersonaCharacter.from_json(persona_path)
+            persona = get_persona_registry().create(personas[selected_persona])
 
             with st.expander("📋 Persona Details", expanded=True):
                 st.markdown(f"**Traits:** {', '.join(persona.persona_traits)}")
                 st.markdown(f"**Goals:** {', '.join(persona.goals[:3])}")
                 st.markdown(f"**Objections:** {len(persona.objection_patterns)} patterns")
 
+            # Pre-generate the persona's first reply while the trainee gets ready
+            if os.getenv("ANTHROPIC_API_KEY"):
+                level = difficulty.lower()
+                get_opening_pool().warm(persona, level, ModelRouter().model_for_difficulty(level))
+
         # Start button
         if st.button("🚀 Start Training Session", type="primary"):
-            persona = PersonaCharacter.from_json(personas[selected_persona])
+            persona = get_persona_registry().create(personas[selected_persona])
             agent = EnhancedRoleplayAgent(
                 persona=persona,
                 difficulty=difficulty.lower(),
                 training_mode=training_mode.lower()
             )
 
+            # Get initial message, pre-generated if one is ready
+            try:
+                initial = agent.start_from_pool() or agent.chat(
+                    OPENING_LINE,
+                    thread_id="streamlit_session"
+                )
+            except LLMCallFailed as e:
+                st.error(f"⚠️ Could not start the session: {e}. Please try again.")
+                st.stop()
+
             # Initialize session
-            st.session_state.agent = agent
+            get_session_store().save(session_id(), agent)
             st.session_state.persona_name = selected_persona
             st.session_state.session_started = True
-            st.session_state.conversation_history = []
-
-            # Get initial message
-            initial = agent.chat(
-                "Hi, I'm a real estate agent. How can I help you today?",
-                thread_id="streamlit_session"
-            )
-
-            st.session_state.conversation_history.append({
+            st.session_state.conversation_history = [{
                 "role": "client",
                 "content": initial["client_response"],
                 "cooperation": initial.get("persona_cooperation", 5)
-            })
+            }]
 
             st.rerun()
 
     # Conversation section
     else:
-        agent = st.session_state.agent
+        agent = get_session_store().get(session_id())
+        if agent is None:
+            # Snapshot purged while the tab was away
+            st.session_state.session_started = False
+            st.rerun()
         persona_name = st.session_state.persona_name
 
         # Header with controls
@@ -186,6 +236,9 @@ def live_roleplay_page():
             st.subheader(f"💬 Conversation with {persona_name}")
         with col2:
             if st.button("🔄 End Session"):
+                # Keep the summary, then forget the session so a reload can't resume it
+                st.session_state.session_summary = agent.get_session_summary()
+                get_session_store().delete(session_id())
                 st.session_state.session_started = False
                 st.session_state.show_summary = True
                 st.rerun()
@@ -219,8 +272,23 @@ def live_roleplay_page():
                 "content": user_input
             })
 
-            # Get agent response
-            response = agent.chat(user_input, thread_id="streamlit_session")
+            with chat_container:
+                with st.chat_message("user", avatar="👤"):
+                    st.write(user_input)
+
+                # Stream the client response as it is generated
+                with st.chat_message("assistant", avatar="🧑"):
+                    try:
+                        st.write_stream(
+                            agent.chat_stream(user_input, thread_id="streamlit_session")
+                        )
+                    except LLMCallFailed as e:
+                        # The turn was not recorded; let the trainee send it again
+                        st.session_state.conversation_history.pop()
+                        st.error(f"⚠️ The client didn't respond ({e}). Please send that again.")
+                        st.stop()
+            response = agent.last_response
+            get_session_store().save(session_id(), agent)
 
             # Update last agent message with scores
             if "score" in response:
@@ -241,9 +309,8 @@ def live_roleplay_page():
     if st.session_state.get('show_summary', False):
         st.subheader("📊 Session Summary")
 
-        if st.session_state.agent:
-            summary = st.session_state.agent.get_session_summary()
-
+        summary = st.session_state.get('session_summary')
+        if summary:
             if "message" not in summary:
                 # Display metrics
                 col1, col2, col3, col4 = st.columns(4)
@@ -278,7 +345,7 @@ def live_roleplay_page():
         if st.button("Start New Session"):
             st.session_state.show_summary = False
             st.session_state.session_started = False
-            st.session_state.agent = None
+            st.session_state.session_summary = None
             st.rerun()
 
 
@@ -0,0 +1,74 @@
+"""Micro-benchmark: combined regex plans vs. one re.search per rule.
+
+Run from the repository root:
+
+    python benchmarks/bench_regex_plan.py
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from airoleplay.scoring.rules import ScoringRules
+
+TURNS = [
+    "Perfect! You're absolutely right to focus on cap rate - that's the key metric for any "
+    "investment property. Out of curiosity, besides the cap rate, is there any other reason "
+    "you wouldn't move forward on this property?",
+    "I know how you feel, many of my clients felt the same way, but what they found was that "
+    "waiting cost them more. Does that make sense? Which works better, Thursday or Saturday?",
+    "I understand. Actually the market is moving fast, but you said you wanted to wait.",
+    "Has there ever been a time when you waited and regretted it? Why don't we...WRITE AN "
+    "OFFER...today? Would you like to see the comps first?",
+    "Hi, I'm a real estate agent. How can I help you today?",
+]
+
+
+def legacy_regex_rules(rules: ScoringRules, text: str) -> tuple:
+    """Regex checks as score_turn ran them before the plans: one search per rule."""
+    return (
+        [p for p in rules.isolation_plan.patterns if re.search(p, text)],
+        [p for p in rules.closing_plan.patterns if re.search(p, text)],
+        [m for p, m in rules.rapport_breakers.items() if re.search(p, text)],
+        [p for p in rules.handle_patterns if re.search(p, text)],
+    )
+
+
+def planned_regex_rules(rules: ScoringRules, text: str) -> tuple:
+    """Regex checks through the precompiled per-category plans."""
+    return (
+        rules.isolation_plan.matched(text),
+        rules.closing_plan.matched(text),
+        [rules.rapport_breakers[p] for p in rules.rapport_breaker_plan.matched(text)],
+        rules.handle_plan.matched(text),
+    )
+
+
+def per_turn_us(func, rules: ScoringRules, turns: list, number: int) -> float:
+    """Average microseconds per turn."""
+    seconds = timeit.timeit(lambda: [func(rules, t) for t in turns], number=number)
+    return seconds / (number * len(turns)) * 1e6
+
+
+def main(number: int = 2000):
+    """Check both paths agree, then time them."""
+    rules = ScoringRules.load()
+    turns = [t.lower() for t in TURNS]
+
+    for text in turns:
+        assert legacy_regex_rules(rules, text) == planned_regex_rules(rules, text), text
+
+    print(f"Regex rules per turn ({len(turns)} sample turns x {number} runs)")
+    for label, factor in (("short turns", 1), ("long turns (x8)", 8)):
+        sample = [" ".join([t] * factor) for t in turns]
+        legacy = per_turn_us(legacy_regex_rules, rules, sample, number // factor)
+        planned = per_turn_us(planned_regex_rules, rules, sample, number // factor)
+        print(f"  {label:<16} re.search per rule: {legacy:7.1f} us   "
+              f"combined plans: {planned:7.1f} us   speedup: {legacy / planned:4.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,201 @@
+"""Scoring benchmark: throughput, latency, peak memory and the instant-feel limit.
+
+Run from the repository root:
+
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --json results.json
+    python benchmarks/bench_scoring.py --compare results.json   # after adding rules
+
+``--compare`` exits non-zero when a metric is slower than the saved run by
+more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from airoleplay.scoring import ConversationScorer, ScoreCache
+from synthetic_corpus import SyntheticCorpus
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ("turn_p50_us", "turn_p99_us", "conversation_p50_us",
+                   "conversation_p99_us", "conversation_peak_kib")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def time_calls(func, inputs: list) -> List[float]:
+    """Microseconds taken by func on each input."""
+    timings = []
+    for item in inputs:
+        start = time.perf_counter_ns()
+        func(item)
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    return timings
+
+
+def check_plans(scorer: ConversationScorer, corpus: SyntheticCorpus, count: int) -> List[str]:
+    """Compare each combined rule plan with per-rule re.search over corpus turns.
+
+    Returns:
+        One line per plan that disagrees (empty if all agree)
+    """
+    texts = [corpus.agent_turn().lower() for _ in range(count)]
+    errors = []
+    for name in ("isolation_plan", "closing_plan", "rapport_breaker_plan", "handle_plan"):
+        try:
+            getattr(scorer.rules, name).check(texts)
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+    return errors
+
+
+def bench_turns(
+    scorer: ConversationScorer, corpus: SyntheticCorpus, count: int
+) -> Dict[str, float]:
+    """score_turn throughput and latency on typical agent messages."""
+    messages = [corpus.agent_turn() for _ in range(count)]
+    time_calls(scorer.score_turn, [corpus.agent_turn() for _ in range(100)])  # warm up
+    timings = time_calls(scorer.score_turn, messages)
+    return {
+        "turns_per_s": round(len(timings) / (sum(timings) / 1e6)),
+        "turn_p50_us": round(percentile(timings, 50), 1),
+        "turn_p99_us": round(percentile(timings, 99), 1),
+    }
+
+
+def bench_conversations(
+    scorer: ConversationScorer, corpus: SyntheticCorpus, count: int, turns: int
+) -> Dict[str, float]:
+    """score_conversation throughput, latency and peak traced memory."""
+    conversations = list(corpus.conversations(count, turns))
+    timings = time_calls(scorer.score_conversation, conversations)
+
+    tracemalloc.start()
+    scorer.score_conversation(conversations[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "conversations_per_s": round(len(timings) / (sum(timings) / 1e6), 1),
+        "conversation_p50_us": round(percentile(timings, 50), 1),
+        "conversation_p99_us": round(percentile(timings, 99), 1),
+        "conversation_peak_kib": round(peak / 1024, 1),
+    }
+
+
+def find_instant_limit(
+    scorer: ConversationScorer, corpus: SyntheticCorpus, budget_ms: float, max_length: int
+) -> Dict[str, float]:
+    """Double the message length until p99 score_turn latency exceeds the budget.
+
+    Returns:
+        Latency per length tried and the last length that stayed in budget
+        (None if even the shortest length exceeded it)
+    """
+    results = {}
+    limit = None
+    length = 250
+    while length <= max_length:
+        messages = [corpus.agent_turn(length) for _ in range(20)]
+        p99_ms = percentile(time_calls(scorer.score_turn, messages), 99) / 1000
+        results[length] = p99_ms
+        print(f"  {length:>8} chars   p99 {p99_ms:8.2f} ms")
+        if p99_ms > budget_ms:
+            break
+        limit = length
+        length *= 2
+    return {"instant_limit_chars": limit, "latency_by_length_ms": results}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that regressed by more than ``tolerance`` (a fraction)."""
+    regressions = []
+    for key, value in current.items():
+        old = baseline.get(key)
+        if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        if key in LOWER_IS_BETTER:
+            change = value / old - 1
+        elif key.endswith("_per_s"):
+            change = old / value - 1
+        else:
+            continue
+        if change > tolerance:
+            regressions.append(f"{key}: {old} -> {value} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    """Run the suite and print (or save/compare) the numbers."""
+    parser = argparse.ArgumentParser(description="Benchmark CFR scoring.")
+    parser.add_argument("--turns", type=int, default=5000, help="score_turn samples")
+    parser.add_argument("--conversations", type=int, default=500, help="score_conversation samples")
+    parser.add_argument("--conversation-turns", type=int, default=20, help="Turns per conversation")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Scoring latency that still feels instant in live chat")
+    parser.add_argument("--max-length", type=int, default=256_000, help="Longest message tried")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Save results to this file")
+    parser.add_argument("--compare", help="Baseline results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown vs baseline (default: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Measure the scoring itself; repeated messages would otherwise be cache hits
+    scorer = ConversationScorer(cache=ScoreCache(max_size=0))
+    corpus = SyntheticCorpus(seed=args.seed)
+    print(f"Rules v{scorer.rules.version}, {len(corpus.agent_examples)} example phrases\n")
+
+    plan_errors = check_plans(scorer, SyntheticCorpus(seed=args.seed + 1), args.turns)
+    if plan_errors:
+        print("⚠️  Rule plans disagree with re.search:")
+        for line in plan_errors:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"✓ Rule plans match re.search on {args.turns} corpus turns\n")
+
+    results = {}
+    results.update(bench_turns(scorer, corpus, args.turns))
+    results.update(bench_conversations(scorer, corpus, args.conversations, args.conversation_turns))
+    for key, value in results.items():
+        print(f"  {key:<24} {value}")
+
+    print(f"\nMessage length vs. score_turn p99 (budget {args.budget_ms:g} ms)")
+    limit = find_instant_limit(scorer, corpus, args.budget_ms, args.max_length)
+    results["instant_limit_chars"] = limit["instant_limit_chars"]
+    if limit["instant_limit_chars"] is None:
+        print(f"  ⚠️  No message length tried stayed within {args.budget_ms:g} ms")
+    elif limit["instant_limit_chars"] == args.max_length:
+        print(f"  Within budget up to {args.max_length} chars")
+    else:
+        print(f"  Stays instant up to ~{limit['instant_limit_chars']} chars")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Saved results to {args.json}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n⚠️  Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✓ No regressions vs baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Concurrent-trainee load test of EnhancedRoleplayAgent against a simulated LLM.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --trainees 50,100,200,400 --turns 12
+    python benchmarks/load_test.py --mode threads   # one thread per session, like Streamlit
+
+Each trainee is one session sending scripted agent lines. Turn latency
+includes the simulated LLM time; ``overhead`` is turn latency minus the
+LLM call, i.e. scoring, prompt building and bookkeeping.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from airoleplay.agents import OPENING_LINE, EnhancedRoleplayAgent
+from airoleplay.characters.persona_character import PersonaCharacter
+from bench_scoring import percentile
+from simulated_llm import SimulatedChatModel
+from synthetic_corpus import ROOT, SyntheticCorpus
+
+
+def scripts(trainees: int, turns: int) -> List[List[str]]:
+    """Scripted agent lines for each trainee (deterministic)."""
+    return [
+        [OPENING_LINE] + [corpus.agent_turn() for _ in range(turns - 1)]
+        for corpus in (SyntheticCorpus(seed=i) for i in range(trainees))
+    ]
+
+
+def make_agents(trainees: int, llm: SimulatedChatModel, difficulty: str) -> List:
+    """One scoring-mode session per trainee, cycling through the personas."""
+    persona_files = sorted((ROOT / "personas").glob("*.json"))
+    return [
+        EnhancedRoleplayAgent(
+            PersonaCharacter.from_json(persona_files[i % len(persona_files)]),
+            difficulty=difficulty,
+            training_mode="scoring",
+            llm=llm,
+        )
+        for i in range(trainees)
+    ]
+
+
+async def _trainee_async(agent, lines: List[str], think_s: float) -> List[float]:
+    timings = []
+    for line in lines:
+        start = time.perf_counter()
+        await agent.achat(line)
+        timings.append(time.perf_counter() - start)
+        await asyncio.sleep(think_s)
+    return timings
+
+
+def _trainee_sync(agent, lines: List[str], think_s: float) -> List[float]:
+    timings = []
+    for line in lines:
+        start = time.perf_counter()
+        agent.chat(line)
+        timings.append(time.perf_counter() - start)
+        time.sleep(think_s)
+    return timings
+
+
+def run_sessions(agents: List, lines: List[List[str]], mode: str,
+                 think_s: float) -> Tuple[float, List[List[float]]]:
+    """Drive all sessions concurrently.
+
+    Returns:
+        Wall-clock seconds and per-session turn latencies
+    """
+    start = time.perf_counter()
+    if mode == "async":
+        async def run_all():
+            return await asyncio.gather(*(
+                _trainee_async(agent, script, think_s) for agent, script in zip(agents, lines)
+            ))
+        timings = asyncio.run(run_all())
+    else:
+        with ThreadPoolExecutor(max_workers=len(agents)) as pool:
+            timings = list(pool.map(
+                lambda pair: _trainee_sync(pair[0], pair[1], think_s), zip(agents, lines)
+            ))
+    return time.perf_counter() - start, timings
+
+
+def memory_per_session(trainees: int, lines: List[List[str]], difficulty: str) -> float:
+    """KiB traced per live session after all its turns (zero-latency LLM)."""
+    llm = SimulatedChatModel(first_token_s=0.0, tokens_per_s=0.0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    agents = make_agents(trainees, llm, difficulty)
+    run_sessions(agents, lines, "async", 0.0)
+    for agent in agents:
+        agent.context.wait()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / trainees / 1024
+
+
+def load_step(trainees: int, args) -> Dict[str, float]:
+    """Run one load level and summarize it."""
+    lines = scripts(trainees, args.turns)
+    llm = SimulatedChatModel(
+        first_token_s=args.first_token_ms / 1000, tokens_per_s=args.tokens_per_s
+    )
+    agents = make_agents(trainees, llm, args.difficulty)
+    elapsed, timings = run_sessions(agents, lines, args.mode, args.think_ms / 1000)
+
+    latencies = [t * 1000 for session in timings for t in session]
+    overheads = []
+    for agent, session in zip(agents, timings):
+        calls = [call for call in agent.metrics.calls if call.kind == "chat"]
+        overheads.extend((t - call.latency_s) * 1000 for t, call in zip(session, calls))
+
+    return {
+        "trainees": trainees,
+        "sessions_per_s": round(trainees / elapsed, 2),
+        "turns_per_s": round(len(latencies) / elapsed, 1),
+        "turn_p50_ms": round(percentile(latencies, 50), 1),
+        "turn_p95_ms": round(percentile(latencies, 95), 1),
+        "turn_p99_ms": round(percentile(latencies, 99), 1),
+        "overhead_p50_ms": round(percentile(overheads, 50), 2),
+        "overhead_p95_ms": round(percentile(overheads, 95), 2),
+        "overhead_p99_ms": round(percentile(overheads, 99), 2),
+        "session_kib": round(memory_per_session(trainees, lines, args.difficulty), 1),
+    }
+
+
+def main():
+    """Run the load levels and print (or save) the results."""
+    parser = argparse.ArgumentParser(description="Load test concurrent roleplay sessions.")
+    parser.add_argument("--trainees", default="10,50,100,200",
+                        help="Comma-separated concurrent session counts")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per session")
+    parser.add_argument("--difficulty", default="advanced",
+                        choices=["beginner", "medium", "advanced"])
+    parser.add_argument("--mode", default="async", choices=["async", "threads"],
+                        help="achat on one event loop, or chat on one thread per session")
+    parser.add_argument("--first-token-ms", type=float, default=600.0,
+                        help="Simulated time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=60.0,
+                        help="Simulated output token rate")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="Pause between a reply and the trainee's next line")
+    parser.add_argument("--overhead-budget-ms", type=float, default=50.0,
+                        help="p95 overhead a load level may add and still count as handled")
+    parser.add_argument("--json", help="Save results to this file")
+    args = parser.parse_args()
+
+    print(f"Mode {args.mode}, {args.turns} turns/session, {args.difficulty}, "
+          f"LLM {args.first_token_ms:g} ms + {args.tokens_per_s:g} tok/s\n")
+    header = (f"{'trainees':>8} {'sess/s':>8} {'turns/s':>8} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'ovh p95':>8} {'ovh p99':>8} {'KiB/sess':>9}")
+    print(header)
+
+    results = []
+    for trainees in (int(n) for n in args.trainees.split(",")):
+        row = load_step(trainees, args)
+        results.append(row)
+        print(f"{row['trainees']:>8} {row['sessions_per_s']:>8} {row['turns_per_s']:>8} "
+              f"{row['turn_p50_ms']:>9} {row['turn_p95_ms']:>9} {row['turn_p99_ms']:>9} "
+              f"{row['overhead_p95_ms']:>8} {row['overhead_p99_ms']:>8} {row['session_kib']:>9}")
+
+    handled = [row["trainees"] for row in results
+               if row["overhead_p95_ms"] <= args.overhead_budget_ms]
+    if handled:
+        print(f"\n✓ Handles {max(handled)} concurrent trainees within "
+              f"{args.overhead_budget_ms:g} ms p95 overhead")
+    else:
+        print(f"\n⚠️  No load level stayed within {args.overhead_budget_ms:g} ms p95 overhead")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Saved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
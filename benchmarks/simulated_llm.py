@@ -0,0 +1,93 @@
+"""Local chat model that simulates provider latency and token rate."""
+
+import asyncio
+import time
+from typing import List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+from synthetic_corpus import SyntheticCorpus
+
+
+class SimulatedChatModel(BaseChatModel):
+    """Answers with persona client lines after a realistic delay.
+
+    A reply takes ``first_token_s`` plus one word per ``1 / tokens_per_s``
+    seconds (words stand in for tokens). Sync calls sleep, async calls
+    await, so one event loop can hold many simulated requests in flight.
+    """
+
+    first_token_s: float = 0.6
+    tokens_per_s: float = 60.0
+    reply_words: int = 40
+    seed: int = 0
+    model: str = "simulated"
+    _corpus: SyntheticCorpus = PrivateAttr()
+
+    def model_post_init(self, __context):
+        self._corpus = SyntheticCorpus(seed=self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "simulated"
+
+    def _reply(self, messages) -> List[str]:
+        """Words of the next reply."""
+        words = []
+        while len(words) < self.reply_words:
+            words.extend(self._corpus.client_turn().split())
+        return words[:self.reply_words]
+
+    def _gap(self) -> float:
+        return 1 / self.tokens_per_s if self.tokens_per_s else 0.0
+
+    def _duration(self, words: List[str]) -> float:
+        return self.first_token_s + len(words) * self._gap()
+
+    @staticmethod
+    def _usage(messages, words: List[str]) -> dict:
+        # ~4 characters per input token
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": len(words),
+            "total_tokens": input_tokens + len(words),
+        }
+
+    def _result(self, messages, words: List[str]) -> ChatResult:
+        message = AIMessage(content=" ".join(words), usage_metadata=self._usage(messages, words))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunk(self, messages, words: List[str], i: int) -> ChatGenerationChunk:
+        text = words[i] if i == len(words) - 1 else words[i] + " "
+        usage = self._usage(messages, words) if i == len(words) - 1 else None
+        return ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        words = self._reply(messages)
+        time.sleep(self._duration(words))
+        return self._result(messages, words)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        words = self._reply(messages)
+        await asyncio.sleep(self._duration(words))
+        return self._result(messages, words)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        words = self._reply(messages)
+        time.sleep(self.first_token_s)
+        for i in range(len(words)):
+            if i:
+                time.sleep(self._gap())
+            yield self._chunk(messages, words, i)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        words = self._reply(messages)
+        await asyncio.sleep(self.first_token_s)
+        for i in range(len(words)):
+            if i:
+                await asyncio.sleep(self._gap())
+            yield self._chunk(messages, words, i)
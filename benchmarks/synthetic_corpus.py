@@ -0,0 +1,117 @@
+"""Synthetic agent/client conversations built from the technique and persona data."""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent / "airoleplay"
+
+FILLER = [
+    "the market in your area has been moving quickly this spring",
+    "we looked at a few comparable homes on the same street last month",
+    "interest rates have settled a little since the start of the year",
+    "the inspection report came back with a couple of minor items",
+    "most sellers in this neighborhood are getting close to asking price",
+    "I pulled the numbers on taxes and insurance for the property",
+    "the lender can usually turn a pre-approval around in a day or two",
+    "there are three open houses this weekend that fit your criteria",
+    "the HOA covers exterior maintenance and the community pool",
+    "days on market have been trending down for the last quarter",
+]
+
+CLIENT_FILLER = [
+    "I'm not sure we're ready yet.",
+    "That sounds expensive.",
+    "Can you send me more information first?",
+    "We want to wait and see what rates do.",
+    "My spouse needs to look at it too.",
+    "Okay, tell me more.",
+]
+
+
+def _collect_examples(node: Any, keys=("examples", "tie_downs")) -> List[str]:
+    """All strings listed under example-like keys, anywhere in the tree."""
+    found = []
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in keys and isinstance(value, list):
+                found.extend(item for item in value if isinstance(item, str))
+            else:
+                found.extend(_collect_examples(value, keys))
+    elif isinstance(node, list):
+        for item in node:
+            found.extend(_collect_examples(item, keys))
+    return found
+
+
+def _collect_triggers(persona: dict) -> List[str]:
+    """Objection trigger phrases from a persona file."""
+    return [
+        phrase
+        for pattern in persona.get("objection_patterns", [])
+        for phrase in pattern.get("trigger_phrases", [])
+    ]
+
+
+class SyntheticCorpus:
+    """Deterministic generator of realistic agent and client turns.
+
+    Agent turns mix technique, closing, embedded command, tie-down and magic
+    phrase examples with filler sentences; client turns use persona objection
+    triggers. The same seed always yields the same corpus.
+    """
+
+    def __init__(self, seed: int = 0, technique_ratio: float = 0.6):
+        """Load the example phrases.
+
+        Args:
+            seed: Random seed
+            technique_ratio: Share of agent sentences taken from examples
+        """
+        self.random = random.Random(seed)
+        self.technique_ratio = technique_ratio
+
+        with open(ROOT / "data" / "techniques.json", 'r') as f:
+            techniques = json.load(f)
+        with open(ROOT / "data" / "magic_phrases.json", 'r') as f:
+            magic_phrases = json.load(f)
+
+        self.agent_examples = _collect_examples(techniques) + _collect_examples(magic_phrases)
+        self.rapport_breakers = [
+            phrase.split(" (")[0] for phrase in techniques["rapport_breakers"]["phrases"]
+        ]
+
+        self.client_examples = list(CLIENT_FILLER)
+        for persona_file in sorted((ROOT / "personas").glob("*.json")):
+            with open(persona_file, 'r') as f:
+                self.client_examples.extend(_collect_triggers(json.load(f)))
+
+    def agent_turn(self, length: Optional[int] = None) -> str:
+        """One agent message of roughly ``length`` characters (default: 80-400)."""
+        length = length or self.random.randint(80, 400)
+        sentences = []
+        size = 0
+        while size < length:
+            if self.random.random() < self.technique_ratio:
+                sentence = self.random.choice(self.agent_examples)
+            elif self.random.random() < 0.05:
+                sentence = self.random.choice(self.rapport_breakers)
+            else:
+                sentence = self.random.choice(FILLER).capitalize() + "."
+            sentences.append(sentence)
+            size += len(sentence) + 1
+        return " ".join(sentences)[:length]
+
+    def client_turn(self) -> str:
+        """One client message."""
+        return self.random.choice(self.client_examples)
+
+    def conversation(self, turns: int = 10) -> List[Tuple[str, str]]:
+        """One conversation as (agent, client) pairs."""
+        return [(self.agent_turn(), self.client_turn()) for _ in range(turns)]
+
+    def conversations(self, count: int, turns: int = 10) -> Iterator[List[Tuple[str, str]]]:
+        """``count`` conversations of ``turns`` turns each."""
+        for _ in range(count):
+            yield self.conversation(turns)
@@ -2,11 +2,17 @@
 
 import os
 import sys
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 
 from airoleplay.characters.persona_character import PersonaCharacter
+from airoleplay.characters.persona_registry import get_persona_registry
 from airoleplay.agents.enhanced_roleplay_agent import EnhancedRoleplayAgent
+from airoleplay.agents.call_policy import LLMCallFailed
+from airoleplay.agents.llm_pool import preconnect
+from airoleplay.agents.model_router import ModelRouter, default_tiers
+from airoleplay.agents.opening_pool import OPENING_LINE, get_opening_pool
 from airoleplay.call_analysis.audio_processor import AudioProcessor
 from airoleplay.call_analysis.call_analyzer import CallAnalyzer
 
@@ -31,25 +37,18 @@ def print_menu():
 
 def select_persona() -> PersonaCharacter:
     """Let user select a persona."""
-    personas_dir = Path(__file__).parent / "airoleplay" / "personas"
-
-    personas = {
-        "1": ("investor.json", "Investor – Cash Flow Focused"),
-        "2": ("first_time_buyer.json", "First Time Buyer – Anxious/Curious"),
-        "3": ("seller.json", "Seller / Downsizer – Convenience & Timing")
-    }
+    registry = get_persona_registry()
+    personas = {str(i): item for i, item in enumerate(registry.by_label().items(), 1)}
 
     print("\n--- SELECT PERSONA ---")
-    for key, (_, label) in personas.items():
+    for key, (label, _) in personas.items():
         print(f"{key}. {label}")
 
     while True:
-        choice = input("\nSelect persona (1-3): ").strip()
+        choice = input(f"\nSelect persona (1-{len(personas)}): ").strip()
         if choice in personas:
-            filename, _ = personas[choice]
-            persona_path = personas_dir / filename
-            return PersonaCharacter.from_json(str(persona_path))
-        print("Invalid choice. Please select 1-3.")
+            return registry.create(personas[choice][1])
+        print(f"Invalid choice. Please select 1-{len(personas)}.")
 
 
 def select_difficulty() -> str:
@@ -97,6 +96,9 @@ def live_roleplay_training():
     # Setup
     persona = select_persona()
     difficulty = select_difficulty()
+
+    # Pre-generate the persona's first reply while the trainee picks a mode
+    get_opening_pool().warm(persona, difficulty, ModelRouter().model_for_difficulty(difficulty))
     training_mode = select_training_mode()
 
     print(f"\n✓ Persona: {persona.label}")
@@ -119,12 +121,15 @@ def live_roleplay_training():
     print("=" * 70 + "\n")
 
     # Initial message from persona
-    initial_response = agent.chat(
-        "Hi, I'm a real estate agent. How can I help you today?",
-        thread_id="training_session"
-    )
-
-    print(f"{persona.label}: {initial_response['client_response']}\n")
+    initial_response = agent.start_from_pool()
+    if initial_response is not None:
+        print(f"{persona.label}: {initial_response['client_response']}\n")
+    else:
+        print(f"{persona.label}: ", end="", flush=True)
+        for chunk in agent.chat_stream(OPENING_LINE, thread_id="training_session"):
+            print(chunk, end="", flush=True)
+        print("\n")
+        initial_response = agent.last_response
     if training_mode == "scoring":
         print(f"[Cooperation: {initial_response['persona_cooperation']}/10]\n")
 
@@ -141,11 +146,12 @@ def live_roleplay_training():
             if agent_input.lower() == "end":
                 break
 
-            # Process response
-            response = agent.chat(agent_input, thread_id="training_session")
-
-            # Show persona response
-            print(f"\n{persona.label}: {response['client_response']}")
+            # Process response, showing the persona's reply as it streams in
+            print(f"\n{persona.label}: ", end="", flush=True)
+            for chunk in agent.chat_stream(agent_input, thread_id="training_session"):
+                print(chunk, end="", flush=True)
+            print()
+            response = agent.last_response
 
             # Show feedback based on mode
             if training_mode == "practice" and "score" in response:
@@ -168,6 +174,8 @@ def live_roleplay_training():
         except KeyboardInterrupt:
             print("\n\nSession interrupted.")
             break
+        except LLMCallFailed as e:
+            print(f"\n⚠️  The client didn't respond ({e}). Please send that again.\n")
         except Exception as e:
             print(f"\nError: {e}")
             print("Continuing...\n")
@@ -272,26 +280,15 @@ def analyze_call_recording():
 
 def view_personas():
     """Display available personas."""
-    personas_dir = Path(__file__).parent / "airoleplay" / "personas"
-
     print("\n" + "=" * 70)
     print("AVAILABLE PERSONAS")
     print("=" * 70)
 
-    personas = [
-        ("investor.json", "Investor – Cash Flow Focused"),
-        ("first_time_buyer.json", "First Time Buyer – Anxious/Curious"),
-        ("seller.json", "Seller / Downsizer – Convenience & Timing")
-    ]
-
-    for filename, label in personas:
-        persona_path = personas_dir / filename
-        persona = PersonaCharacter.from_json(str(persona_path))
-
-        print(f"\n{label}")
+    for persona in get_persona_registry().templates():
+        print(f"\n{persona.label}")
         print("-" * 70)
         print(f"Traits: {', '.join(persona.persona_traits)}")
-        print(f"Context: {persona.context}")
+        print(f"Context: {dict(persona.context)}")
         print(f"Objections: {len(persona.objection_patterns)} patterns")
         print(f"Goals: {', '.join(persona.goals[:3])}")
 
@@ -308,6 +305,10 @@ def main():
         print("\n⚠️  Warning: ANTHROPIC_API_KEY not found in environment variables.")
         print("Please create a .env file with your API key (see .env.example)")
         print("Live roleplay training will not work without it.\n")
+    else:
+        # Connect to the API while the trainee picks a persona
+        for _, model in default_tiers():
+            threading.Thread(target=preconnect, args=(model,), daemon=True).start()
 
     print_header()
 